@@ -0,0 +1,287 @@
+"""Drive every sidebar page headlessly on synthetic projects.
+
+    python -m benchmarks.pages                      # small + medium, compared with baseline.json
+    python -m benchmarks.pages --scales large --reruns 5
+    python -m benchmarks.pages --update-baseline    # record the current numbers as the baseline
+
+For every case (see ``cases``) and data scale (see ``benchmarks.synthetic.SCALES``)
+a fresh ``AppTest`` session loads the synthetic project, opens the page and
+performs the case's interactions. Recorded, for the last of those runs:
+
+``first_ms``    its render time (cold figure cache)
+``rerun_ms``    median of ``--reruns`` further reruns of the same state
+``peak_kb``     peak Python allocations during it (tracemalloc,
+                measured in a separate session so it does not skew the timings)
+``payload_kb``  size of the messages it sends to the browser
+
+Results more than ``--tolerance`` above the baseline (and above a small
+absolute noise floor) are reported as regressions and make the run exit 1.
+Timings depend on the machine: record a baseline on the machine you compare on.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "siama_app.py")
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+METRICS = ("first_ms", "rerun_ms", "peak_kb", "payload_kb")
+# Differences below these are noise, whatever the relative change.
+NOISE_FLOOR = {"first_ms": 25.0, "rerun_ms": 25.0, "peak_kb": 512.0, "payload_kb": 16.0}
+TIMEOUT = 600
+
+_payloads = []
+
+
+def _record_payloads():
+    # AppTest has no public hook for the outgoing messages; count them where
+    # each run hands its ForwardMsg queue to the element-tree parser.
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+    forward_msgs = LocalScriptRunner.forward_msgs
+
+    def counted(self):
+        msgs = forward_msgs(self)
+        _payloads.append(sum(m.ByteSize() for m in msgs))
+        return msgs
+
+    LocalScriptRunner.forward_msgs = counted
+
+
+def _session(project):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=TIMEOUT)
+    for section, value in project.items():
+        at.session_state[section] = value
+    _run(at.run)
+    return at
+
+
+def _run(step):
+    at = step()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def _widget(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"no widget labelled {label!r}")
+
+
+def _choose(label, value):
+    return lambda at: _widget(at.selectbox, label).set_value(value).run()
+
+
+def _pick(label, value):
+    return lambda at: _widget(at.radio, label).set_value(value).run()
+
+
+def _click(label):
+    return lambda at: _widget(at.button, label).click().run()
+
+
+def _click_job(label, name):
+    # The click only submits a background job (siama.jobs): wait for it and end
+    # with the rerun that shows its result. Finished jobs of earlier sessions
+    # are forgotten first, so the measured session does the work itself.
+    def step(at):
+        from siama import jobs
+
+        jobs.clear()
+        at = _widget(at.button, label).click().run()
+        job = (at.session_state["_jobs"] if "_jobs" in at.session_state else {}).get(name)
+        if job is None:
+            return at
+        while not job.done:
+            time.sleep(0.005)
+        return at.run()
+    return step
+
+
+def cases():
+    """``[(case, page label, steps)]``: every sidebar page, plus the tools and
+    exports that only draw their data after a widget interaction."""
+    from siama.views import PAGES
+
+    extra = {
+        "mat": [
+            ("segments", [_choose("Select Analysis Tool", "Behavioral Segmentation")]),
+            ("personas", [_choose("Select Analysis Tool", "User Persona")]),
+            ("complaints", [_choose("Select Analysis Tool", "Complaint Data Analysis")]),
+        ],
+        "summary": [
+            ("export_json", [_click("Generate Export File")]),
+            ("export_excel", [_pick("Select Export Format", "Excel"), _click_job("Generate Export File", "_excel_export")]),
+        ],
+    }
+    result = []
+    for label, page in PAGES.items():
+        result.append((page, label, []))
+        result.extend((f"{page}/{name}", label, steps) for name, steps in extra.get(page, []))
+    return result
+
+
+def _replay(at, label, steps):
+    """Run ``steps`` after opening the page, stopping before the last run."""
+    actions = [lambda at: _widget(at.sidebar.radio, "Navigate").set_value(label).run()] + steps
+    for action in actions[:-1]:
+        _run(lambda: action(at))
+    return actions[-1]
+
+
+def measure_case(label, steps, scale, reruns):
+    from benchmarks.synthetic import SCALES, make_project
+
+    at = _session(make_project(**SCALES[scale]))
+    last = _replay(at, label, steps)
+    start = time.perf_counter()
+    _run(lambda: last(at))
+    first = time.perf_counter() - start
+    payload = _payloads[-1]
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        _run(at.run)
+        times.append(time.perf_counter() - start)
+
+    at = _session(make_project(**SCALES[scale]))
+    last = _replay(at, label, steps)
+    tracemalloc.start()
+    try:
+        _run(lambda: last(at))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "first_ms": round(first * 1000, 1),
+        "rerun_ms": round(statistics.median(times) * 1000, 1) if times else None,
+        "peak_kb": round(peak / 1024, 1),
+        "payload_kb": round(payload / 1024, 1),
+    }
+
+
+def run(scales, reruns, only=None):
+    selected = [c for c in cases() if not only or c[0] in only or c[0].split("/")[0] in only]
+    # One unrecorded pass first, so one-time imports are not charged to
+    # whichever case happens to run first (see `python -m siama.startup`).
+    for case, label, steps in selected:
+        try:
+            measure_case(label, steps, "small", 0)
+        except Exception:
+            pass
+    results = {}
+    for scale in scales:
+        results[scale] = {}
+        for case, label, steps in selected:
+            try:
+                results[scale][case] = measure_case(label, steps, scale, reruns)
+            except Exception as e:
+                results[scale][case] = {"error": f"{type(e).__name__}: {e}"}
+            print(_row(scale, case, results[scale][case]), flush=True)
+    return results
+
+
+def _row(scale, page, result, base=None):
+    if "error" in result:
+        return f"{scale:<8} {page:<24} ERROR {result['error']}"
+    cells = []
+    for metric in METRICS:
+        value = result.get(metric)
+        cell = "-" if value is None else f"{value:,.1f}"
+        old = (base or {}).get(metric)
+        if value is not None and old:
+            cell += f" ({(value - old) / old:+.0%})"
+        cells.append(f"{cell:>20}")
+    return f"{scale:<8} {page:<24}" + "".join(cells)
+
+
+def compare(results, baseline, tolerance):
+    """Return ``[(scale, page, metric, value, base)]`` for regressions against ``baseline``."""
+    regressions = []
+    for scale, pages in results.items():
+        for page, result in pages.items():
+            base = baseline.get(scale, {}).get(page)
+            if not base or "error" in base:
+                continue
+            if "error" in result:
+                regressions.append((scale, page, "error", result["error"], None))
+                continue
+            for metric in METRICS:
+                value, old = result.get(metric), base.get(metric)
+                if value is None or not old:
+                    continue
+                if value > old * (1 + tolerance) and value - old > NOISE_FLOOR[metric]:
+                    regressions.append((scale, page, metric, value, old))
+    return regressions
+
+
+def main(argv=None):
+    from benchmarks.synthetic import SCALES
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scales", default="small,medium", help=f"comma-separated, of {', '.join(SCALES)}")
+    parser.add_argument("--pages", default="", help="comma-separated pages or cases, e.g. sat,mat/complaints (default: all)")
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    scales = [s for s in args.scales.split(",") if s]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    # Benchmark the in-memory project mapping, without profiling overhead.
+    for var in ("SIAMA_PROJECT_DB", "SIAMA_PROFILE", "SIAMA_STARTUP_REPORT"):
+        os.environ.pop(var, None)
+    # Bare-mode and deprecation warnings; streamlit resets its own logger levels.
+    logging.disable(logging.WARNING)
+    _record_payloads()
+
+    print(f"{'scale':<8} {'case':<24}" + "".join(f"{m:>20}" for m in METRICS))
+    results = run(scales, args.reruns, [p for p in args.pages.split(",") if p])
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+    if args.update_baseline:
+        merged = dict(baseline)
+        for scale, pages in results.items():
+            merged.setdefault(scale, {}).update(pages)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"scales": {s: SCALES[s] for s in merged if s in SCALES}, "results": merged}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+
+    print("\nAgainst the baseline:")
+    for scale, pages in results.items():
+        for page, result in pages.items():
+            print(_row(scale, page, result, baseline.get(scale, {}).get(page)))
+    regressions = compare(results, baseline, args.tolerance)
+    for scale, page, metric, value, old in regressions:
+        print(f"REGRESSION {scale}/{page} {metric}: {value} (baseline {old})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Synthetic SIAMA projects of configurable size.
+
+``make_project`` returns the four project sections (``sit_data``, ``sat_data``,
+``mat_data``, ``nature_of_craft``) shaped exactly as the pages write them, so
+a benchmark can load one into a session the way "📂 Load" does.
+"""
+import random
+
+import pandas as pd
+
+from siama.stakeholders import NEXT_ID, label
+from siama.views.nature_of_craft import FRAMEWORK_DATA
+
+ROLES = ["Supplier", "Producer", "Refiner", "Marketer", "Buyer"]
+LOCATIONS = ["Guwahati", "Sualkuchi", "Majuli", "Jorhat", "Tezpur", "Barpeta", "Dibrugarh", "Silchar"]
+CATEGORIES = ["Product Quality", "Service", "Delivery", "Pricing", "Communication", "Other"]
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+STATUSES = ["Pending", "In Progress", "Resolved", "Closed"]
+
+# Sizes the suite runs at; each value is a set of make_project() arguments.
+SCALES = {
+    "small": dict(actors=25, ratings=25, subgroups=3, complaints=10, segments=3, personas=3, craft=0.3),
+    "medium": dict(actors=250, ratings=250, subgroups=6, complaints=100, segments=10, personas=10, craft=0.5),
+    "large": dict(actors=1000, ratings=1000, subgroups=10, complaints=500, segments=30, personas=30, craft=0.8),
+}
+
+
+def _sit(rng, actors, interviews):
+    roles = {role: [] for role in ROLES}
+    for i in range(actors):
+        role = ROLES[i % len(ROLES)]
+        roles[role].append({
+            "id": i + 1,
+            "name": f"{role} {i:05d}",
+            "location": rng.choice(LOCATIONS),
+            "contact": f"+91 9{rng.randrange(10 ** 8, 10 ** 9)}",
+            "details": f"{rng.randrange(1, 40)} years in the trade",
+        })
+    stakeholders = [{
+        "role": ROLES[i % len(ROLES)],
+        "responses": {"Who provides the raw materials?": f"Answer {i}",
+                      "How frequently do they interact?": rng.choice(["Daily", "Weekly", "Monthly"])},
+        "timestamp": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d} 10:{i % 60:02d}:00",
+    } for i in range(interviews)]
+    return {"stakeholders": stakeholders, "roles": roles, NEXT_ID: actors + 1}
+
+
+def _sat(rng, sit, ratings, subgroups):
+    rated = [(a["id"], label(a["name"], role)) for role, actors in sit["roles"].items() for a in actors][:ratings]
+    relationship_data = [{
+        "stakeholder": name,
+        "power": rng.randint(1, 10),
+        "interest": rng.randint(1, 10),
+        "legitimacy": rng.randint(1, 10),
+        "urgency": rng.randint(1, 10),
+        "interactions": "", "tasks": "", "knowledge": "",
+        "rated_at": f"2024-06-{1 + i % 28:02d}T10:00:00",
+        "stakeholder_id": sid,
+    } for i, (sid, name) in enumerate(rated)]
+    # Every fourth stakeholder was re-rated twice.
+    for record in relationship_data[::4]:
+        record["history"] = [{"rated_at": f"2024-0{month}-01T10:00:00",
+                              **{c: rng.randint(1, 10) for c in ("power", "interest", "legitimacy", "urgency")}}
+                             for month in (2, 4)]
+    groups = {f"Group {g + 1}": {"description": "Synthetic subgroup", "members": []} for g in range(subgroups)}
+    if groups:
+        group_names = list(groups)
+        for i, (sid, _) in enumerate(rated):
+            groups[group_names[i % len(group_names)]]["members"].append(sid)
+    conflicts = [{
+        "stakeholder": name,
+        "cooperativeness": rng.randint(1, 10),
+        "competitiveness": rng.randint(1, 10),
+        "description": "",
+        "stakeholder_id": sid,
+    } for sid, name in rated[::10]]
+    return {
+        "relationship_matrix": pd.DataFrame(),
+        "relationship_data": relationship_data,
+        "subgroups": groups,
+        "conflict_data": conflicts,
+    }
+
+
+def _mat(rng, complaints, segments, personas):
+    return {
+        "complaints": [{
+            "source": f"Store {i % 17}",
+            "date": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "category": rng.choice(CATEGORIES),
+            "description": f"Complaint {i}: " + "details " * rng.randrange(1, 12),
+            "severity": rng.choice(SEVERITIES),
+            "status": rng.choice(STATUSES),
+            "resolution": "",
+        } for i in range(complaints)],
+        "behavioral_segments": [{
+            "name": f"Segment {i + 1}",
+            "purchase_behavior": rng.choice(["Impulse", "Planned", "Seasonal"]),
+            "usage_rate": rng.choice(["Light", "Medium", "Heavy"]),
+            "benefits_sought": "Authenticity, durability",
+            "loyalty_status": rng.choice(["None", "Medium", "Strong"]),
+            "occasion": rng.choice(["Festival", "Wedding", "Everyday"]),
+        } for i in range(segments)],
+        "personas": [{
+            "name": f"Persona {i + 1}",
+            "age_range": rng.choice(["18-25", "26-35", "36-50", "50+"]),
+            "occupation": "Teacher",
+            "location": rng.choice(LOCATIONS),
+            "income_level": rng.choice(["Low", "Middle", "High"]),
+            "education": "Graduate",
+            "family_status": "Married",
+            "lifestyle": "Urban",
+            "goals": "Buy authentic handloom",
+            "pain_points": "Hard to verify authenticity",
+            "shopping_habits": "Online and exhibitions",
+        } for i in range(personas)],
+    }
+
+
+def _craft(rng, share):
+    status = {"current_status": {}, "desired_status": {}}
+    for primary, content in FRAMEWORK_DATA.items():
+        for item in content["secondary"] + content["tertiary"]:
+            status["current_status"][f"current_{primary}_{item}"] = rng.random() < share
+            status["desired_status"][f"desired_{primary}_{item}"] = rng.random() < min(1.0, share + 0.2)
+    return status
+
+
+def make_project(actors=100, ratings=None, subgroups=4, complaints=50, segments=5, personas=5,
+                 craft=0.5, interviews=None, seed=0):
+    """Return ``{section: value}`` for a synthetic project.
+
+    ``ratings`` (default: every actor) are SAT ratings of the first actors and
+    are spread round-robin over ``subgroups``; every tenth rated stakeholder
+    also gets a conflict entry. ``craft`` is the share of 5P characteristics
+    ticked. ``interviews`` defaults to a fifth of ``actors``.
+    """
+    rng = random.Random(seed)
+    ratings = actors if ratings is None else min(ratings, actors)
+    interviews = max(1, actors // 5) if interviews is None else interviews
+    sit = _sit(rng, actors, interviews)
+    return {
+        "sit_data": sit,
+        "sat_data": _sat(rng, sit, ratings, subgroups),
+        "mat_data": _mat(rng, complaints, segments, personas),
+        "nature_of_craft": _craft(rng, craft),
+    }
@@ -0,0 +1 @@
+"""Support modules for the SIAMA Toolbox Streamlit app (``siama_app.py``)."""
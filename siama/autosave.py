@@ -0,0 +1,144 @@
+"""Dirty-tracking autosave for the loaded project.
+
+At the end of every rerun ``track`` encodes the project sections on the
+script thread, so the snapshot cannot be torn by a later edit, and queues
+only those whose SHA-256 differs from what this session queued last. A
+background writer coalesces the queue per ``(project, section)`` (the latest
+wins), wakes at most once every ``AUTOSAVE_INTERVAL`` seconds and hands the
+encoded bodies to ``ProjectStore.put_encoded`` as they are.
+
+Restoring a version calls ``reset``, which drops what is still queued for the
+project and bumps its generation, so a write taken from the queue before the
+restore is discarded instead of overwriting the restored version.
+"""
+import threading
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from siama import profiling
+from siama.project_store import encode_sections
+from siama.state import PROJECT_STATE_KEYS, project_store_of
+
+AUTOSAVE_INTERVAL = 5.0
+
+_QUEUED = "_autosave_queued"
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+class AutosaveWriter:
+    def __init__(self, store, interval=AUTOSAVE_INTERVAL):
+        self.store = store
+        self.interval = interval
+        self._pending = {}
+        self._generations = {}
+        self._status = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = threading.Thread(target=self._run, name="siama-autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, project, encoded):
+        """Queue the sections of ``project`` (``{section: encoded}``, see ``encode_sections``)."""
+        with self._lock:
+            generation = self._generations.get(project, 0)
+            for section, value in encoded.items():
+                self._pending[(project, section)] = (generation, value)
+            self._idle.clear()
+            self._wake.set()
+
+    def reset(self, project):
+        """Drop everything queued for ``project``, including a write in progress."""
+        with self._write_lock, self._lock:
+            self._generations[project] = self._generations.get(project, 0) + 1
+            for key in [key for key in self._pending if key[0] == project]:
+                del self._pending[key]
+
+    def _run(self):
+        last = float("-inf")
+        while True:
+            self._wake.wait()
+            delay = last + self.interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._wake.clear()
+            last = time.monotonic()
+            by_project = {}
+            for (project, section), (generation, value) in batch.items():
+                by_project.setdefault(project, {}).setdefault(generation, {})[section] = value
+            for project, generations in by_project.items():
+                with self._write_lock:
+                    encoded = generations.get(self._generations.get(project, 0))
+                    if encoded:
+                        self._write(project, encoded)
+            with self._lock:
+                if not self._pending:
+                    self._idle.set()
+
+    def _write(self, project, encoded):
+        now = datetime.now().isoformat(timespec="seconds")
+        try:
+            with profiling.section("autosave: write"):
+                changed = self.store.put_encoded(project, encoded, updated=now)
+        except Exception as e:
+            self._status[project] = {"saved": None, "sections": [], "error": str(e)}
+        else:
+            prev = self._status.get(project) or {}
+            if changed or not prev.get("saved"):
+                self._status[project] = {"saved": now, "sections": changed, "error": None}
+
+    def status(self, project):
+        """``{saved, sections, error}`` for the last write of ``project``, or None."""
+        return self._status.get(project)
+
+    def pending(self, project):
+        with self._lock:
+            return sorted(s for p, s in self._pending if p == project)
+
+    def flush(self, timeout=None):
+        """Block until every queued section has been written."""
+        return self._idle.wait(timeout)
+
+
+def writer_for(store):
+    """Return the shared writer for ``store`` (one per database)."""
+    with _writers_lock:
+        if store.path not in _writers:
+            _writers[store.path] = AutosaveWriter(store)
+        return _writers[store.path]
+
+
+def track(store, project, keys):
+    """Queue the sections in ``keys`` that changed since this session last
+    queued them. Returns the queued section names."""
+    queued = st.session_state.setdefault(_QUEUED, {})
+    with profiling.section("autosave: snapshot"):
+        encoded = encode_sections({key: st.session_state.get(key) for key in keys})
+    changed = {section: value for section, value in encoded.items() if queued.get((project, section)) != value[0]}
+    if changed:
+        writer_for(store).submit(project, changed)
+        queued.update({(project, section): value[0] for section, value in changed.items()})
+    return list(changed)
+
+
+def reset(store, project):
+    """Forget the queued autosave of ``project``; call before replacing its stored content."""
+    writer_for(store).reset(project)
+    queued = st.session_state.get(_QUEUED, {})
+    for key in [key for key in queued if key[0] == project]:
+        del queued[key]
+
+
+def track_session():
+    """``track`` the session's loaded project if autosave is switched on."""
+    store = project_store_of(st.session_state.get("projects"))
+    if st.session_state.get("_autosave_enabled") and st.session_state.get("current_project") and store is not None:
+        return track(store, st.session_state.current_project, PROJECT_STATE_KEYS)
+    return []
@@ -0,0 +1,305 @@
+"""Chunked, delta-based browser-storage sync for projects.
+
+Each project is stored in ``localStorage`` as its own ``.siama`` bundle
+(already deflate-compressed), base64-encoded and split across numbered keys:
+
+* ``<prefix>:meta`` — JSON listing every project with the SHA-256, size and
+  chunk count of its bundle, and its content hash;
+* ``<prefix>:p:<sha[:16]>:<i>`` — the chunks themselves.
+
+The content hash (``project_store.content_hash``) is derived from the
+section hashes the project store already keeps, so comparing the session's
+projects with the browser's needs no encoding: a save only encodes and
+writes projects whose content the browser does not already hold, and a load
+only fetches (and returns) projects whose content differs from the copy of
+the same name in the session.
+The meta key is switched last, so a failed save never damages the previous
+copy. Loads come back one chunk per component message and are verified
+against the stored hash.
+
+Copies written by earlier versions (the plain JSON ``siama_projects_v1``
+key) are still read, and replaced on the next save.
+"""
+import base64
+import hashlib
+import os
+import uuid
+from datetime import datetime
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from siama.project_format import (
+    deserialize_projects,
+    dump_project_binary,
+    load_project_binary,
+)
+
+STORAGE_PREFIX = "siama_projects_v2"
+META_KEY = f"{STORAGE_PREFIX}:meta"
+LEGACY_KEY = "siama_projects_v1"
+STORAGE_VERSION = 3
+CHUNK_CHARS = 256 * 1024
+
+_SYNC_STATE = "_browser_sync"
+
+_component = components.declare_component(
+    "siama_browser_sync",
+    path=os.path.join(os.path.dirname(__file__), "browser_sync_frontend"),
+)
+
+
+def _project_key(sha, i):
+    return f"{STORAGE_PREFIX}:p:{sha[:16]}:{i}"
+
+
+def _chunk_keys(entry):
+    return [_project_key(entry["sha256"], i) for i in range(entry["chunks"])]
+
+
+def encode_project(project):
+    """Return ``(entry, chunks)`` for storing one project in the browser."""
+    raw = dump_project_binary(project)
+    text = base64.b64encode(raw).decode("ascii")
+    chunks = [text[i:i + CHUNK_CHARS] for i in range(0, len(text), CHUNK_CHARS)] or [""]
+    entry = {
+        "sha256": hashlib.sha256(raw).hexdigest(),
+        "bytes": len(raw),
+        "size": len(text),
+        "chunks": len(chunks),
+    }
+    return entry, chunks
+
+
+def _verified_bytes(entry, chunks):
+    if len(chunks) != entry.get("chunks"):
+        raise ValueError(f"Incomplete browser copy: got {len(chunks)} of {entry.get('chunks')} chunk(s).")
+    text = "".join(chunks)
+    if len(text) != entry.get("size"):
+        raise ValueError("Browser copy is truncated (size mismatch).")
+    raw = base64.b64decode(text)
+    if hashlib.sha256(raw).hexdigest() != entry.get("sha256"):
+        raise ValueError("Browser copy failed its integrity check (hash mismatch).")
+    return raw
+
+
+def decode_project(entry, chunks):
+    """Reassemble one project read back from the browser.
+
+    Raises ValueError if chunks are missing or the content does not match the
+    hash recorded at save time.
+    """
+    return load_project_binary(_verified_bytes(entry, chunks))
+
+
+def _content_hashes(projects_dict):
+    if hasattr(projects_dict, "content_hashes"):
+        return projects_dict.content_hashes()
+    # A plain dict of projects: nothing stored to derive the hashes from.
+    return {name: encode_project(proj)[0]["sha256"] for name, proj in projects_dict.items()}
+
+
+# ----- Transfer planning -----
+
+def _plan_push(projects_dict, manifest):
+    browser = manifest.get("meta") or {}
+    old = browser.get("projects", {}) if browser.get("version") == STORAGE_VERSION else {}
+    stored = {e["sha256"] for e in old.values()}
+    held = {e["content"]: e for e in old.values() if e.get("content")}
+    entries, items = {}, {}
+    summary = {"written": 0, "written_bytes": 0, "skipped": 0, "skipped_bytes": 0}
+    for name, content in _content_hashes(projects_dict).items():
+        if content in held:
+            entries[name] = dict(held[content])
+            summary["skipped"] += 1
+            summary["skipped_bytes"] += entries[name]["bytes"]
+            continue
+        proj = projects_dict[name]
+        entry, chunks = encode_project(proj)
+        entry["content"] = content
+        entry["updated"] = proj.get("updated") if isinstance(proj, dict) else None
+        entries[name] = entry
+        if entry["sha256"] in stored:
+            summary["skipped"] += 1
+            summary["skipped_bytes"] += entry["bytes"]
+        else:
+            stored.add(entry["sha256"])
+            items.update(zip(_chunk_keys(entry), chunks))
+            summary["written"] += 1
+            summary["written_bytes"] += entry["bytes"]
+
+    keep = {e["sha256"] for e in entries.values()}
+    remove = [k for e in old.values() if e["sha256"] not in keep for k in _chunk_keys(e)]
+    if manifest.get("legacy_length") is not None:
+        remove.append(LEGACY_KEY)
+    summary["removed"] = len({e["sha256"] for e in old.values()} - keep)
+    summary["projects"] = len(entries)
+
+    unchanged = (
+        not items and not remove
+        and {n: e["sha256"] for n, e in old.items()} == {n: e["sha256"] for n, e in entries.items()}
+    )
+    if unchanged:
+        return None, summary
+    meta = {
+        "version": STORAGE_VERSION,
+        "saved": datetime.now().isoformat(timespec="seconds"),
+        "projects": entries,
+    }
+    request = {"op": "write", "items": items, "meta": meta, "remove": list(dict.fromkeys(remove))}
+    return request, summary
+
+
+def _plan_pull(projects_dict, manifest):
+    browser = manifest.get("meta") or {}
+    plan = {"layout": None, "reads": [], "received": []}
+    if browser.get("version") == STORAGE_VERSION:
+        local = _content_hashes(projects_dict)
+        plan.update(layout="projects", entries=browser.get("projects", {}), fetch=[])
+        for name, entry in plan["entries"].items():
+            if entry.get("content") is None or entry.get("content") != local.get(name):
+                plan["fetch"].append(name)
+                plan["reads"] += [{"key": k} for k in _chunk_keys(entry)]
+    elif manifest.get("legacy_length"):
+        plan["layout"] = "legacy"
+        plan["reads"] = [
+            {"key": LEGACY_KEY, "start": start, "end": start + CHUNK_CHARS}
+            for start in range(0, manifest["legacy_length"], CHUNK_CHARS)
+        ]
+    return plan
+
+
+def _finish_pull(plan):
+    received = plan["received"]
+    if plan["layout"] is None:
+        return {"projects": {}, "names": [], "fetched": 0, "fetched_bytes": 0, "reused": 0, "reused_bytes": 0}
+    if plan["layout"] == "legacy":
+        loaded = deserialize_projects("".join(received))
+        return {"projects": loaded, "names": list(loaded), "fetched": len(loaded),
+                "fetched_bytes": sum(map(len, received)), "reused": 0, "reused_bytes": 0}
+
+    fetched, pos = {}, 0
+    for name in plan["fetch"]:
+        entry = plan["entries"][name]
+        fetched[name] = decode_project(entry, received[pos:pos + entry["chunks"]])
+        pos += entry["chunks"]
+    unchanged = [name for name in plan["entries"] if name not in fetched]
+    return {
+        "projects": fetched,
+        "names": list(plan["entries"]),
+        "fetched": len(fetched),
+        "fetched_bytes": sum(plan["entries"][n]["bytes"] for n in fetched),
+        "reused": len(unchanged),
+        "reused_bytes": sum(plan["entries"][n]["bytes"] for n in unchanged),
+    }
+
+
+# ----- Transfer driver -----
+
+def _start(op):
+    st.session_state[_SYNC_STATE] = {
+        "op": op,
+        "nonce": uuid.uuid4().hex,
+        "step": 0,
+        "request": {"op": "manifest"},
+    }
+
+
+def start_push():
+    _start("push")
+
+
+def start_pull():
+    _start("pull")
+
+
+def _on_value(widget_key):
+    state = st.session_state.get(_SYNC_STATE)
+    value = st.session_state.get(widget_key)
+    if (state and isinstance(value, dict)
+            and value.get("nonce") == state["nonce"] and value.get("step") == state["step"]):
+        state["reply"] = value
+
+
+def _advance(state, reply, projects_dict):
+    """Consume one reply; return the finished summary or None to continue."""
+    if reply.get("error"):
+        raise ValueError(reply["error"])
+    kind = state["request"]["op"]
+    if kind == "manifest":
+        if state["op"] == "push":
+            request, summary = _plan_push(projects_dict, reply)
+            if request is None:
+                return summary
+            state["summary"] = summary
+            state["request"] = request
+            return None
+        state["plan"] = _plan_pull(projects_dict, reply)
+    elif kind == "write":
+        return state["summary"]
+    elif kind == "read":
+        if reply.get("data") is None:
+            raise ValueError(f"Browser copy is incomplete: '{state['request']['key']}' is missing.")
+        state["plan"]["received"].append(reply["data"])
+
+    plan = state["plan"]
+    done = len(plan["received"])
+    if done == len(plan["reads"]):
+        return _finish_pull(plan)
+    state["request"] = {"op": "read", "start": None, "end": None, **plan["reads"][done]}
+    return None
+
+
+def _label(state):
+    if state["op"] == "push":
+        return "⏳ Saving to browser…"
+    plan = state.get("plan")
+    if plan and plan["reads"]:
+        return f"⏳ Reading browser storage… chunk {len(plan['received']) + 1} of {len(plan['reads'])}"
+    return "⏳ Reading browser storage…"
+
+
+def sync_step(projects_dict, key="_browser_sync_component"):
+    """Drive an in-progress push or pull by one request.
+
+    Returns ``(op, summary)`` once the transfer has finished, None while it is
+    still running. For pulls, ``summary["names"]`` lists every project the
+    browser holds and ``summary["projects"]`` only those whose content differs
+    from ``projects_dict``'s copy under the same name. Raises ValueError on a
+    browser error or failed integrity check.
+    """
+    state = st.session_state.get(_SYNC_STATE)
+    if state is None:
+        return None
+    reply = state.pop("reply", None)
+    if reply is not None:
+        try:
+            summary = _advance(state, reply, projects_dict)
+        except Exception:
+            del st.session_state[_SYNC_STATE]
+            raise
+        if summary is not None:
+            del st.session_state[_SYNC_STATE]
+            return state["op"], summary
+        state["step"] += 1
+    _component(
+        key=key,
+        default=None,
+        on_change=lambda: _on_value(key),
+        nonce=state["nonce"],
+        step=state["step"],
+        request=state["request"],
+        meta_key=META_KEY,
+        legacy_key=LEGACY_KEY,
+        label=_label(state),
+    )
+    return None
+
+
+def transfer_progress():
+    """``(received, total)`` chunks for the running pull, or None."""
+    state = st.session_state.get(_SYNC_STATE)
+    plan = (state or {}).get("plan")
+    if not plan or not plan["reads"]:
+        return None
+    return len(plan["received"]), len(plan["reads"])
@@ -0,0 +1,358 @@
+"""K-means clustering of SAT ratings.
+
+``cluster`` standardizes the chosen rating columns and fits k-means. The run
+is summarized in ``sat_data['clustering']`` (features, k, centroids in rating
+units, inertia, iterations, time) and the next run with the same features and
+k starts from those centroids: after a few ratings were added or changed, one
+or two passes over the data are enough. Without a previous run, sets of
+``MINIBATCH_ROWS`` stakeholders or more are fitted with mini-batch k-means
+instead of ten full k-means restarts.
+
+The summary also keeps the fitted scaler and, once the view has named them,
+the subgroup of each centroid. ``place`` then puts a newly rated or re-rated
+stakeholder in the subgroup of its nearest centroid without refitting, and
+``drift`` measures how far the data has moved from the fit so the tab can
+suggest a full refit.
+
+``sweep`` fits every k in a range (on several cores for larger sets) and
+scores each with its silhouette and inertia, so the tab can suggest k. The tab
+runs it as a background job (``sweep_job``, see ``siama.jobs``).
+
+``consensus`` measures how stable the clusters are: it clusters bootstrap
+resamples of the ratings (on all cores for larger sets), labels every
+stakeholder with each resample's model, and from how often pairs end up
+together derives a consensus partition and a stability score per
+stakeholder.
+"""
+import os
+import time
+import warnings
+
+import numpy as np
+import streamlit as st
+
+from siama import stakeholders
+
+MINIBATCH_ROWS = 10_000
+PARALLEL_ROWS = 2_000
+SILHOUETTE_SAMPLE = 5_000
+DRIFT_LIMIT = 1.25
+CHANGED_LIMIT = 0.25
+CONSENSUS_RESAMPLES = 50
+UNSTABLE = 0.6
+STATE = "clustering"
+
+_RANDOM_STATE = 42
+
+
+def _scaled(X):
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    return scaler, scaler.fit_transform(np.asarray(X, dtype=float))
+
+
+def _model(k, rows):
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    if rows >= MINIBATCH_ROWS:
+        return "mini-batch k-means", MiniBatchKMeans(n_clusters=k, n_init=3, batch_size=1024, random_state=_RANDOM_STATE)
+    return "k-means", KMeans(n_clusters=k, n_init=10, random_state=_RANDOM_STATE)
+
+
+def _warm_centers(previous, features, k):
+    if not previous or list(previous.get('features', ())) != list(features) or previous.get('k') != k:
+        return None
+    centers = np.asarray(previous.get('centers') or (), dtype=float)
+    return centers if centers.shape == (k, len(features)) else None
+
+
+def cluster(X, k, features, previous=None):
+    """Cluster the rows of ``X`` (one column per feature) into ``k`` groups.
+
+    ``previous`` is the run summary of an earlier call, used to warm-start if
+    it clustered the same features into ``k`` groups. Returns the labels and
+    the summary of this run.
+    """
+    from sklearn.cluster import KMeans
+
+    start = time.perf_counter()
+    scaler, X_scaled = _scaled(X)
+    centers = _warm_centers(previous, features, k)
+    if centers is not None:
+        algorithm = "k-means (warm start)"
+        model = KMeans(n_clusters=k, init=scaler.transform(centers), n_init=1, random_state=_RANDOM_STATE)
+    else:
+        algorithm, model = _model(k, len(X_scaled))
+    labels = model.fit_predict(X_scaled)
+    spread = ((X_scaled - model.cluster_centers_[labels]) ** 2).sum(axis=1).mean()
+    return labels, {
+        'algorithm': algorithm,
+        'features': list(features),
+        'k': k,
+        'rows': len(X_scaled),
+        'centers': scaler.inverse_transform(model.cluster_centers_).tolist(),
+        'scaler': {'mean': scaler.mean_.tolist(), 'scale': scaler.scale_.tolist()},
+        'spread': float(spread),
+        'placed': 0,
+        'inertia': float(model.inertia_),
+        'iterations': int(model.n_iter_),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def describe(run):
+    """One line summarizing a run returned by ``cluster`` or ``consensus``."""
+    line = (f"{run['algorithm'].capitalize()} on {run['rows']:,} stakeholders: "
+            f"{run['iterations']} iteration(s) in {run['seconds'] * 1000:.1f} ms, inertia {run['inertia']:,.2f}")
+    if 'stability' in run:
+        line += f", mean stability {run['stability']:.0%}"
+    return line
+
+
+def name_clusters(frame, k, label="Cluster"):
+    """``{i: {'name', 'description'}}`` for the clusters in ``frame['cluster']``.
+
+    Clusters are named after where their mean power and interest fall on the
+    power-interest matrix.
+    """
+    names = {}
+    for i in range(k):
+        members = frame[frame['cluster'] == i]
+        avg_power = members['power'].mean()
+        avg_interest = members['interest'].mean()
+        if avg_power > 6.5 and avg_interest > 6.5:
+            name, desc = "Key Players", "High power, high interest - manage closely"
+        elif avg_power > 6.5 and avg_interest <= 6.5:
+            name, desc = "Keep Satisfied", "High power, lower interest - keep satisfied"
+        elif avg_power <= 6.5 and avg_interest > 6.5:
+            name, desc = "Keep Informed", "Lower power, high interest - keep informed"
+        else:
+            name, desc = "Monitor", "Lower power, lower interest - monitor"
+        names[i] = {'name': f"{name} ({label} {i+1})", 'description': desc}
+    return names
+
+
+def _nearest(run, X, centers=None):
+    # Nearest centroid of each row of X and the squared distance to it, in the run's scaled space.
+    mean, scale = np.asarray(run['scaler']['mean']), np.asarray(run['scaler']['scale'])
+    if centers is None:
+        centers = np.arange(run['k'])
+    scaled = (np.asarray(X, dtype=float) - mean) / scale
+    targets = (np.asarray(run['centers'], dtype=float)[centers] - mean) / scale
+    distances = ((scaled[:, None, :] - targets[None, :, :]) ** 2).sum(axis=2)
+    nearest = distances.argmin(axis=1)
+    return np.asarray(centers)[nearest], distances[np.arange(len(scaled)), nearest]
+
+
+def _placeable(run):
+    return bool(run) and 'scaler' in run and len(run.get('subgroups') or ()) == run['k']
+
+
+def place(record):
+    """Move the stakeholder rated by ``record`` to the subgroup of its nearest centroid.
+
+    Only the subgroups of the last clustering run are touched, and only those
+    that still exist. Returns the subgroup, or ``None`` if there is none.
+    """
+    sat = st.session_state.sat_data
+    run = sat.get(STATE)
+    if not _placeable(run):
+        return None
+    names = run['subgroups']
+    existing = [i for i, name in enumerate(names) if name in sat.get('subgroups', {})]
+    if not existing:
+        return None
+    sid = record['stakeholder_id']
+    values = [[record.get(feature, 0) or 0 for feature in run['features']]]
+    target = names[int(_nearest(run, values, existing)[0][0])]
+    for i in existing:
+        if names[i] != target and sid in sat['subgroups'][names[i]]['members']:
+            stakeholders.unassign(names[i], sid)
+    stakeholders.assign(sid, target)
+    run['placed'] = run.get('placed', 0) + 1
+    return target
+
+
+def drift(run, X):
+    """How far the ratings ``X`` (the run's features) have moved since ``run``.
+
+    Returns ``{'ratio', 'placed', 'refit'}``: the mean squared distance to
+    the nearest centroid now over the same at fit time, the ratings placed
+    since relative to those fitted, and whether a full refit is suggested.
+    """
+    if not _placeable(run) or not len(X) or not run.get('spread'):
+        return None
+    ratio = float(_nearest(run, X)[1].mean() / run['spread'])
+    placed = run.get('placed', 0) / max(run['rows'], 1)
+    return {'ratio': ratio, 'placed': placed, 'refit': ratio > DRIFT_LIMIT or placed > CHANGED_LIMIT}
+
+
+def _score(X_scaled, k):
+    from sklearn.metrics import silhouette_score
+
+    start = time.perf_counter()
+    _, model = _model(k, len(X_scaled))
+    labels = model.fit_predict(X_scaled)
+    silhouette = float("nan")
+    if 2 <= len(np.unique(labels)) < len(X_scaled):
+        sample = SILHOUETTE_SAMPLE if len(X_scaled) > SILHOUETTE_SAMPLE else None
+        silhouette = float(silhouette_score(X_scaled, labels, sample_size=sample, random_state=_RANDOM_STATE))
+    return {'k': k, 'inertia': float(model.inertia_), 'silhouette': silhouette,
+            'seconds': time.perf_counter() - start}
+
+
+def sweep(X, ks, progress=None):
+    """Fit and score each k in ``ks``: ``[{k, inertia, silhouette, seconds}]``.
+
+    Sets of ``PARALLEL_ROWS`` or more are fitted on up to one core per k.
+    Silhouettes of sets over ``SILHOUETTE_SAMPLE`` are estimated on a sample.
+    ``progress(fraction, message)`` is called after each batch of fits.
+    """
+    from joblib import Parallel, delayed
+
+    _, X_scaled = _scaled(X)
+    ks = list(ks)
+    jobs = min(len(ks), os.cpu_count() or 1) if len(X_scaled) >= PARALLEL_ROWS else 1
+    scores = []
+    with Parallel(n_jobs=jobs) as parallel:
+        for i in range(0, len(ks), jobs):
+            batch = ks[i:i + jobs]
+            scores.extend(parallel(delayed(_score)(X_scaled, k) for k in batch))
+            if progress:
+                progress(len(scores) / len(ks), f"k = {batch[-1]} of {ks[-1]}")
+    return scores
+
+
+def elbow_k(scores):
+    """The k where inertia bends most: farthest from the first-to-last chord."""
+    if len(scores) < 3:
+        return scores[0]['k'] if scores else None
+    ks = np.array([s['k'] for s in scores], dtype=float)
+    inertia = np.array([s['inertia'] for s in scores])
+    x = (ks - ks[0]) / (ks[-1] - ks[0])
+    span = inertia[0] - inertia[-1]
+    y = (inertia - inertia[-1]) / span if span > 0 else np.zeros_like(inertia)
+    # The chord runs from (0, 1) to (1, 0); distance to it is proportional to 1 - x - y.
+    return int(ks[np.argmax(1 - x - y)])
+
+
+def best_k(scores):
+    """The k with the highest silhouette, or the elbow if none could be scored."""
+    scored = [s for s in scores if not np.isnan(s['silhouette'])]
+    if not scored:
+        return elbow_k(scores)
+    return max(scored, key=lambda s: s['silhouette'])['k']
+
+
+def cluster_job(job, X, k, features, previous=None):
+    """``siama.jobs`` job: ``cluster``."""
+    job.update(0.0, f"fitting {k} clusters to {len(X):,} stakeholders")
+    return cluster(X, k, features, previous)
+
+
+def sweep_job(job, X, ks):
+    """``siama.jobs`` job: ``sweep`` reporting to the job."""
+    return sweep(X, ks, progress=job.update)
+
+
+def _resample(X_scaled, k, seed):
+    # Fit one bootstrap resample and label every row with its model.
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+    from sklearn.exceptions import ConvergenceWarning
+
+    rows = np.random.default_rng(seed).integers(0, len(X_scaled), len(X_scaled))
+    if len(X_scaled) >= MINIBATCH_ROWS:
+        model = MiniBatchKMeans(n_clusters=k, n_init=1, batch_size=1024, random_state=seed)
+    else:
+        model = KMeans(n_clusters=k, n_init=1, random_state=seed)
+    with warnings.catch_warnings():
+        # Small sets: a resample may hold fewer distinct ratings than k.
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        model.fit(X_scaled[rows])
+    return model.predict(X_scaled).astype(np.int16)
+
+
+def _one_hot(assignments, k):
+    # Row i holds one 1 per resample, at its label there: H @ H.T counts co-assignments.
+    n, resamples = assignments.shape
+    H = np.zeros((n, resamples * k), dtype=np.float32)
+    H[np.arange(n)[:, None], np.arange(resamples) * k + assignments] = 1
+    return H
+
+
+def coassignment(assignments, rows=None):
+    """Share of resamples in which each pair of ``rows`` was clustered together."""
+    a = assignments if rows is None else assignments[rows]
+    return (a[:, None, :] == a[None, :, :]).mean(axis=2)
+
+
+def consensus(X, k, features, resamples=CONSENSUS_RESAMPLES, progress=None):
+    """Consensus clustering of the rows of ``X`` over bootstrap resamples.
+
+    Each resample is clustered into ``k`` groups and its model labels every
+    row, so every pair of rows is compared ``resamples`` times. The consensus
+    partition is k-means on those co-assignment profiles (rows that were
+    usually together end up together) and a row's stability is the mean
+    share of resamples it shared with the other members of its consensus
+    cluster. Sets of ``PARALLEL_ROWS`` or more run the resamples on all cores.
+
+    Returns ``{'labels', 'stability', 'assignments', 'run'}``: the consensus
+    labels and stabilities per row, the labels of every resample (rows ×
+    resamples, see ``coassignment``) and a run summary like ``cluster``'s,
+    with the consensus clusters' means as centroids.
+    """
+    from joblib import Parallel, delayed
+    from sklearn.cluster import KMeans
+
+    start = time.perf_counter()
+    scaler, X_scaled = _scaled(X)
+    n = len(X_scaled)
+    jobs = (os.cpu_count() or 1) if n >= PARALLEL_ROWS else 1
+    assignments = np.empty((n, resamples), dtype=np.int16)
+    with Parallel(n_jobs=jobs, return_as="generator") as parallel:
+        fits = parallel(delayed(_resample)(X_scaled, k, _RANDOM_STATE + r) for r in range(resamples))
+        for r, labels in enumerate(fits):
+            assignments[:, r] = labels
+            if progress:
+                progress(0.9 * (r + 1) / resamples, f"resample {r + 1} of {resamples}")
+
+    if progress:
+        progress(0.9, "consensus partition")
+    H = _one_hot(assignments, k)
+    model = KMeans(n_clusters=k, n_init=10, random_state=_RANDOM_STATE)
+    labels = model.fit_predict(H)
+    sizes = np.bincount(labels, minlength=k)
+    together = (H * (np.eye(k, dtype=np.float32)[labels].T @ H)[labels]).sum(axis=1)
+    # Each row is with itself in every resample; leave that out.
+    stability = np.where(sizes[labels] > 1, (together - resamples) / (resamples * np.maximum(sizes[labels] - 1, 1)), 1.0)
+
+    sums = np.zeros((k, X_scaled.shape[1]))
+    np.add.at(sums, labels, X_scaled)
+    centers = sums / np.maximum(sizes, 1)[:, None]
+    distances = ((X_scaled - centers[labels]) ** 2).sum(axis=1)
+    return {
+        'labels': labels,
+        'stability': stability,
+        'assignments': assignments,
+        'run': {
+            'algorithm': f"consensus of {resamples} bootstrap k-means",
+            'features': list(features),
+            'k': k,
+            'rows': n,
+            'centers': scaler.inverse_transform(centers).tolist(),
+            'scaler': {'mean': scaler.mean_.tolist(), 'scale': scaler.scale_.tolist()},
+            'spread': float(distances.mean()),
+            'placed': 0,
+            'inertia': float(distances.sum()),
+            'iterations': int(model.n_iter_),
+            'seconds': time.perf_counter() - start,
+            'resamples': resamples,
+            'stability': float(stability.mean()),
+        },
+    }
+
+
+def consensus_job(job, X, k, features, resamples=CONSENSUS_RESAMPLES):
+    """``siama.jobs`` job: ``consensus`` reporting to the job."""
+    return consensus(X, k, features, resamples, progress=job.update)
@@ -0,0 +1,97 @@
+"""Per-session cache of built Plotly figures.
+
+Building a figure (``px.*`` especially) costs far more than sending it, yet
+every rerun rebuilt every chart on the page. ``cached_figure`` reuses the
+figure built earlier from equal inputs, identified by a digest of their
+pickled form. Entries are evicted least-recently-used beyond ``MAX_ENTRIES``
+figures or ``MAX_BYTES`` per session, a figure's size being estimated from
+the lengths of its traces' data arrays rather than by serializing it.
+"""
+import hashlib
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+
+import streamlit as st
+
+from siama import profiling
+
+MAX_ENTRIES = 48
+MAX_BYTES = 24 * 1024 * 1024
+
+_CACHE = "_figure_cache"
+# Trace properties that carry per-point data, and a rough serialized size of
+# one value; anything else in a figure is small next to them.
+_ARRAY_PROPS = ("x", "y", "z", "r", "theta", "lat", "lon", "values", "labels", "parents", "ids",
+                "text", "hovertext", "customdata")
+_MARKER_PROPS = ("color", "size")
+_VALUE_BYTES = 12
+_TRACE_BYTES = 2048
+
+
+def fingerprint(inputs):
+    return hashlib.blake2b(pickle.dumps(inputs, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16).hexdigest()
+
+
+def _size(fig):
+    size = _TRACE_BYTES  # the layout
+    for trace in fig.data:
+        size += _TRACE_BYTES
+        marker = trace.marker if "marker" in trace else None
+        values = [trace[p] for p in _ARRAY_PROPS if p in trace]
+        values += [marker[p] for p in _MARKER_PROPS if p in marker] if marker is not None else []
+        size += sum(_length(v) for v in values) * _VALUE_BYTES
+    return size
+
+
+def _length(value):
+    if isinstance(value, np.ndarray):
+        return value.size
+    if isinstance(value, (str, bytes)) or not hasattr(value, "__len__") or not len(value):
+        return 0
+    # Lists of rows (a heatmap's z) count every cell.
+    first = value[0]
+    return len(value) * (len(first) if isinstance(first, (list, tuple, np.ndarray)) else 1)
+
+
+def _cache():
+    cache = st.session_state.get(_CACHE)
+    if cache is None:
+        cache = st.session_state[_CACHE] = {"entries": OrderedDict(), "bytes": 0}
+    return cache
+
+
+def cached_figure(name, inputs, build):
+    """Return ``build()``, or the figure it returned before for equal ``inputs``.
+
+    ``inputs`` must cover everything ``build`` reads; the returned figure is
+    shared between reruns and must not be modified.
+    """
+    cache = _cache()
+    entries = cache["entries"]
+    key = (name, fingerprint(inputs))
+    if key in entries:
+        entries.move_to_end(key)
+        return entries[key][0]
+    with profiling.section(f"figure build: {name}"):
+        fig = build()
+    size = _size(fig)
+    entries[key] = (fig, size)
+    cache["bytes"] += size
+    while len(entries) > 1 and (len(entries) > MAX_ENTRIES or cache["bytes"] > MAX_BYTES):
+        _, (_, evicted) = entries.popitem(last=False)
+        cache["bytes"] -= evicted
+    return fig
+
+
+def plot_figure(name, inputs, build, **kwargs):
+    """``st.plotly_chart`` the ``cached_figure`` for ``inputs``."""
+    fig = cached_figure(name, inputs, build)
+    with profiling.section(f"plotly_chart: {name}"):
+        return st.plotly_chart(fig, **kwargs)
+
+
+def cache_stats():
+    cache = _cache()
+    return {"entries": len(cache["entries"]), "bytes": cache["bytes"]}
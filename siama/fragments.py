@@ -0,0 +1,24 @@
+"""List management that reruns only the parts of a page it affects.
+
+Pages wrap each list, and the charts derived from it, in a keyed fragment
+(``@st.fragment(key=...)``). ``action_button`` applies its change in an
+``on_click`` callback and then reruns just the fragments named in ``views``
+instead of the whole page. Without ``views`` the page reruns in full, which
+callers ask for when the change shows or hides whole sections (e.g. the last
+entry of a list was removed).
+"""
+import streamlit as st
+
+from siama import autosave
+
+
+def _apply(change, args, views):
+    change(*args)
+    # Fragment reruns skip the end-of-script autosave, so queue the edit here.
+    autosave.track_session()
+    st.rerun(list(views) if views else "app")
+
+
+def action_button(label, change, args=(), views=None, **kwargs):
+    """``st.button`` that calls ``change(*args)`` and reruns ``views``."""
+    return st.button(label, on_click=_apply, args=(change, args, views), **kwargs)
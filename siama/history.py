@@ -0,0 +1,67 @@
+"""Section-by-section differences between two saved project versions."""
+import json
+
+import pandas as pd
+
+from siama.project_format import project_json_default
+
+_MAX_ITEMS = 5
+
+
+def _key(value):
+    return json.dumps(value, sort_keys=True, default=project_json_default)
+
+
+def _preview(value, limit=80):
+    text = value if isinstance(value, str) else _key(value)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _items(values):
+    shown = ", ".join(_preview(v, 40) for v in values[:_MAX_ITEMS])
+    return shown + (f" (+{len(values) - _MAX_ITEMS} more)" if len(values) > _MAX_ITEMS else "")
+
+
+def _diff(old, new, path, out):
+    if isinstance(old, pd.DataFrame) and isinstance(new, pd.DataFrame):
+        if not old.equals(new):
+            out.append({"path": path, "change": "changed",
+                        "detail": f"table {old.shape[0]}×{old.shape[1]} → {new.shape[0]}×{new.shape[1]}"})
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for k in list(old) + [k for k in new if k not in old]:
+            sub = f"{path}.{k}" if path else str(k)
+            if k not in new:
+                out.append({"path": sub, "change": "removed", "detail": _preview(old[k])})
+            elif k not in old:
+                out.append({"path": sub, "change": "added", "detail": _preview(new[k])})
+            else:
+                _diff(old[k], new[k], sub, out)
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        old_keys, new_keys = [_key(v) for v in old], [_key(v) for v in new]
+        if old_keys == new_keys:
+            return
+        old_set, new_set = set(old_keys), set(new_keys)
+        added = [v for v, k in zip(new, new_keys) if k not in old_set]
+        removed = [v for v, k in zip(old, old_keys) if k not in new_set]
+        if added:
+            out.append({"path": path, "change": "added", "detail": f"{len(added)} item(s): {_items(added)}"})
+        if removed:
+            out.append({"path": path, "change": "removed", "detail": f"{len(removed)} item(s): {_items(removed)}"})
+        if not added and not removed:
+            out.append({"path": path, "change": "changed", "detail": "items reordered"})
+        return
+    if _key(old) != _key(new):
+        out.append({"path": path, "change": "changed", "detail": f"{_preview(old, 38)} → {_preview(new, 38)}"})
+
+
+def diff_sections(old, new):
+    """List the changes from ``old`` to ``new`` (``{section: value}`` mappings).
+
+    Each change is ``{"path", "change", "detail"}`` where ``change`` is
+    ``added``, ``removed`` or ``changed``.
+    """
+    out = []
+    _diff(old, new, "", out)
+    return out
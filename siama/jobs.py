@@ -0,0 +1,251 @@
+"""Background jobs, shared by all sessions of the server process.
+
+Heavy work (clustering sweeps, the Excel export, portfolio clustering) runs on
+one process-wide thread pool instead of inside the rerun that handled the
+click, so the page stays live and can show progress. A job function is called
+as ``fn(job, *args, **kwargs)``; it reports progress with ``job.update``,
+which also raises ``Cancelled`` once the job was cancelled.
+
+Jobs submitted with equal ``key``\\ s are deduplicated: while one is queued or
+running, or for ``KEEP_SECONDS`` after it succeeded, submitting again returns
+it instead of starting another.
+
+Sessions follow jobs by name: ``start`` submits one and remembers it,
+``watch`` shows its progress with a cancel button (polling in a fragment and
+rerunning the page when it ends) and ``result`` returns the result once
+done, keeping it in ``st.session_state[name]``. A job shared by several
+sessions is only cancelled once all of them cancelled or left it; until
+then cancelling just stops following it.
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from siama.figures import fingerprint
+
+WORKERS = 4
+KEEP_SECONDS = 600
+POLL_SECONDS = 1.0
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+_SESSION = "_jobs"
+_CANCELLED = "_jobs_cancelled"
+_ids = itertools.count(1)
+_jobs = {}
+_lock = threading.Lock()
+_pool = None
+
+
+class Cancelled(Exception):
+    """Raised by ``Job.update`` in a job that was cancelled."""
+
+
+class Job:
+    def __init__(self, label, key):
+        self.id = next(_ids)
+        self.label = label
+        self.key = key
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.finished = None
+        self._cancel = threading.Event()
+        self._future = None
+        self._followers = 0
+
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    def update(self, progress=None, message=None):
+        """Report progress (0-1) and what is being done; raises ``Cancelled`` if cancelled."""
+        if self._cancel.is_set():
+            raise Cancelled()
+        if progress is not None:
+            self.progress = min(1.0, max(0.0, progress))
+        if message is not None:
+            self.message = message
+
+    def cancel(self):
+        """Ask the job to stop. A queued job never starts; a running one stops at its next ``update``."""
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self._finish(CANCELLED)
+
+    def follow(self):
+        with _lock:
+            self._followers += 1
+
+    def release(self):
+        """Stop following the job; the last follower leaving a running job cancels it."""
+        with _lock:
+            self._followers -= 1
+            last = self._followers <= 0
+        if last and not self.done:
+            self.cancel()
+
+    def _run(self, fn, args, kwargs):
+        self.status = RUNNING
+        try:
+            self.update()
+            result = fn(self, *args, **kwargs)
+        except Cancelled:
+            self._finish(CANCELLED)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self._finish(FAILED)
+        else:
+            self.result = result
+            self.progress = 1.0
+            self._finish(DONE)
+
+    def _finish(self, status):
+        self.finished = time.monotonic()
+        self.status = status
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="siama-job")
+    return _pool
+
+
+def _prune(now):
+    for key, job in list(_jobs.items()):
+        if job.done and (job.status != DONE or now - job.finished > KEEP_SECONDS):
+            del _jobs[key]
+
+
+def submit(label, fn, *args, key=None, **kwargs):
+    """Run ``fn(job, *args, **kwargs)`` on the pool and return its ``Job``.
+
+    ``key`` (anything picklable) identifies the inputs; a job with the same
+    ``fn`` and ``key`` is reused as described above. Without a key every call
+    starts a new job.
+    """
+    with _lock:
+        _prune(time.monotonic())
+        digest = None
+        if key is not None:
+            digest = fingerprint((fn.__module__, fn.__qualname__, key))
+            if digest in _jobs:
+                return _jobs[digest]
+        job = Job(label, digest)
+        _jobs[digest if digest is not None else ("job", job.id)] = job
+        job._future = _executor().submit(job._run, fn, args, kwargs)
+        return job
+
+
+def clear():
+    """Forget every finished job, so that equal submissions run again."""
+    with _lock:
+        for key, job in list(_jobs.items()):
+            if job.done:
+                del _jobs[key]
+
+
+def active():
+    """Jobs of all sessions that are queued or running."""
+    with _lock:
+        return [job for job in _jobs.values() if not job.done]
+
+
+# ----- Session side -----
+
+def start(name, label, fn, *args, key=None, **kwargs):
+    """``submit`` a job and follow it in this session as ``name``, instead of
+    the job followed as ``name`` before."""
+    job = submit(label, fn, *args, key=key, **kwargs)
+    previous = current(name)
+    if previous is not job:
+        job.follow()
+        if previous is not None:
+            previous.release()
+    st.session_state.setdefault(_SESSION, {})[name] = job
+    st.session_state.setdefault(_CANCELLED, {}).pop(name, None)
+    st.session_state.pop(name, None)
+    return job
+
+
+def current(name):
+    """This session's job ``name``, until its result has been collected."""
+    return st.session_state.get(_SESSION, {}).get(name)
+
+
+def running(name):
+    job = current(name)
+    return job is not None and not job.done
+
+
+def result(name):
+    """The result of this session's job ``name``, once it succeeded.
+
+    The result is kept as ``st.session_state[name]``, where it stays after
+    the job itself is forgotten.
+    """
+    job = current(name)
+    if job is not None and job.status == DONE:
+        st.session_state[name] = job.result
+        _detach(name)
+    return st.session_state.get(name)
+
+
+def _detach(name):
+    job = st.session_state.get(_SESSION, {}).pop(name, None)
+    if job is not None:
+        job.release()
+    return job
+
+
+def _cancel(name):
+    job = _detach(name)
+    if job is not None:
+        st.session_state.setdefault(_CANCELLED, {})[name] = job.label
+
+
+def forget(name):
+    _detach(name)
+    st.session_state.pop(name, None)
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _progress(name):
+    job = current(name)
+    if job is None or job.done:
+        st.rerun(scope="app")
+    c1, c2 = st.columns([5, 1])
+    with c1:
+        st.progress(job.progress, text=f"{job.label}: {job.message or job.status}…")
+    with c2:
+        st.button("✖ Cancel", key=f"_job_cancel_{name}", on_click=_cancel, args=(name,), use_container_width=True)
+
+
+def watch(name):
+    """Show this session's job ``name`` while it runs, and how it ended if it did not succeed.
+
+    Returns whether it is still running.
+    """
+    cancelled = st.session_state.get(_CANCELLED, {}).pop(name, None)
+    if cancelled:
+        st.info(f"{cancelled} was cancelled.")
+        return False
+    job = current(name)
+    if job is None or job.status == DONE:
+        return False
+    if job.done:
+        if job.status == FAILED:
+            st.error(f"❌ {job.label} failed: {job.error}")
+        else:
+            st.info(f"{job.label} was cancelled.")
+        _detach(name)
+        return False
+    _progress(name)
+    return True
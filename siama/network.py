@@ -0,0 +1,72 @@
+"""Edges of the SAT stakeholder network.
+
+Two stakeholders are linked when they share a subgroup. Pairs are found from a
+sparse subgroup × stakeholder membership matrix rather than by looping over
+every pair, and the number drawn is capped: once the pairwise edges of all
+subgroups would exceed ``MAX_EDGES``, the largest subgroups are drawn as a star
+around their hub (their highest-weight member) instead, which keeps each
+subgroup connected with one edge per member.
+"""
+import numpy as np
+
+MAX_EDGES = 5000
+
+
+def membership_matrix(subgroups, positions):
+    """Sparse ``(subgroup, node)`` matrix of ``subgroups`` (``{name: members}``).
+
+    ``positions`` maps member IDs to node positions; other members are left out.
+    """
+    from scipy import sparse
+
+    rows, cols = [], []
+    for row, members in enumerate(subgroups.values()):
+        for sid in members:
+            if sid in positions:
+                rows.append(row)
+                cols.append(positions[sid])
+    matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)),
+                               shape=(len(subgroups), len(positions)))
+    matrix.data[:] = 1  # a member listed twice is still one membership
+    return matrix
+
+
+def shared_edges(subgroups, positions, weights, max_edges=MAX_EDGES):
+    """Edges to draw between stakeholders sharing a subgroup.
+
+    Returns ``(a, b, hubs)``: node positions of each edge's ends, ``a < b``
+    and every pair once, and the names of the subgroups drawn as hub stars.
+    ``weights`` (per node) picks each star's hub.
+    """
+    from scipy import sparse
+
+    matrix = membership_matrix(subgroups, positions)
+    sizes = np.diff(matrix.indptr)
+    pairs = sizes * (sizes - 1) // 2
+    remaining = int(pairs.sum())
+    starred = []
+    for row in np.argsort(-pairs, kind="stable"):
+        if remaining <= max_edges or pairs[row] == 0:
+            break
+        starred.append(row)
+        remaining -= int(pairs[row])
+
+    pairwise = np.ones(len(sizes), dtype=bool)
+    pairwise[starred] = False
+    full = matrix[pairwise]
+    links = sparse.triu(full.T @ full, k=1).tocsr()
+    if starred:
+        weights = np.asarray(weights)
+        a, b = [], []
+        for row in starred:
+            members = matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]
+            hub = members[np.argmax(weights[members])]
+            others = members[members != hub]
+            a.append(np.minimum(hub, others))
+            b.append(np.maximum(hub, others))
+        a, b = np.concatenate(a), np.concatenate(b)
+        stars = sparse.csr_matrix((np.ones(len(a), dtype=np.int32), (a, b)), shape=links.shape)
+        links = links + stars
+    links = links.tocoo()
+    names = list(subgroups)
+    return links.row, links.col, [names[row] for row in starred]
@@ -0,0 +1,53 @@
+"""Searchable, sorted, paginated views of long management lists.
+
+Management lists used to draw a row and its buttons for every entry, so a
+project with thousands of stakeholders meant thousands of widgets per rerun.
+``paged`` filters and sorts the entries on the server and returns one page of
+them, keeping the widget count bounded however large the list grows.
+"""
+import math
+
+import streamlit as st
+
+PAGE_SIZE = 20
+
+_ENTRY_ORDER = "Entry order"
+
+
+def paged(items, key, text, sorts=None, page_size=PAGE_SIZE):
+    """Draw search, sort and page controls for ``items``; return the visible page.
+
+    ``text(item)`` is what the search matches, case-insensitively. ``sorts``
+    maps extra sort labels to key functions. Returns ``(index, item)`` pairs
+    where ``index`` is the item's position in ``items``. Lists that fit on one
+    page are returned whole, without controls.
+    """
+    entries = list(enumerate(items))
+    if len(entries) <= page_size and not st.session_state.get(f"{key}_query"):
+        return entries
+    sorts = sorts or {}
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+    with c1:
+        query = st.text_input("Search", key=f"{key}_query", placeholder="Filter…")
+    with c2:
+        sort_by = st.selectbox("Sort by", [_ENTRY_ORDER] + list(sorts), key=f"{key}_sort")
+    with c3:
+        descending = st.toggle("Descending", key=f"{key}_desc")
+    needle = query.strip().lower()
+    if needle:
+        entries = [(i, item) for i, item in entries if needle in text(item).lower()]
+    if sort_by in sorts:
+        entries.sort(key=lambda entry: sorts[sort_by](entry[1]))
+    if descending:
+        entries.reverse()
+    pages = max(1, math.ceil(len(entries) / page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    with c4:
+        page = st.number_input("Page", min_value=1, max_value=pages, key=page_key)
+    start = (page - 1) * page_size
+    shown = entries[start:start + page_size]
+    st.caption(f"Showing {start + 1 if shown else 0}–{start + len(shown)} of {len(entries)} matching "
+               f"({len(items)} in total)")
+    return shown
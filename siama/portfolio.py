@@ -0,0 +1,150 @@
+"""Portfolio clustering: one stakeholder segmentation across all projects.
+
+``extract`` reads the SIT and SAT sections of every project in a thread pool
+(the rest of each project is never decoded) into one feature matrix with a
+``project`` column. ``cluster_portfolio`` segments it with
+``siama.clustering`` and ``write_back`` stores the segments in each project as
+``"Portfolio: ..."`` subgroups, replacing those of the previous run.
+
+These run as background jobs (see ``siama.jobs``) and do not touch session
+state. The open project is passed in as a copy of the working state and its
+segments are applied to the working state by ``apply_to_working``, like any
+other edit, so autosave and "Save changes" keep it.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from siama import clustering, stakeholders
+from siama.ratings import SCORES
+
+PREFIX = "Portfolio: "
+SECTIONS = ("sit_data", "sat_data")
+WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+_COLUMNS = ["project", "stakeholder_id", "stakeholder", *SCORES]
+
+
+def _ratings(project, sit, sat):
+    stakeholders.migrate(sit, sat)
+    records = sat.get('relationship_data') or []
+    frame = pd.DataFrame({
+        "project": project,
+        "stakeholder_id": np.array([r['stakeholder_id'] for r in records], dtype=np.int64),
+        "stakeholder": [r.get('stakeholder', '') for r in records],
+    })
+    for c in SCORES:
+        frame[c] = np.array([r.get(c) or 0 for r in records], dtype=np.int8)
+    return frame
+
+
+def _load(projects, name):
+    sections = projects.load_sections(name, SECTIONS)
+    return _ratings(name, sections.get('sit_data') or {}, sections.get('sat_data') or {})
+
+
+def extract(projects, names, current=None, progress=None):
+    """Every rating of the projects ``names``, one row each, in ``names`` order.
+
+    ``current`` is ``(name, sit_data, sat_data)`` of the open project, read
+    instead of its saved copy (and migrated in place, so pass copies).
+    ``progress(done, total)`` is called as projects finish.
+    """
+    frames = {}
+    if current is not None and current[0] in names:
+        frames[current[0]] = _ratings(*current)
+    pending = [name for name in names if name not in frames]
+    with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="siama-portfolio") as pool:
+        futures = {pool.submit(_load, projects, name): name for name in pending}
+        try:
+            for done, future in enumerate(as_completed(futures), start=len(frames) + 1):
+                frames[futures[future]] = future.result()
+                if progress:
+                    progress(done, len(names))
+        except BaseException:
+            # Stopped (cancelled or failed): don't read the remaining projects.
+            for future in futures:
+                future.cancel()
+            raise
+    parts = [frames[name] for name in names if len(frames[name])]
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=_COLUMNS)
+
+
+def cluster_portfolio(frame, k, features, previous=None):
+    """Add a ``cluster`` column to ``frame``; returns the segment names and the run.
+
+    ``previous`` is an earlier run to warm-start from (see ``clustering.cluster``).
+    """
+    frame['cluster'], run = clustering.cluster(frame[features].values, k, features, previous=previous)
+    return clustering.name_clusters(frame, k, label="Segment"), run
+
+
+def segments(frame, names):
+    """``{project: {subgroup: (description, members)}}`` for a clustered ``frame``."""
+    result = {}
+    for (project, cluster), members in frame.groupby(['project', 'cluster'], sort=False)['stakeholder_id']:
+        segment = names[int(cluster)]
+        result.setdefault(project, {})[PREFIX + segment['name']] = (
+            f"{segment['description']}\n\nPortfolio segment across all projects", members.tolist())
+    return result
+
+
+def apply_to_working(project_segments):
+    """Replace the working state's ``"Portfolio: ..."`` subgroups with ``project_segments``."""
+    for name in [n for n in st.session_state.sat_data.get('subgroups', {}) if n.startswith(PREFIX)]:
+        stakeholders.delete_subgroup(name)
+    for name, (description, members) in project_segments.items():
+        stakeholders.set_subgroup(name, description, members)
+
+
+def _actor_ids(sit):
+    # All that ``stakeholders.migrate`` changes in SIT.
+    return sit.get(stakeholders.NEXT_ID), [(type(a.get('id')), a.get('id'))
+                                           for actors in (sit.get('roles') or {}).values() for a in actors]
+
+
+def write_back(projects, project_segments, progress=None):
+    """Replace the ``"Portfolio: ..."`` subgroups of each saved project in
+    ``project_segments`` (as returned by ``segments``).
+
+    Only ``sat_data`` is written, plus ``sit_data`` if migrating the project
+    gave its actors IDs. Returns the number of projects that changed.
+    """
+    changed = 0
+    for done, (project, groups) in enumerate(project_segments.items(), start=1):
+        sections = projects.load_sections(project, SECTIONS)
+        sit, sat = sections.get('sit_data') or {}, sections.get('sat_data') or {}
+        before = _actor_ids(sit)
+        stakeholders.migrate(sit, sat)
+        subgroups = {n: g for n, g in (sat.get('subgroups') or {}).items() if not n.startswith(PREFIX)}
+        for name, (description, members) in groups.items():
+            subgroups[name] = {'description': description, 'members': members}
+        sat['subgroups'] = subgroups
+        updates = {'sat_data': sat}
+        if 'sit_data' in sections and _actor_ids(sit) != before:
+            updates['sit_data'] = sit
+        if projects.save_sections(project, updates, kind="portfolio", note="Portfolio clustering"):
+            changed += 1
+        if progress:
+            progress(done, len(project_segments))
+    return changed
+
+
+def cluster_job(job, projects, names, k, features, current=None, previous=None):
+    """``siama.jobs`` job: extract and cluster; returns ``{frame, segments, run}``."""
+    frame = extract(projects, names, current, progress=lambda done, total: job.update(
+        0.9 * done / total, f"reading ratings ({done}/{total} projects)"))
+    if len(frame) < k:
+        raise ValueError(f"only {len(frame)} rating(s) in these projects, too few for {k} segments")
+    job.update(0.9, f"clustering {len(frame):,} ratings")
+    names, run = cluster_portfolio(frame, k, features, previous)
+    return {"frame": frame, "segments": names, "run": run}
+
+
+def write_job(job, projects, project_segments):
+    """``siama.jobs`` job: ``write_back``; returns the number of projects changed."""
+    return write_back(projects, project_segments, progress=lambda done, total: job.update(
+        done / total, f"saving segments ({done}/{total} projects)"))
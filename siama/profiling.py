@@ -0,0 +1,111 @@
+"""Opt-in render profiler.
+
+Set ``SIAMA_PROFILE=1`` to time named sections of every rerun: the page body,
+DataFrame construction, clustering, figure builds, ``st.plotly_chart`` calls
+and autosave serialization. Timings are kept per server process and summarised
+across reruns (count, p50, p95, total) in a sidebar panel. Each full rerun is
+also appended as one JSON line to ``$SIAMA_PROFILE_LOG`` (default
+``siama_profile.jsonl``) so real projects can be analysed afterwards.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_ENV_VAR = "SIAMA_PROFILE"
+LOG_ENV_VAR = "SIAMA_PROFILE_LOG"
+DEFAULT_LOG = "siama_profile.jsonl"
+MAX_SAMPLES = 1000
+
+_samples = {}
+_lock = threading.Lock()
+_run = threading.local()
+
+
+def enabled():
+    return os.environ.get(PROFILE_ENV_VAR, "").lower() not in ("", "0", "false", "no")
+
+
+def _add(name, seconds):
+    with _lock:
+        if name not in _samples:
+            _samples[name] = deque(maxlen=MAX_SAMPLES)
+        _samples[name].append(seconds)
+    sections = getattr(_run, "sections", None)
+    if sections is not None:
+        sections[name] = sections.get(name, 0.0) + seconds
+
+
+@contextmanager
+def section(name):
+    """Time the enclosed block as ``name`` (a no-op unless profiling is on)."""
+    if not enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _add(name, time.perf_counter() - start)
+
+
+def timed(name, func, *args, **kwargs):
+    """``func(*args, **kwargs)``, timed as ``name``."""
+    with section(name):
+        return func(*args, **kwargs)
+
+
+def begin_run():
+    """Start collecting the sections of this script run for the log."""
+    _run.sections = {} if enabled() else None
+    _run.start = time.perf_counter()
+
+
+def end_run(page):
+    """Append this run's sections to the log as one JSON line."""
+    sections = getattr(_run, "sections", None)
+    if sections is None:
+        return
+    _run.sections = None
+    record = {
+        "at": datetime.now().isoformat(timespec="seconds"),
+        "page": page,
+        "total": round(time.perf_counter() - _run.start, 6),
+        "sections": {name: round(seconds, 6) for name, seconds in sections.items()},
+    }
+    with _lock:
+        with open(log_path(), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def log_path():
+    return os.environ.get(LOG_ENV_VAR) or DEFAULT_LOG
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def report():
+    """``[{section, count, p50_ms, p95_ms, total_s}]``, slowest total first."""
+    with _lock:
+        samples = {name: sorted(values) for name, values in _samples.items()}
+    rows = [
+        {
+            "section": name,
+            "count": len(values),
+            "p50_ms": round(_percentile(values, 0.5) * 1000, 2),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+            "total_s": round(sum(values), 3),
+        }
+        for name, values in samples.items()
+    ]
+    return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+
+def reset():
+    with _lock:
+        _samples.clear()
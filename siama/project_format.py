@@ -0,0 +1,470 @@
+"""Project bundle formats.
+
+Two formats are supported:
+
+* the original JSON bundle (``serialize_projects`` / ``deserialize_projects``),
+  kept as the portable import/export fallback;
+* a versioned binary bundle: a zip container with a small JSON manifest and one
+  member per column for every table in a project. Record lists (lists of dicts
+  such as ``relationship_data``) and DataFrames are stored column by column —
+  numeric and boolean columns as ``.npy`` arrays, everything else as JSON
+  arrays — so a bundle can be opened and read lazily, table by table.
+
+``open_projects_bundle`` opens either format for import without
+materializing it: JSON bundles are scanned once for the byte range of each
+project, and only the projects actually requested are decoded.
+"""
+import io
+import json
+import re
+import zipfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+FORMAT_NAME = "siama-projects"
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+BUNDLE_EXTENSION = "siama"
+ZIP_MAGIC = b"PK\x03\x04"
+
+_TABLE_REF = "__table__"
+_NPY_KINDS = "biufcmM"
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+_SINGLE_PROJECT = "project"
+
+
+# ----- JSON bundle (fallback format) -----
+
+def project_json_default(obj):
+    """``json.dumps`` ``default`` for project data (DataFrames, numpy values, datetimes)."""
+    if isinstance(obj, pd.DataFrame):
+        return {"__dataframe__": True, "data": obj.to_dict(orient="records")}
+    if isinstance(obj, pd.Series):
+        return {"__series__": True, "data": obj.to_dict()}
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (np.integer,)):
+        return int(obj)
+    if isinstance(obj, (np.floating,)):
+        return float(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _project_json_hook(d):
+    if isinstance(d, dict):
+        if d.get("__dataframe__"):
+            return pd.DataFrame(d.get("data", []))
+        if d.get("__series__"):
+            return pd.Series(d.get("data", {}))
+    return d
+
+
+def serialize_projects(projects_dict):
+    return json.dumps(dict(projects_dict), default=project_json_default)
+
+
+def deserialize_projects(s):
+    try:
+        return json.loads(s or "{}", object_hook=_project_json_hook)
+    except Exception:
+        return {}
+
+
+_WS = re.compile(rb"\s*")
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_FLAT = rb'[^"{}\[\]]*(?:' + _STRING + rb'[^"{}\[\]]*)*'
+# Containers without nested containers match whole, so record lists are
+# skipped one record per step rather than one string at a time.
+_TOKEN = re.compile(rb"\{" + _FLAT + rb"\}|\[" + _FLAT + rb"\]|" + _STRING + rb"|[{}\[\]]")
+_STRING_RE = re.compile(_STRING)
+_SCALAR_RE = re.compile(rb"[^,}\]\s]+")
+
+
+def _skip_ws(data, pos):
+    return _WS.match(data, pos).end()
+
+
+def _value_end(data, pos):
+    if data[pos:pos + 1] not in (b"{", b"["):
+        m = (_STRING_RE if data[pos:pos + 1] == b'"' else _SCALAR_RE).match(data, pos)
+        if m is None:
+            raise ValueError(f"Malformed JSON bundle at byte {pos}.")
+        return m.end()
+    depth = 0
+    for m in _TOKEN.finditer(data, pos):
+        c = data[m.start():m.start() + 1]
+        if c in (b"{", b"[") and m.end() - m.start() == 1:
+            depth += 1
+        elif c in (b"}", b"]"):
+            depth -= 1
+        elif c == b'"':
+            continue
+        if depth == 0:
+            return m.end()
+    raise ValueError("JSON bundle is truncated.")
+
+
+def scan_json_bundle(data, progress=None):
+    """Return ``{name: (start, end)}`` byte ranges of a JSON bundle's projects.
+
+    Nothing below the top level is decoded. ``progress(fraction)`` is called
+    after each project.
+    """
+    pos = _skip_ws(data, 0)
+    if data[pos:pos + 1] != b"{":
+        raise ValueError("Invalid format: expected a bundle mapping project names to data.")
+    spans = {}
+    pos = _skip_ws(data, pos + 1)
+    if data[pos:pos + 1] == b"}":
+        return spans
+    while True:
+        m = _STRING_RE.match(data, pos)
+        if m is None:
+            raise ValueError(f"Malformed JSON bundle at byte {pos}.")
+        name = json.loads(m.group())
+        pos = _skip_ws(data, m.end())
+        if data[pos:pos + 1] != b":":
+            raise ValueError(f"Malformed JSON bundle at byte {pos}.")
+        start = _skip_ws(data, pos + 1)
+        end = _value_end(data, start)
+        spans[name] = (start, end)
+        if progress is not None:
+            progress(end / len(data))
+        pos = _skip_ws(data, end)
+        sep = data[pos:pos + 1]
+        if sep == b"}":
+            return spans
+        if sep != b",":
+            raise ValueError(f"Malformed JSON bundle at byte {pos}.")
+        pos = _skip_ws(data, pos + 1)
+
+
+class JsonBundle:
+    """Lazy reader for a JSON bundle, with the same interface as ``ProjectArchive``."""
+
+    def __init__(self, data, progress=None):
+        self._data = data
+        self._spans = scan_json_bundle(data, progress)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+    def names(self):
+        return list(self._spans)
+
+    def project_size(self, name):
+        start, end = self._spans[name]
+        return end - start
+
+    def load_project(self, name):
+        start, end = self._spans[name]
+        return json.loads(bytes(self._data[start:end]), object_hook=_project_json_hook)
+
+
+# ----- Binary bundle -----
+
+def _column_array(values):
+    """Return ``values`` as a typed array, or None if they need JSON."""
+    if not values:
+        return None
+    types = set(map(type, values))
+    if len(types) != 1:
+        return None
+    t = types.pop()
+    try:
+        if issubclass(t, (bool, np.bool_)):
+            return np.array(values, dtype=np.bool_)
+        if issubclass(t, (int, np.integer)):
+            return np.array(values, dtype=np.int64)
+        if issubclass(t, (float, np.floating)):
+            return np.array(values, dtype=np.float64)
+    except OverflowError:
+        return None
+    return None
+
+
+def _npy_bytes(arr):
+    buf = io.BytesIO()
+    np.save(buf, arr, allow_pickle=False)
+    return buf.getvalue()
+
+
+def _json_bytes(values):
+    return json.dumps(values, default=project_json_default).encode("utf-8")
+
+
+def _is_record_list(value):
+    return isinstance(value, list) and len(value) > 0 and all(isinstance(v, dict) for v in value)
+
+
+def _encode_records(records, prefix):
+    names = []
+    for rec in records:
+        for k in rec:
+            if k not in names:
+                names.append(k)
+    columns, members = [], {}
+    for i, name in enumerate(names):
+        present = [name in rec for rec in records]
+        values = [rec[name] for rec in records if name in rec]
+        col = {"name": name, "sparse": not all(present)}
+        arr = _column_array(values)
+        if arr is not None:
+            col["encoding"] = "npy"
+            members[f"{prefix}/{i}.npy"] = _npy_bytes(arr)
+        else:
+            col["encoding"] = "json"
+            members[f"{prefix}/{i}.json"] = _json_bytes(values)
+        if col["sparse"]:
+            members[f"{prefix}/{i}.mask.npy"] = _npy_bytes(np.array(present, dtype=np.bool_))
+        columns.append(col)
+    return {"kind": "records", "rows": len(records), "columns": columns}, members
+
+
+def _encode_frame(df, prefix):
+    columns, members = [], {}
+    for i in range(df.shape[1]):
+        s = df.iloc[:, i]
+        col = {"name": df.columns[i], "dtype": str(s.dtype)}
+        arr = s.to_numpy()
+        if arr.dtype.kind in _NPY_KINDS:
+            col["encoding"] = "npy"
+            members[f"{prefix}/{i}.npy"] = _npy_bytes(arr)
+        else:
+            col["encoding"] = "json"
+            if isinstance(s.dtype, pd.api.extensions.ExtensionDtype):
+                s = s.astype(object).where(s.notna(), None)
+            members[f"{prefix}/{i}.json"] = _json_bytes(s.tolist())
+        columns.append(col)
+    meta = {"kind": "frame", "rows": int(df.shape[0]), "columns": columns}
+    idx = df.index
+    if not (isinstance(idx, pd.RangeIndex) and idx.start == 0 and idx.step == 1):
+        meta["index"] = {"name": idx.name}
+        members[f"{prefix}/index.json"] = _json_bytes(idx.tolist())
+    return meta, members
+
+
+def _split_tables(value, tables, members):
+    """Replace tables inside ``value`` with manifest references."""
+    if isinstance(value, pd.DataFrame) or _is_record_list(value):
+        tid = f"t{len(tables)}"
+        encode = _encode_frame if isinstance(value, pd.DataFrame) else _encode_records
+        meta, table_members = encode(value, f"tables/{tid}")
+        tables[tid] = meta
+        members.update(table_members)
+        return {_TABLE_REF: tid}
+    if isinstance(value, dict):
+        return {k: _split_tables(v, tables, members) for k, v in value.items()}
+    return value
+
+
+def dump_projects_binary(projects_dict):
+    """Serialize ``{name: project}`` into a binary bundle (bytes)."""
+    tables, members = {}, {}
+    entries = {}
+    for name, proj in projects_dict.items():
+        entries[name] = _split_tables(proj, tables, members)
+    manifest = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "projects": entries,
+        "tables": tables,
+    }
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        _write_member(zf, MANIFEST_NAME, json.dumps(manifest, default=project_json_default))
+        for path, data in members.items():
+            _write_member(zf, path, data)
+    return buf.getvalue()
+
+
+def _write_member(zf, path, data):
+    # A fixed timestamp keeps bundles byte-for-byte reproducible, so equal
+    # projects hash equally (see browser_sync).
+    info = zipfile.ZipInfo(path, date_time=_ZIP_EPOCH)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    zf.writestr(info, data)
+
+
+def dump_project_binary(project):
+    """Serialize a single project, independent of its name."""
+    return dump_projects_binary({_SINGLE_PROJECT: project})
+
+
+def load_project_binary(data):
+    return load_projects_binary(data)[_SINGLE_PROJECT]
+
+
+class ProjectArchive:
+    """Lazy reader for a binary bundle.
+
+    Opening an archive only parses the manifest; tables are decoded on demand
+    by ``load_table`` / ``load_section`` / ``load_project``.
+    """
+
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        self._zip = zipfile.ZipFile(source)
+        manifest = json.loads(self._zip.read(MANIFEST_NAME), object_hook=_project_json_hook)
+        if manifest.get("format") != FORMAT_NAME:
+            raise ValueError("Not a SIAMA project bundle.")
+        if manifest.get("version", 0) > FORMAT_VERSION:
+            raise ValueError(
+                f"Project bundle version {manifest.get('version')} is newer than this app supports "
+                f"(up to {FORMAT_VERSION})."
+            )
+        self.version = manifest["version"]
+        self._projects = manifest.get("projects", {})
+        self._tables = manifest.get("tables", {})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+
+    def names(self):
+        return list(self._projects.keys())
+
+    def table_info(self, tid):
+        return self._tables[tid]
+
+    def _table_ids(self, value):
+        if isinstance(value, dict):
+            if set(value) == {_TABLE_REF}:
+                yield value[_TABLE_REF]
+            else:
+                for v in value.values():
+                    yield from self._table_ids(v)
+
+    def project_size(self, name):
+        """Uncompressed size in bytes of a project's tables."""
+        if not hasattr(self, "_member_sizes"):
+            self._member_sizes = {}
+            for info in self._zip.infolist():
+                parts = info.filename.split("/")
+                if parts[0] == "tables" and len(parts) > 2:
+                    self._member_sizes[parts[1]] = self._member_sizes.get(parts[1], 0) + info.file_size
+        return sum(self._member_sizes.get(tid, 0) for tid in self._table_ids(self._projects[name]))
+
+    def _read_json(self, path):
+        return json.loads(self._zip.read(path), object_hook=_project_json_hook)
+
+    def _read_npy(self, path):
+        return np.load(io.BytesIO(self._zip.read(path)), allow_pickle=False)
+
+    def _read_column(self, prefix, i, col):
+        if col["encoding"] == "npy":
+            return self._read_npy(f"{prefix}/{i}.npy")
+        return self._read_json(f"{prefix}/{i}.json")
+
+    def load_table(self, tid):
+        meta = self._tables[tid]
+        prefix = f"tables/{tid}"
+        if meta["kind"] == "frame":
+            return self._load_frame(meta, prefix)
+        rows = [{} for _ in range(meta["rows"])]
+        for i, col in enumerate(meta["columns"]):
+            values = self._read_column(prefix, i, col)
+            if isinstance(values, np.ndarray):
+                values = values.tolist()
+            name = col["name"]
+            if col.get("sparse"):
+                mask = self._read_npy(f"{prefix}/{i}.mask.npy")
+                targets = (rows[r] for r in np.flatnonzero(mask))
+            else:
+                targets = iter(rows)
+            for row, v in zip(targets, values):
+                row[name] = v
+        return rows
+
+    def _load_frame(self, meta, prefix):
+        data, names = {}, []
+        for i, col in enumerate(meta["columns"]):
+            values = self._read_column(prefix, i, col)
+            if col["encoding"] == "json":
+                series = pd.Series(values, dtype=object)
+                if col.get("dtype", "object") != "object":
+                    try:
+                        series = series.astype(col["dtype"])
+                    except (TypeError, ValueError):
+                        pass
+                values = series.to_numpy() if series.dtype == object else series.array
+            data[i] = values
+            names.append(col["name"])
+        index = None
+        if "index" in meta:
+            index = pd.Index(self._read_json(f"{prefix}/index.json"), name=meta["index"]["name"])
+        df = pd.DataFrame(data, index=index)
+        if index is None and not data:
+            df = pd.DataFrame(index=pd.RangeIndex(meta["rows"]))
+        df.columns = names
+        return df
+
+    def _resolve(self, value):
+        if isinstance(value, dict):
+            if set(value) == {_TABLE_REF}:
+                return self.load_table(value[_TABLE_REF])
+            return {k: self._resolve(v) for k, v in value.items()}
+        return value
+
+    def project_meta(self, name):
+        """Project entry without any tables materialized."""
+        return {k: v for k, v in self._projects[name].items() if not isinstance(v, dict)}
+
+    def load_section(self, name, section):
+        return self._resolve(self._projects[name].get(section))
+
+    def load_project(self, name):
+        return self._resolve(self._projects[name])
+
+    def load_all(self):
+        return {name: self.load_project(name) for name in self._projects}
+
+
+def load_projects_binary(data):
+    with ProjectArchive(data) as archive:
+        return archive.load_all()
+
+
+def is_binary_bundle(data):
+    return bytes(data[:4]) == ZIP_MAGIC
+
+
+def open_projects_bundle(data, progress=None):
+    """Open a bundle in either format for lazy, per-project reading.
+
+    ``data`` may be bytes, a memoryview or (for ``.siama`` bundles) a binary
+    file object.
+    """
+    if hasattr(data, "read"):
+        data.seek(0)
+        if is_binary_bundle(data.read(4)):
+            return ProjectArchive(data)
+        data = data.getbuffer()
+    if is_binary_bundle(data):
+        return ProjectArchive(data)
+    return JsonBundle(data, progress)
+
+
+def load_projects_bundle(data):
+    """Load a bundle in either format, sniffing the zip header."""
+    if is_binary_bundle(data):
+        return load_projects_binary(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return deserialize_projects(data)
@@ -0,0 +1,690 @@
+"""Project stores: in-session (``MemoryProjects``) or SQLite (``StoredProjects``).
+
+Set ``SIAMA_PROJECT_DB`` to a file path to keep projects on the server
+between sessions. The database runs in WAL mode so concurrent sessions can
+read while another one saves. Each project is one row of indexed metadata
+(dates and counts) plus one row per section (``sit_data``, ``sat_data``, ...)
+holding that section as a ``.siama`` bundle, so bodies are only loaded when a
+project is opened and a save only rewrites sections whose content changed.
+
+Both are mutable mappings used as ``st.session_state.projects`` and keep a
+catalog of per-project summaries (counts, size, timestamps, last opened),
+updated on every write, rename and delete, so project lists never have to
+open project bodies.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from datetime import datetime
+
+from siama.project_format import dump_project_binary, load_project_binary
+
+DB_ENV_VAR = "SIAMA_PROJECT_DB"
+PROJECT_SECTIONS = ("sit_data", "sat_data", "mat_data", "nature_of_craft")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    name          TEXT PRIMARY KEY,
+    created       TEXT,
+    updated       TEXT,
+    stakeholders  INTEGER NOT NULL DEFAULT 0,
+    actors        INTEGER NOT NULL DEFAULT 0,
+    relationships INTEGER NOT NULL DEFAULT 0,
+    mat_tools     INTEGER NOT NULL DEFAULT 0,
+    size          INTEGER NOT NULL DEFAULT 0,
+    opened        TEXT,
+    sha256        TEXT NOT NULL,
+    body          BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS projects_updated ON projects (updated);
+CREATE INDEX IF NOT EXISTS projects_created ON projects (created);
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size   INTEGER NOT NULL,
+    body   BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS project_sections (
+    project TEXT NOT NULL REFERENCES projects (name) ON UPDATE CASCADE ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    sha256  TEXT NOT NULL REFERENCES blobs (sha256),
+    PRIMARY KEY (project, section)
+);
+CREATE INDEX IF NOT EXISTS project_sections_sha ON project_sections (sha256);
+CREATE TABLE IF NOT EXISTS versions (
+    id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    project TEXT NOT NULL REFERENCES projects (name) ON UPDATE CASCADE ON DELETE CASCADE,
+    saved   TEXT NOT NULL,
+    kind    TEXT NOT NULL,
+    note    TEXT
+);
+CREATE INDEX IF NOT EXISTS versions_project ON versions (project, id);
+CREATE TABLE IF NOT EXISTS version_sections (
+    version INTEGER NOT NULL REFERENCES versions (id) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    sha256  TEXT NOT NULL REFERENCES blobs (sha256),
+    PRIMARY KEY (version, section)
+);
+CREATE INDEX IF NOT EXISTS version_sections_sha ON version_sections (sha256);
+"""
+META_COLUMNS = (
+    "name", "created", "updated", "opened", "stakeholders", "actors", "relationships", "mat_tools", "size"
+)
+COUNT_COLUMNS = ("stakeholders", "actors", "relationships", "mat_tools")
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def section_counts(section, value):
+    """Metadata columns derived from one project section."""
+    value = value or {}
+    if section == "sit_data":
+        return {
+            "stakeholders": len(value.get("stakeholders") or []),
+            "actors": sum(len(a) for a in (value.get("roles") or {}).values()),
+        }
+    if section == "sat_data":
+        return {"relationships": len(value.get("relationship_data") or [])}
+    if section == "mat_data":
+        return {"mat_tools": len(value)}
+    return {}
+
+
+def project_counts(project):
+    counts = {"stakeholders": 0, "actors": 0, "relationships": 0, "mat_tools": 0}
+    for section in PROJECT_SECTIONS:
+        counts.update(section_counts(section, project.get(section)))
+    return counts
+
+
+def _encode_section(value):
+    body = dump_project_binary(value)
+    return hashlib.sha256(body).hexdigest(), body
+
+
+def encode_sections(sections):
+    """``{section: (sha256, body, counts)}`` for ``ProjectStore.put_encoded``."""
+    return {section: _encode_section(value) + (section_counts(section, value),)
+            for section, value in sections.items()}
+
+
+def content_hash(header_sha, sections):
+    """One hash for a project from its header's and its sections' SHA-256s."""
+    parts = [header_sha] + [f"{section}={sha}" for section, sha in sorted(sections.items())]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def _section_order(rows):
+    order = {s: i for i, s in enumerate(PROJECT_SECTIONS)}
+    return sorted(rows, key=lambda row: order.get(row[0], len(order)))
+
+
+def _annotate_versions(versions, sizes):
+    """Add the sections each version changed and the bytes of content it added.
+
+    ``versions`` is oldest first; the result is newest first.
+    """
+    seen, previous = set(), {}
+    for version in versions:
+        sections = version["sections"]
+        version["changed"] = [s for s in sorted(set(sections) | set(previous)) if sections.get(s) != previous.get(s)]
+        new = set(sections.values()) - seen
+        version["added_bytes"] = sum(sizes[sha] for sha in new)
+        seen |= new
+        previous = sections
+    return versions[::-1]
+
+
+class ProjectStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self):
+        # sqlite3 connections are per-thread; Streamlit runs each session's
+        # script on its own thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def names(self):
+        return [r[0] for r in self._conn().execute("SELECT name FROM projects ORDER BY name")]
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    def contains(self, name):
+        return self._conn().execute("SELECT 1 FROM projects WHERE name = ?", (name,)).fetchone() is not None
+
+    def summaries(self, query="", sort="name", descending=False, nonempty=()):
+        """Catalog rows, filtered by name substring and non-zero counts."""
+        _check_sort(sort, nonempty)
+        clauses, params = [], []
+        if query:
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            params.append("%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        clauses += [f"{col} > 0" for col in nonempty]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = f"{sort} IS NULL, {sort} {'DESC' if descending else 'ASC'}, name"
+        cur = self._conn().execute(f"SELECT {', '.join(META_COLUMNS)} FROM projects {where} ORDER BY {order}", params)
+        return [dict(zip(META_COLUMNS, row)) for row in cur]
+
+    def info(self, name):
+        """The catalog row of ``name``, or None if there is no such project."""
+        row = self._conn().execute(f"SELECT {', '.join(META_COLUMNS)} FROM projects WHERE name = ?", (name,)).fetchone()
+        return dict(zip(META_COLUMNS, row)) if row is not None else None
+
+    def mark_opened(self, name, when):
+        with self._conn() as conn:
+            conn.execute("UPDATE projects SET opened = ? WHERE name = ?", (when, name))
+
+    def get(self, name):
+        conn = self._conn()
+        row = conn.execute("SELECT body FROM projects WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        project = load_project_binary(row[0])
+        for section, body in _section_order(conn.execute(
+                "SELECT s.section, b.body FROM project_sections s JOIN blobs b ON b.sha256 = s.sha256 "
+                "WHERE s.project = ?", (name,))):
+            project[section] = load_project_binary(body)
+        return project
+
+    def get_sections(self, name, sections):
+        """Only ``sections`` of ``name``, without decoding the rest of the project."""
+        conn = self._conn()
+        rows = conn.execute(
+            "SELECT s.section, b.body FROM project_sections s JOIN blobs b ON b.sha256 = s.sha256 "
+            f"WHERE s.project = ? AND s.section IN ({', '.join('?' * len(sections))})", (name, *sections)
+        ).fetchall()
+        if not rows and not self.contains(name):
+            raise KeyError(name)
+        return {section: load_project_binary(body) for section, body in rows}
+
+    def content_hashes(self):
+        """``{name: content_hash}`` of every project, from the stored hashes alone."""
+        headers, sections = {}, {}
+        for name, header_sha, section, sha in self._conn().execute(
+                "SELECT p.name, p.sha256, s.section, s.sha256 FROM projects p "
+                "LEFT JOIN project_sections s ON s.project = p.name"):
+            headers[name] = header_sha
+            if section is not None:
+                sections.setdefault(name, {})[section] = sha
+        return {name: content_hash(header_sha, sections.get(name, {})) for name, header_sha in headers.items()}
+
+    def _put_section(self, conn, name, section, sha, body):
+        row = conn.execute(
+            "SELECT sha256 FROM project_sections WHERE project = ? AND section = ?", (name, section)
+        ).fetchone()
+        if row is not None and row[0] == sha:
+            return False
+        conn.execute("INSERT OR IGNORE INTO blobs (sha256, size, body) VALUES (?, ?, ?)", (sha, len(body), body))
+        conn.execute(
+            "INSERT OR REPLACE INTO project_sections (project, section, sha256) VALUES (?, ?, ?)",
+            (name, section, sha),
+        )
+        if row is not None:
+            self._collect(conn, [row[0]])
+        return True
+
+    def _collect(self, conn, shas):
+        """Drop blobs no longer referenced by any project or version."""
+        for sha in set(shas):
+            conn.execute(
+                "DELETE FROM blobs WHERE sha256 = ? "
+                "AND NOT EXISTS (SELECT 1 FROM project_sections WHERE sha256 = ?) "
+                "AND NOT EXISTS (SELECT 1 FROM version_sections WHERE sha256 = ?)",
+                (sha, sha, sha),
+            )
+
+    def _refresh_size(self, conn, name):
+        conn.execute(
+            "UPDATE projects SET size = LENGTH(body) + (SELECT COALESCE(SUM(b.size), 0) FROM project_sections s "
+            "JOIN blobs b ON b.sha256 = s.sha256 WHERE s.project = ?) WHERE name = ?",
+            (name, name),
+        )
+
+    def _record_version(self, conn, name, kind, note, changed):
+        current = dict(conn.execute("SELECT section, sha256 FROM project_sections WHERE project = ?", (name,)))
+        last = conn.execute(
+            "SELECT id, kind FROM versions WHERE project = ? ORDER BY id DESC LIMIT 1", (name,)
+        ).fetchone()
+        now = _now()
+        if last is not None and not changed:
+            # Nothing new to record; an explicit save just labels the pending autosave.
+            if last[1] == "autosave" and kind != "autosave":
+                conn.execute("UPDATE versions SET kind = ?, note = ?, saved = ? WHERE id = ?", (kind, note, now, last[0]))
+            return
+        if last is not None and last[1] == "autosave" and kind == "autosave":
+            # Consecutive autosaves collapse into one version.
+            replaced = [r[0] for r in conn.execute("SELECT sha256 FROM version_sections WHERE version = ?", (last[0],))]
+            conn.execute("DELETE FROM version_sections WHERE version = ?", (last[0],))
+            conn.execute("UPDATE versions SET saved = ? WHERE id = ?", (now, last[0]))
+            version = last[0]
+        else:
+            replaced = []
+            version = conn.execute(
+                "INSERT INTO versions (project, saved, kind, note) VALUES (?, ?, ?, ?)", (name, now, kind, note)
+            ).lastrowid
+        conn.executemany(
+            "INSERT INTO version_sections (version, section, sha256) VALUES (?, ?, ?)",
+            [(version, section, sha) for section, sha in current.items()],
+        )
+        self._collect(conn, replaced)
+
+    def put(self, name, project, kind="save", note=None):
+        header = {k: v for k, v in project.items() if k not in PROJECT_SECTIONS}
+        body = dump_project_binary(header)
+        sha = hashlib.sha256(body).hexdigest()
+        counts = project_counts(project)
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO projects "
+                "(name, created, updated, stakeholders, actors, relationships, mat_tools, sha256, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET created = excluded.created, updated = excluded.updated, "
+                "stakeholders = excluded.stakeholders, actors = excluded.actors, "
+                "relationships = excluded.relationships, mat_tools = excluded.mat_tools, "
+                "sha256 = excluded.sha256, body = excluded.body",
+                (name, project.get("created"), project.get("updated"), counts["stakeholders"],
+                 counts["actors"], counts["relationships"], counts["mat_tools"], sha, body),
+            )
+            changed = [
+                section for section in PROJECT_SECTIONS
+                if section in project and self._put_section(conn, name, section, *_encode_section(project[section]))
+            ]
+            self._refresh_size(conn, name)
+            self._record_version(conn, name, kind, note, changed)
+
+    def put_sections(self, name, sections, updated=None, kind="autosave", note=None):
+        """Write only ``sections`` of an existing project.
+
+        Returns the names of sections whose stored content actually changed.
+        """
+        return self.put_encoded(name, encode_sections(sections), updated=updated, kind=kind, note=note)
+
+    def put_encoded(self, name, encoded, updated=None, kind="autosave", note=None):
+        """``put_sections`` for sections already passed through ``encode_sections``."""
+        changed = []
+        with self._conn() as conn:
+            if conn.execute("SELECT 1 FROM projects WHERE name = ?", (name,)).fetchone() is None:
+                raise KeyError(name)
+            for section, (sha, body, _) in encoded.items():
+                if self._put_section(conn, name, section, sha, body):
+                    changed.append(section)
+            if changed:
+                columns = {}
+                for section in changed:
+                    columns.update(encoded[section][2])
+                if updated is not None:
+                    columns["updated"] = updated
+                if columns:
+                    assignments = ", ".join(f"{c} = ?" for c in columns)
+                    conn.execute(f"UPDATE projects SET {assignments} WHERE name = ?", (*columns.values(), name))
+                self._refresh_size(conn, name)
+            self._record_version(conn, name, kind, note, changed)
+        return changed
+
+    def delete(self, name):
+        with self._conn() as conn:
+            shas = [r[0] for r in conn.execute(
+                "SELECT sha256 FROM project_sections WHERE project = ? UNION "
+                "SELECT vs.sha256 FROM version_sections vs JOIN versions v ON v.id = vs.version WHERE v.project = ?",
+                (name, name))]
+            if conn.execute("DELETE FROM projects WHERE name = ?", (name,)).rowcount == 0:
+                raise KeyError(name)
+            self._collect(conn, shas)
+
+    def rename(self, old, new):
+        """Rename ``old``; raises KeyError if it does not exist and ValueError
+        if another project is already called ``new``."""
+        with self._conn() as conn:
+            if new != old and conn.execute("SELECT 1 FROM projects WHERE name = ?", (new,)).fetchone():
+                raise ValueError(f"A project named '{new}' already exists.")
+            if conn.execute("UPDATE projects SET name = ? WHERE name = ?", (new, old)).rowcount == 0:
+                raise KeyError(old)
+
+    def versions(self, name):
+        """Saved versions of ``name``, newest first (see ``_annotate_versions``)."""
+        conn = self._conn()
+        versions = [
+            {"id": r[0], "saved": r[1], "kind": r[2], "note": r[3], "sections": {}}
+            for r in conn.execute("SELECT id, saved, kind, note FROM versions WHERE project = ? ORDER BY id", (name,))
+        ]
+        by_id = {v["id"]: v for v in versions}
+        sizes = {}
+        for version, section, sha, size in conn.execute(
+                "SELECT vs.version, vs.section, vs.sha256, b.size FROM version_sections vs "
+                "JOIN versions v ON v.id = vs.version JOIN blobs b ON b.sha256 = vs.sha256 WHERE v.project = ?",
+                (name,)):
+            by_id[version]["sections"][section] = sha
+            sizes[sha] = size
+        return _annotate_versions(versions, sizes)
+
+    def load_version(self, name, version):
+        """The project sections saved in ``version``."""
+        rows = self._conn().execute(
+            "SELECT vs.section, b.body FROM version_sections vs JOIN versions v ON v.id = vs.version "
+            "JOIN blobs b ON b.sha256 = vs.sha256 WHERE v.project = ? AND v.id = ?",
+            (name, version),
+        ).fetchall()
+        if not rows and not self._conn().execute(
+                "SELECT 1 FROM versions WHERE project = ? AND id = ?", (name, version)).fetchone():
+            raise KeyError(version)
+        return {section: load_project_binary(body) for section, body in _section_order(rows)}
+
+    def history_size(self, name):
+        """Bytes of section content kept for ``name`` across all its versions."""
+        return self._conn().execute(
+            "SELECT COALESCE(SUM(size), 0) FROM blobs WHERE sha256 IN ("
+            "SELECT vs.sha256 FROM version_sections vs JOIN versions v ON v.id = vs.version WHERE v.project = ? "
+            "UNION SELECT sha256 FROM project_sections WHERE project = ?)",
+            (name, name),
+        ).fetchone()[0]
+
+
+def open_store(path=None):
+    """Return the shared store for ``path`` (default: ``$SIAMA_PROJECT_DB``), or None if unset."""
+    path = path or os.environ.get(DB_ENV_VAR)
+    if not path:
+        return None
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = ProjectStore(path)
+        return _stores[path]
+
+
+def _check_sort(sort, nonempty):
+    if sort not in META_COLUMNS:
+        raise ValueError(f"Cannot sort projects by '{sort}'.")
+    for col in nonempty:
+        if col not in COUNT_COLUMNS:
+            raise ValueError(f"Cannot filter projects by '{col}'.")
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class StoredProjects(MutableMapping):
+    """Dict-like view of a ``ProjectStore``; bodies are loaded on access."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __getitem__(self, name):
+        return self.store.get(name)
+
+    def __setitem__(self, name, project):
+        self.save(name, project)
+
+    def __delitem__(self, name):
+        self.store.delete(name)
+
+    def __iter__(self):
+        return iter(self.store.names())
+
+    def __len__(self):
+        return self.store.count()
+
+    def __contains__(self, name):
+        return self.store.contains(name)
+
+    def save(self, name, project, kind="save", note=None):
+        self.store.put(name, project, kind=kind, note=note)
+
+    def load_sections(self, name, sections):
+        return self.store.get_sections(name, sections)
+
+    def content_hashes(self):
+        return self.store.content_hashes()
+
+    def save_sections(self, name, sections, kind="save", note=None):
+        """Write only ``sections`` of ``name``; returns those that changed."""
+        return self.store.put_sections(name, sections, updated=_now(), kind=kind, note=note)
+
+    def rename(self, old, new):
+        self.store.rename(old, new)
+
+    def merge(self, projects_dict, kind="import"):
+        """Insert or update every project in ``projects_dict``; nothing is deleted."""
+        for name, project in projects_dict.items():
+            self.store.put(name, project, kind=kind)
+
+    def mark_opened(self, name):
+        self.store.mark_opened(name, _now())
+
+    def summaries(self, query="", sort="name", descending=False, nonempty=()):
+        return self.store.summaries(query, sort, descending, nonempty)
+
+    def info(self, name):
+        return self.store.info(name)
+
+    def versions(self, name):
+        return self.store.versions(name)
+
+    def load_version(self, name, version):
+        return self.store.load_version(name, version)
+
+    def restore_version(self, name, version):
+        """Make ``version`` the current state of ``name`` (recorded as a new version)."""
+        sections = self.store.load_version(name, version)
+        self.store.put_sections(name, sections, updated=_now(), kind="restore", note=f"Restored version {version}")
+        return self.store.get(name)
+
+    def history_size(self, name):
+        return self.store.history_size(name)
+
+
+class MemoryProjects(MutableMapping):
+    """Projects held in the session, with the same catalog and version history
+    as ``StoredProjects``.
+
+    Sections are kept only as immutable, content-addressed bundles: a save
+    never holds on to the caller's objects and every read decodes a fresh
+    copy, so the working state and saved projects cannot alias each other.
+    Unchanged sections share one bundle across saves, versions and projects.
+
+    Background jobs (``siama.jobs``) write while the session's script reads,
+    so the bookkeeping is guarded by a lock; encoding and decoding happen
+    outside it.
+    """
+
+    def __init__(self, projects=None):
+        self._lock = threading.RLock()
+        self._headers = {}
+        self._catalog = {}
+        self._sections = {}
+        self._versions = {}
+        self._blobs = {}
+        self._next_version = 1
+        self.update(projects or {})
+
+    def _bodies(self, shas):
+        with self._lock:
+            return {key: self._blobs[sha] for key, sha in shas.items()}
+
+    def __getitem__(self, name):
+        with self._lock:
+            project = dict(self._headers[name])
+            bodies = self._bodies(self._sections[name])
+        for section, body in bodies.items():
+            project[section] = load_project_binary(body)
+        return project
+
+    def __setitem__(self, name, project):
+        self.save(name, project)
+
+    def __delitem__(self, name):
+        with self._lock:
+            del self._headers[name]
+            del self._catalog[name]
+            self._sections.pop(name, None)
+            self._versions.pop(name, None)
+            self._collect()
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._headers))
+
+    def __len__(self):
+        return len(self._headers)
+
+    def __contains__(self, name):
+        return name in self._headers
+
+    def save(self, name, project, kind="save", note=None):
+        encoded = {s: _encode_section(project[s]) for s in PROJECT_SECTIONS if s in project}
+        with self._lock:
+            for sha, body in encoded.values():
+                self._blobs.setdefault(sha, body)
+            previous = self._sections.get(name, {})
+            current = {s: sha for s, (sha, _) in encoded.items()}
+            changed = [s for s in current if current[s] != previous.get(s)]
+            self._headers[name] = {k: v for k, v in project.items() if k not in PROJECT_SECTIONS}
+            self._sections[name] = current
+            self._catalog[name] = {
+                "name": name,
+                "created": project.get("created"),
+                "updated": project.get("updated"),
+                "opened": (self._catalog.get(name) or {}).get("opened"),
+                **project_counts(project),
+                "size": sum(len(body) for _, body in encoded.values()),
+            }
+            self._record_version(name, kind, note, changed)
+
+    def load_sections(self, name, sections):
+        with self._lock:
+            bodies = self._bodies({s: sha for s, sha in self._sections[name].items() if s in sections})
+        return {s: load_project_binary(body) for s, body in bodies.items()}
+
+    def content_hashes(self):
+        """``{name: content_hash}`` of every project; only the small headers are encoded."""
+        with self._lock:
+            projects = {name: (dict(self._headers[name]), dict(self._sections[name])) for name in self._headers}
+        return {name: content_hash(_encode_section(header)[0], sections)
+                for name, (header, sections) in projects.items()}
+
+    def save_sections(self, name, sections, kind="save", note=None):
+        """Write only ``sections`` of ``name``; returns those that changed."""
+        encoded = {section: _encode_section(value) for section, value in sections.items()}
+        with self._lock:
+            if name not in self._headers:
+                raise KeyError(name)
+            current = dict(self._sections[name])
+            changed = []
+            for section, (sha, body) in encoded.items():
+                self._blobs.setdefault(sha, body)
+                if current.get(section) != sha:
+                    current[section] = sha
+                    changed.append(section)
+            if changed:
+                self._sections[name] = current
+                self._headers[name]["updated"] = now = _now()
+                row = self._catalog[name]
+                row["updated"] = now
+                for section in changed:
+                    row.update(section_counts(section, sections[section]))
+                row["size"] = sum(len(self._blobs[sha]) for sha in current.values())
+            self._record_version(name, kind, note, changed)
+            return changed
+
+    def _record_version(self, name, kind, note, changed):
+        versions = self._versions.setdefault(name, [])
+        last = versions[-1] if versions else None
+        if last is not None and not changed:
+            if last["kind"] == "autosave" and kind != "autosave":
+                last.update(kind=kind, note=note, saved=_now())
+            return
+        if last is not None and last["kind"] == "autosave" and kind == "autosave":
+            last.update(saved=_now(), sections=dict(self._sections[name]))
+        else:
+            versions.append({
+                "id": self._next_version, "saved": _now(), "kind": kind, "note": note,
+                "sections": dict(self._sections[name]),
+            })
+            self._next_version += 1
+        self._collect()
+
+    def _collect(self):
+        live = {sha for sections in self._sections.values() for sha in sections.values()}
+        live |= {sha for versions in self._versions.values() for v in versions for sha in v["sections"].values()}
+        for sha in set(self._blobs) - live:
+            del self._blobs[sha]
+
+    def rename(self, old, new):
+        with self._lock:
+            if old not in self._headers:
+                raise KeyError(old)
+            if new != old and new in self._headers:
+                raise ValueError(f"A project named '{new}' already exists.")
+            self._headers[new] = self._headers.pop(old)
+            self._catalog[new] = dict(self._catalog.pop(old), name=new)
+            self._sections[new] = self._sections.pop(old)
+            self._versions[new] = self._versions.pop(old)
+
+    def merge(self, projects_dict, kind="import"):
+        """Insert or update every project in ``projects_dict``; nothing is deleted."""
+        for name, project in projects_dict.items():
+            self.save(name, project, kind=kind)
+
+    def mark_opened(self, name):
+        with self._lock:
+            self._catalog[name]["opened"] = _now()
+
+    def summaries(self, query="", sort="name", descending=False, nonempty=()):
+        _check_sort(sort, nonempty)
+        query = query.casefold()
+        with self._lock:
+            rows = [
+                dict(row) for row in self._catalog.values()
+                if query in row["name"].casefold() and all(row[col] > 0 for col in nonempty)
+            ]
+        rows.sort(key=lambda row: row["name"])
+        present = [row for row in rows if row[sort] is not None]
+        present.sort(key=lambda row: row[sort], reverse=descending)
+        return present + [row for row in rows if row[sort] is None]
+
+    def info(self, name):
+        """The catalog row of ``name``, or None if there is no such project."""
+        with self._lock:
+            row = self._catalog.get(name)
+            return dict(row) if row is not None else None
+
+    def versions(self, name):
+        with self._lock:
+            versions = [dict(v, sections=dict(v["sections"])) for v in self._versions.get(name, [])]
+            sizes = {sha: len(body) for sha, body in self._blobs.items()}
+        return _annotate_versions(versions, sizes)
+
+    def load_version(self, name, version):
+        with self._lock:
+            for v in self._versions.get(name, []):
+                if v["id"] == version:
+                    bodies = self._bodies(v["sections"])
+                    break
+            else:
+                raise KeyError(version)
+        return {s: load_project_binary(body) for s, body in bodies.items()}
+
+    def restore_version(self, name, version):
+        with self._lock:
+            headers = dict(self._headers[name])
+        project = dict(headers, **self.load_version(name, version), updated=_now())
+        self.save(name, project, kind="restore", note=f"Restored version {version}")
+        return project
+
+    def history_size(self, name):
+        with self._lock:
+            shas = set(self._sections.get(name, {}).values())
+            shas |= {sha for v in self._versions.get(name, []) for sha in v["sections"].values()}
+            return sum(len(self._blobs[sha]) for sha in shas)
@@ -0,0 +1,168 @@
+"""Typed, columnar copy of the SAT ratings.
+
+``sat_data['relationship_data']`` (a list of dicts) stays the saved form. A
+``RatingsTable`` mirrors it as NumPy columns (int8 scores, the stakeholder ID,
+the label as a categorical and the free-text answers kept apart) and is updated
+on every append, delete and rename, so pages share one DataFrame instead of
+each building its own from the records on every rerun.
+
+There is one record per stakeholder. Re-rating replaces its values and pushes
+the superseded ones onto the record's ``history`` (oldest first, without the
+label or ID), so the table, and every analysis built on it, sees only the
+current rating while ``history_frame`` gives time-aware views all of them.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+SCORES = ("power", "interest", "legitimacy", "urgency")
+TEXT = ("interactions", "tasks", "knowledge")
+
+HISTORY = "history"
+RATED_AT = "rated_at"
+
+_MIN_CAPACITY = 16
+_serials = itertools.count(1)
+
+
+def _score(value):
+    try:
+        return min(127, max(-128, int(round(float(value or 0)))))
+    except (TypeError, ValueError):
+        return 0
+
+
+def revision(record):
+    """The rating values of ``record``, as kept in a ``history``."""
+    return {c: record[c] for c in (RATED_AT,) + SCORES + TEXT if c in record}
+
+
+def history_frame(records):
+    """Every rating of every stakeholder in ``records``, one row per revision.
+
+    Columns are ``stakeholder``, ``stakeholder_id``, ``revision`` (1 is the
+    first rating), ``current``, ``rated_at`` and the ``SCORES``.
+    """
+    rows = []
+    for record in records:
+        revisions = (record.get(HISTORY) or []) + [revision(record)]
+        for number, values in enumerate(revisions, start=1):
+            rows.append(dict({c: _score(values.get(c)) for c in SCORES},
+                             stakeholder=record.get('stakeholder', ''), stakeholder_id=record['stakeholder_id'],
+                             revision=number, current=number == len(revisions), rated_at=values.get(RATED_AT)))
+    return pd.DataFrame(rows, columns=["stakeholder", "stakeholder_id", "revision", "current", RATED_AT, *SCORES])
+
+
+class RatingsTable:
+    """Ratings as columns, in ``relationship_data`` order.
+
+    ``labels`` maps stakeholder IDs to labels and is read when a frame is
+    built. ``token`` changes whenever the content does, so it can stand in for
+    the table in figure-cache inputs. Frames own copies of the columns, so the
+    table is updated in place.
+    """
+
+    def __init__(self, records, labels):
+        self._labels = labels
+        self._serial = next(_serials)
+        self._version = 0
+        n = len(records)
+        self._n = n
+        capacity = max(_MIN_CAPACITY, n)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._ids[:n] = [r['stakeholder_id'] for r in records]
+        self._scores = np.zeros((capacity, len(SCORES)), dtype=np.int8)
+        if n:
+            self._scores[:n] = [[_score(r.get(c)) for c in SCORES] for r in records]
+        self._text = {c: [r.get(c, '') for r in records] for c in TEXT}
+        self._rows = {}
+        self._index_rows()
+        self._frames = {}
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def token(self):
+        return (self._serial, self._version)
+
+    def _index_rows(self):
+        self._rows.clear()
+        for row, sid in enumerate(self._ids[:self._n].tolist()):
+            self._rows.setdefault(sid, row)
+
+    def _changed(self):
+        self._version += 1
+        self._frames = {}
+
+    def append(self, record):
+        n = self._n
+        if n == len(self._ids):
+            extra = max(n, _MIN_CAPACITY)
+            self._ids = np.concatenate([self._ids, np.zeros(extra, dtype=np.int64)])
+            self._scores = np.concatenate([self._scores, np.zeros((extra, len(SCORES)), dtype=np.int8)])
+        self._ids[n] = record['stakeholder_id']
+        self._scores[n] = [_score(record.get(c)) for c in SCORES]
+        for c in TEXT:
+            self._text[c].append(record.get(c, ''))
+        self._rows.setdefault(int(record['stakeholder_id']), n)
+        self._n += 1
+        self._changed()
+
+    def position(self, sid):
+        """Row of stakeholder ``sid``, or ``None`` if it has no rating."""
+        return self._rows.get(sid)
+
+    def replace(self, position, record):
+        """Overwrite row ``position`` with ``record``, a new rating of the same stakeholder."""
+        self._scores[position] = [_score(record.get(c)) for c in SCORES]
+        for c in TEXT:
+            self._text[c][position] = record.get(c, '')
+        self._changed()
+
+    def delete(self, position):
+        n = self._n
+        self._ids = np.delete(self._ids[:n], position)
+        self._scores = np.delete(self._scores[:n], position, axis=0)
+        for c in TEXT:
+            self._text[c].pop(position)
+        self._n -= 1
+        self._index_rows()
+        self._changed()
+
+    def relabel(self):
+        """Pick up changed labels (a stakeholder was renamed)."""
+        self._changed()
+
+    def _scores_frame(self):
+        n = self._n
+        ids = self._ids[:n]
+        uniq, codes = np.unique(ids, return_inverse=True)
+        cats = [self._labels.get(int(sid), f"Stakeholder #{sid}") for sid in uniq]
+        if len(set(cats)) == len(cats):
+            stakeholder = pd.Categorical.from_codes(codes.reshape(-1), cats)
+        else:
+            stakeholder = np.asarray(cats, dtype=object)[codes.reshape(-1)]
+        frame = pd.DataFrame({"stakeholder": stakeholder, "stakeholder_id": ids.copy()}, copy=False)
+        scores = self._scores[:n].T.copy()
+        for i, c in enumerate(SCORES):
+            frame[c] = scores[i]
+        return frame
+
+    def frame(self, text=False):
+        """The ratings as a DataFrame, built once per change and shared.
+
+        Columns are ``stakeholder``, ``stakeholder_id`` and the ``SCORES``,
+        plus the ``TEXT`` answers if ``text``. Callers get their own shallow
+        copy and may add columns, but must not modify values in place.
+        """
+        key = bool(text)
+        if key not in self._frames:
+            frame = self._frames.get(False)
+            if frame is None:
+                frame = self._frames[False] = self._scores_frame()
+            if text:
+                frame = frame.assign(**{c: self._text[c] for c in TEXT})
+                self._frames[True] = frame
+        return self._frames[key].copy(deep=False)
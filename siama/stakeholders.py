@@ -0,0 +1,365 @@
+"""Stable stakeholder IDs and the reverse indexes built on them.
+
+Every SIT actor carries an integer ``id``. SAT ratings, conflicts and value
+maps refer to it as ``stakeholder_id`` (keeping the ``"Name (Role)"`` label in
+``stakeholder`` for tables, charts and exports), and subgroup ``members`` are
+lists of IDs. A per-session index maps each ID to its actor, label, the records
+referring to it and the subgroups it belongs to, so deleting or renaming a
+stakeholder touches only what refers to it. The index also owns the
+session's columnar ratings table (see ``siama.ratings``); ``rate`` keeps it at
+one rating per stakeholder.
+
+Projects saved before IDs existed are migrated by ``migrate``; ``index``
+runs it whenever the working sections were replaced (a project was loaded) or
+changed behind its back.
+"""
+import itertools
+from datetime import datetime
+from numbers import Integral
+
+import streamlit as st
+
+from siama.ratings import HISTORY, RATED_AT, RatingsTable, revision
+
+REFERENCING_SECTIONS = ("relationship_data", "conflict_data", "value_map")
+NEXT_ID = "next_stakeholder_id"
+FORMER = "former_stakeholders"
+
+_INDEX = "_stakeholder_index"
+_builds = itertools.count(1)
+
+
+def label(name, role):
+    return f"{name} ({role})"
+
+
+def _is_id(value):
+    return isinstance(value, Integral) and not isinstance(value, bool) and value > 0
+
+
+def migrate(sit, sat):
+    """Give the ``sit_data``/``sat_data`` sections stable IDs, in place.
+
+    Actors without a (unique) ``id`` get one, and label references in SAT
+    records and subgroup members are resolved to IDs. References to
+    stakeholders no longer in SIT are listed under ``former_stakeholders`` so
+    their ratings keep their labels. Of repeated ratings of one stakeholder
+    only the last is kept, at the position of the first, with the earlier
+    ones moved to its ``history``. The old ``subgroup_assignments`` mapping
+    is dropped; the index derives it.
+    Returns whether anything changed.
+    """
+    roles = sit.get('roles') or {}
+    former = sat.get(FORMER) or []
+    changed = False
+    used = {int(a['id']) for actors in roles.values() for a in actors if _is_id(a.get('id'))}
+    used.update(int(f['id']) for f in former if _is_id(f.get('id')))
+    next_id = max(sit.get(NEXT_ID) or 1, max(used, default=0) + 1)
+
+    by_label, known = {}, set()
+    for role, actors in roles.items():
+        for actor in actors:
+            sid = actor.get('id')
+            if not _is_id(sid) or int(sid) in known:
+                sid, next_id = next_id, next_id + 1
+                changed = True
+            elif type(sid) is not int:
+                changed = True
+            actor['id'] = sid = int(sid)
+            known.add(sid)
+            by_label.setdefault(label(actor.get('name', ''), role), sid)
+    for entry in former:
+        known.add(entry['id'])
+        by_label.setdefault(entry['label'], entry['id'])
+
+    def resolve(ref, text):
+        nonlocal next_id, changed
+        if _is_id(ref) and int(ref) in known:
+            return int(ref)
+        sid = by_label.get(text)
+        if sid is None:
+            if _is_id(ref):
+                sid = int(ref)
+            else:
+                sid, next_id = next_id, next_id + 1
+            text = text or f"Stakeholder #{sid}"
+            former.append({'id': sid, 'label': text})
+            by_label.setdefault(text, sid)
+            known.add(sid)
+            changed = True
+        return sid
+
+    for section in REFERENCING_SECTIONS:
+        for record in sat.get(section) or []:
+            ref = record.get('stakeholder_id')
+            sid = resolve(ref, str(record.get('stakeholder', '') or ''))
+            if ref != sid or type(ref) is not int:
+                record['stakeholder_id'] = sid
+                changed = True
+    for subgroup in (sat.get('subgroups') or {}).values():
+        members = subgroup.get('members') or []
+        ids = list(dict.fromkeys(resolve(m, m if isinstance(m, str) else "") for m in members))
+        if ids != members or any(type(m) is not int for m in members):
+            subgroup['members'] = ids
+            changed = True
+
+    ratings = sat.get('relationship_data') or []
+    current = {}
+    for record in ratings:
+        earlier = current.get(record['stakeholder_id'])
+        if earlier is not None:
+            record[HISTORY] = (earlier.get(HISTORY) or []) + [revision(earlier)] + (record.get(HISTORY) or [])
+        current[record['stakeholder_id']] = record
+    if len(current) != len(ratings):
+        ratings[:] = current.values()
+        changed = True
+
+    if sat.pop('subgroup_assignments', None) is not None:
+        changed = True
+    if former and sat.get(FORMER) is not former:
+        sat[FORMER] = former
+    if sit.get(NEXT_ID) != next_id:
+        sit[NEXT_ID] = next_id
+        changed = True
+    return changed
+
+
+def _shape(sit, sat):
+    subgroups = sat.get('subgroups') or {}
+    return (
+        sum(len(actors) for actors in (sit.get('roles') or {}).values()),
+        tuple(len(sat.get(section) or ()) for section in REFERENCING_SECTIONS),
+        len(subgroups),
+        sum(len(sg.get('members') or ()) for sg in subgroups.values()),
+    )
+
+
+def _build(sit, sat):
+    actors, labels = {}, {}
+    for role, members in (sit.get('roles') or {}).items():
+        for actor in members:
+            actors[actor['id']] = (role, actor)
+            labels[actor['id']] = label(actor.get('name', ''), role)
+    for entry in sat.get(FORMER) or []:
+        labels.setdefault(entry['id'], entry['label'])
+    refs = {}
+    for section in REFERENCING_SECTIONS:
+        for record in sat.get(section) or []:
+            refs.setdefault(record['stakeholder_id'], {}).setdefault(section, []).append(record)
+    groups = {}
+    for name, subgroup in (sat.get('subgroups') or {}).items():
+        for sid in subgroup.get('members') or ():
+            groups.setdefault(sid, []).append(name)
+    return {"sit": sit, "sat": sat, "shape": _shape(sit, sat), "serial": next(_builds), "version": 0,
+            "actors": actors, "labels": labels, "refs": refs, "groups": groups, "ratings": RatingsTable(sat.get('relationship_data') or [], labels)}
+
+
+def index():
+    """The session's stakeholder index, rebuilt (and migrated) if stale."""
+    sit, sat = st.session_state.sit_data, st.session_state.sat_data
+    idx = st.session_state.get(_INDEX)
+    if idx is None or idx["sit"] is not sit or idx["sat"] is not sat or idx["shape"] != _shape(sit, sat):
+        migrate(sit, sat)
+        idx = st.session_state[_INDEX] = _build(sit, sat)
+    return idx
+
+
+def _touch(idx):
+    idx["shape"] = _shape(idx["sit"], idx["sat"])
+    idx["version"] += 1
+
+
+def labels():
+    """``{id: label}`` for every stakeholder, including former ones."""
+    return index()["labels"]
+
+
+def label_of(sid):
+    return labels().get(sid, f"Stakeholder #{sid}")
+
+
+def actor_ids():
+    """IDs of every SIT actor, role by role."""
+    return list(index()["actors"])
+
+
+def ratings():
+    """The session's ``RatingsTable``, in step with ``relationship_data``."""
+    return index()["ratings"]
+
+
+def rating_of(sid):
+    """``sid``'s current rating record, or ``None``."""
+    idx = index()
+    position = idx["ratings"].position(sid)
+    return None if position is None else idx["sat"]['relationship_data'][position]
+
+
+def assignments():
+    """``{id: subgroup}``: the subgroup each member was most recently assigned to."""
+    return {sid: groups[-1] for sid, groups in index()["groups"].items() if groups}
+
+
+def assignments_token():
+    """Changes whenever ``assignments()`` may have, so it can stand in for
+    them in figure-cache inputs."""
+    idx = index()
+    return idx["serial"], idx["version"]
+
+
+# ----- SIT actors -----
+
+def add_actor(role, **fields):
+    idx = index()
+    sit = idx["sit"]
+    sid = sit.get(NEXT_ID) or 1
+    sit[NEXT_ID] = sid + 1
+    actor = dict(fields, id=sid)
+    sit['roles'].setdefault(role, []).append(actor)
+    idx["actors"][sid] = (role, actor)
+    idx["labels"][sid] = label(actor.get('name', ''), role)
+    _touch(idx)
+    return sid
+
+
+def rename_actor(sid, name):
+    """Rename an actor and relabel every record referring to it."""
+    idx = index()
+    role, actor = idx["actors"][sid]
+    actor['name'] = name
+    idx["labels"][sid] = new_label = label(name, role)
+    refs = idx["refs"].get(sid, {})
+    for records in refs.values():
+        for record in records:
+            record['stakeholder'] = new_label
+    if refs.get('relationship_data'):
+        idx["ratings"].relabel()
+
+
+def _forget(idx, sids):
+    sat = idx["sat"]
+    sections = {section for sid in sids for section in idx["refs"].get(sid, ())}
+    for section in sections:
+        sat[section][:] = [r for r in sat[section] if r['stakeholder_id'] not in sids]
+    if 'relationship_data' in sections:
+        idx["ratings"] = RatingsTable(sat['relationship_data'], idx["labels"])
+    for sid in sids:
+        idx["refs"].pop(sid, None)
+        for name in idx["groups"].pop(sid, ()):
+            sat['subgroups'][name]['members'].remove(sid)
+        idx["labels"].pop(sid, None)
+    if sat.get(FORMER):
+        sat[FORMER][:] = [f for f in sat[FORMER] if f['id'] not in sids]
+
+
+def delete_actor(sid):
+    """Delete an actor with its ratings, conflicts, value maps and memberships."""
+    idx = index()
+    role, actor = idx["actors"].pop(sid)
+    roster = idx["sit"]['roles'][role]
+    roster[:] = [a for a in roster if a is not actor]
+    _forget(idx, {sid})
+    _touch(idx)
+
+
+def delete_role(role):
+    """Delete a role and, as ``delete_actor`` does, everything its actors are in."""
+    idx = index()
+    sids = {actor['id'] for actor in idx["sit"]['roles'].pop(role)}
+    for sid in sids:
+        idx["actors"].pop(sid, None)
+    _forget(idx, sids)
+    _touch(idx)
+
+
+# ----- SAT records -----
+
+def add_record(section, sid, **fields):
+    """Append a ``section`` record (rating, conflict, value map) about ``sid``."""
+    idx = index()
+    record = dict(stakeholder=idx["labels"][sid], **fields, stakeholder_id=sid)
+    idx["sat"].setdefault(section, []).append(record)
+    idx["refs"].setdefault(sid, {}).setdefault(section, []).append(record)
+    if section == 'relationship_data':
+        idx["ratings"].append(record)
+    _touch(idx)
+    return record
+
+
+def rate(sid, **fields):
+    """Save ``sid``'s rating, replacing its current one if it has one.
+
+    The replaced values go to the end of the record's ``history``. Returns
+    the record and whether it already existed.
+    """
+    idx = index()
+    fields[RATED_AT] = datetime.now().isoformat(timespec="seconds")
+    position = idx["ratings"].position(sid)
+    if position is None:
+        return add_record('relationship_data', sid, **fields), False
+    record = idx["sat"]['relationship_data'][position]
+    record.setdefault(HISTORY, []).append(revision(record))
+    record.update(fields)
+    idx["ratings"].replace(position, record)
+    return record, True
+
+
+def remove_record(section, position):
+    """Remove a ``section`` record by position.
+
+    Removing a stakeholder's rating (and with it its history) also takes it
+    out of its subgroups.
+    """
+    idx = index()
+    record = idx["sat"][section].pop(position)
+    sid = record['stakeholder_id']
+    refs = idx["refs"].get(sid, {})
+    refs[section] = [r for r in refs.get(section, ()) if r is not record]
+    if section == 'relationship_data':
+        idx["ratings"].delete(position)
+        if not refs['relationship_data']:
+            for name in idx["groups"].pop(sid, ()):
+                idx["sat"]['subgroups'][name]['members'].remove(sid)
+    _touch(idx)
+    return record
+
+
+# ----- SAT subgroups -----
+
+def assign(sid, subgroup):
+    """Add ``sid`` to ``subgroup``; returns ``False`` if it already was a member."""
+    idx = index()
+    groups = idx["groups"].setdefault(sid, [])
+    if subgroup in groups:
+        return False
+    idx["sat"]['subgroups'][subgroup]['members'].append(sid)
+    groups.append(subgroup)
+    _touch(idx)
+    return True
+
+
+def unassign(subgroup, sid):
+    idx = index()
+    idx["sat"]['subgroups'][subgroup]['members'].remove(sid)
+    idx["groups"][sid].remove(subgroup)
+    _touch(idx)
+
+
+def delete_subgroup(name):
+    idx = index()
+    for sid in idx["sat"]['subgroups'].pop(name)['members']:
+        idx["groups"][sid].remove(name)
+    _touch(idx)
+
+
+def set_subgroup(name, description, members):
+    """Create or replace ``name`` with exactly ``members`` (IDs)."""
+    idx = index()
+    subgroups = idx["sat"].setdefault('subgroups', {})
+    for sid in subgroups.get(name, {}).get('members', ()):
+        idx["groups"][sid].remove(name)
+    members = list(dict.fromkeys(int(sid) for sid in members))
+    subgroups[name] = {'description': description, 'members': members}
+    for sid in members:
+        idx["groups"].setdefault(sid, []).append(name)
+    _touch(idx)
@@ -0,0 +1,87 @@
+"""Lazy page loading and startup timings.
+
+``render_page`` imports a page module from ``siama.views`` on its first visit
+and records how long that import and the page's first render took (per
+server process). Set ``SIAMA_STARTUP_REPORT=1`` to show these timings in the
+sidebar.
+
+``python -m siama.startup`` measures the cold import cost of the app core and
+of each page in fresh interpreters, as on a newly started container.
+"""
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+REPORT_ENV_VAR = "SIAMA_STARTUP_REPORT"
+CORE_MODULES = ("streamlit", "pandas", "siama.state", "siama.project_store", "siama.browser_sync")
+ON_DEMAND_MODULES = ("plotly.express", "plotly.graph_objects", "scipy.sparse", "sklearn.cluster", "sklearn.preprocessing")
+
+_timings = {}
+_lock = threading.Lock()
+
+
+def _record(page, kind, seconds):
+    with _lock:
+        _timings.setdefault(page, {}).setdefault(kind, seconds)
+
+
+def render_page(page):
+    """Render ``siama.views.<page>``, importing it on first use."""
+    name = f"siama.views.{page}"
+    module = sys.modules.get(name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        _record(page, "import", time.perf_counter() - start)
+    if "first_render" in _timings.get(page, {}):
+        module.render()
+        return
+    start = time.perf_counter()
+    try:
+        module.render()
+    finally:
+        # st.rerun() and st.stop() end a render by raising; still count it.
+        _record(page, "first_render", time.perf_counter() - start)
+
+
+def report():
+    """``[{page, import, first_render}]`` in seconds, for pages visited so far."""
+    with _lock:
+        return [
+            {"page": page, "import": t.get("import"), "first_render": t.get("first_render")}
+            for page, t in _timings.items()
+        ]
+
+
+def report_enabled():
+    return os.environ.get(REPORT_ENV_VAR, "").lower() not in ("", "0", "false", "no")
+
+
+def _cold_import(module, after=()):
+    code = (
+        "import importlib, time\n"
+        f"for m in {list(after)!r}: importlib.import_module(m)\n"
+        "t = time.perf_counter()\n"
+        f"importlib.import_module({module!r})\n"
+        "print(time.perf_counter() - t)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def main():
+    from siama.views import PAGES
+
+    print(f"{'module':<32} {'cold import (s)':>16}")
+    for module in CORE_MODULES:
+        print(f"{module:<32} {_cold_import(module):>16.3f}")
+    print("-- on top of the app core --")
+    for module in [f"siama.views.{page}" for page in PAGES.values()] + list(ON_DEMAND_MODULES):
+        print(f"{module:<32} {_cold_import(module, CORE_MODULES):>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
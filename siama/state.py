@@ -0,0 +1,30 @@
+"""Working-state helpers shared by the app script and the page modules."""
+import pandas as pd
+import streamlit as st
+
+from siama import project_store
+
+PROJECT_STATE_KEYS = list(project_store.PROJECT_SECTIONS)
+
+
+# Project mappings encode sections on write and decode fresh copies on read, so
+# a snapshot never aliases the working state it was taken from.
+def snapshot_current_state():
+    return {k: st.session_state.get(k) for k in PROJECT_STATE_KEYS}
+
+
+def apply_state(state):
+    for k in PROJECT_STATE_KEYS:
+        if k in state:
+            st.session_state[k] = state[k]
+
+
+def project_store_of(projects):
+    return projects.store if isinstance(projects, project_store.StoredProjects) else None
+
+
+def reset_state():
+    st.session_state.sit_data = {'stakeholders': [], 'roles': {}}
+    st.session_state.sat_data = {'relationship_matrix': pd.DataFrame()}
+    st.session_state.mat_data = {}
+    st.session_state.nature_of_craft = {'current_status': {}, 'desired_status': {}}
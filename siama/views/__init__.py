@@ -0,0 +1,17 @@
+"""One module per sidebar page, each exposing ``render()``.
+
+Pages are imported on first visit (see ``siama.startup.render_page``), so
+plotting and clustering libraries only load when a page that needs them runs.
+"""
+
+# Sidebar label -> module in this package, in sidebar order.
+PAGES = {
+    "🏠 Home": "home",
+    "📁 Projects": "projects",
+    "📊 Dashboard": "dashboard",
+    "1️⃣ SIT - Stakeholder Identification": "sit",
+    "2️⃣ SAT - Stakeholder Analysis": "sat",
+    "3️⃣ MAT - Market Analysis": "mat",
+    "4️⃣ Nature of Craft": "nature_of_craft",
+    "📊 Summary & Export": "summary",
+}
@@ -0,0 +1,189 @@
+"""Dashboard page."""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from siama import stakeholders
+from siama.figures import plot_figure
+
+
+def render():
+    st.markdown('<div class="main-header">Dashboard</div>', unsafe_allow_html=True)
+    if st.session_state.get('current_project'):
+        st.caption(f"📁 Project: **{st.session_state.current_project}**")
+    st.markdown("""
+        <div class="toolkit-card">
+        <h3>📊 At-a-glance synthesis</h3>
+        A single view of everything you've captured across SIT, SAT, MAT, and Nature of Craft.
+        </div>
+    """, unsafe_allow_html=True)
+
+    sit = st.session_state.sit_data
+    sat = st.session_state.sat_data
+    mat = st.session_state.mat_data
+    noc = st.session_state.get('nature_of_craft', {'current_status': {}, 'desired_status': {}})
+
+    total_actors = sum(len(a) for a in sit.get('roles', {}).values())
+    rel_data = stakeholders.ratings()
+    n_ratings = len(rel_data)
+    n_subgroups = len(sat.get('subgroups') or {})
+    n_mat_tools = len(mat)
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Actors mapped (SIT)", total_actors)
+    m2.metric("Stakeholders rated (SAT)", n_ratings)
+    m3.metric("Subgroups", n_subgroups)
+    m4.metric("MAT tools used", n_mat_tools)
+
+    if total_actors == 0 and n_ratings == 0 and n_mat_tools == 0:
+        st.info("No data yet. Populate SIT / SAT / MAT from the sidebar — this page will fill up automatically.")
+    else:
+        st.markdown("---")
+        left, right = st.columns(2)
+
+        with left:
+            st.subheader("Actors by role")
+            if sit.get('roles'):
+                role_counts = {role: len(actors) for role, actors in sit['roles'].items() if len(actors) > 0}
+                if role_counts:
+                    def _roles_bar():
+                        bar = px.bar(
+                            x=list(role_counts.keys()), y=list(role_counts.values()),
+                            labels={'x': 'Role', 'y': 'Actors'},
+                            color=list(role_counts.keys()),
+                        )
+                        bar.update_layout(height=320, showlegend=False, margin=dict(l=10, r=10, t=10, b=10))
+                        return bar
+                    plot_figure("dashboard.roles", role_counts, _roles_bar, use_container_width=True)
+                else:
+                    st.caption("No actors recorded yet in SIT.")
+            else:
+                st.caption("No actors recorded yet in SIT.")
+
+            st.subheader("Stakeholder priority matrix")
+            if rel_data:
+                def _priority_matrix():
+                    df = rel_data.frame()
+                    df['priority_score'] = df['power'].astype(float) * df['interest'].astype(float)
+                    sc = px.scatter(
+                        df, x='power', y='interest', text='stakeholder',
+                        size='priority_score', color='priority_score',
+                        color_continuous_scale='Reds', size_max=40,
+                    )
+                    sc.add_hline(y=5, line_dash='dash', line_color='lightgray')
+                    sc.add_vline(x=5, line_dash='dash', line_color='lightgray')
+                    sc.update_traces(textposition='top center')
+                    sc.update_layout(height=360, margin=dict(l=10, r=10, t=10, b=10),
+                                     xaxis=dict(range=[0, 11]), yaxis=dict(range=[0, 11]))
+                    return sc
+                plot_figure("dashboard.priority", rel_data.token, _priority_matrix, use_container_width=True)
+            else:
+                st.caption("No stakeholder ratings yet.")
+
+        with right:
+            st.subheader("Top 5 priority stakeholders")
+            if rel_data:
+                def _top_bar():
+                    df = rel_data.frame()
+                    df['priority_score'] = df['power'].astype(float) * df['interest'].astype(float)
+                    top = df.sort_values('priority_score', ascending=True).tail(5)
+                    hb = px.bar(top, x='priority_score', y='stakeholder', orientation='h',
+                                color='priority_score', color_continuous_scale='Reds')
+                    hb.update_layout(height=320, showlegend=False, coloraxis_showscale=False,
+                                     margin=dict(l=10, r=10, t=10, b=10),
+                                     yaxis=dict(title=''), xaxis=dict(title='Power × Interest'))
+                    return hb
+                plot_figure("dashboard.top5", rel_data.token, _top_bar, use_container_width=True)
+            else:
+                st.caption("No stakeholder ratings yet.")
+
+            st.subheader("Engagement quadrants (SAT)")
+            if rel_data:
+                def _quadrant_pie():
+                    df = rel_data.frame()
+                    def _quad(r):
+                        hp, hi = r['power'] > 5, r['interest'] > 5
+                        if hp and hi: return "Manage closely"
+                        if hp and not hi: return "Keep satisfied"
+                        if not hp and hi: return "Keep informed"
+                        return "Monitor"
+                    df['quadrant'] = df.apply(_quad, axis=1)
+                    qc = df['quadrant'].value_counts()
+                    pie = px.pie(values=qc.values, names=qc.index, hole=0.45,
+                                 color_discrete_sequence=px.colors.qualitative.Set2)
+                    pie.update_layout(height=320, margin=dict(l=10, r=10, t=10, b=10))
+                    return pie
+                plot_figure("dashboard.quadrants", rel_data.token, _quadrant_pie, use_container_width=True)
+            else:
+                st.caption("No stakeholder ratings yet.")
+
+        st.markdown("---")
+        st.subheader("MAT coverage & signals")
+        mc1, mc2, mc3 = st.columns(3)
+
+        with mc1:
+            st.markdown("**Tools completed**")
+            tool_labels = {
+                'pestel': 'PESTEL', 'gap': 'Gap',
+                'behavioral_segments': 'Segmentation', 'personas': 'Personas',
+                'customer_journey': 'Journey', 'mystery_shopping': 'Mystery',
+                'complaints': 'Complaints', 'brand_audit': 'Brand',
+            }
+            done = [label for key, label in tool_labels.items() if key in mat]
+            missing = [label for key, label in tool_labels.items() if key not in mat]
+            if done:
+                st.success("Done: " + ", ".join(done))
+            if missing:
+                st.info("To do: " + ", ".join(missing))
+
+        with mc2:
+            st.markdown("**Complaint severity**")
+            comps = mat.get('complaints') or []
+            if comps:
+                def _severity_bar():
+                    sev = pd.DataFrame(comps)['severity'].value_counts()
+                    order = ['Critical', 'High', 'Medium', 'Low']
+                    sev = sev.reindex([o for o in order if o in sev.index])
+                    sbar = px.bar(x=sev.index, y=sev.values,
+                                  color=sev.index,
+                                  color_discrete_map={'Critical': '#d62728', 'High': '#ff7f0e',
+                                                      'Medium': '#ffbb33', 'Low': '#2ca02c'})
+                    sbar.update_layout(height=260, showlegend=False,
+                                       margin=dict(l=10, r=10, t=10, b=10),
+                                       xaxis=dict(title=''), yaxis=dict(title='Count'))
+                    return sbar
+                plot_figure("dashboard.severity", comps, _severity_bar, use_container_width=True)
+            else:
+                st.caption("No complaints logged.")
+
+        with mc3:
+            st.markdown("**Segments & personas**")
+            segs = len(mat.get('behavioral_segments') or [])
+            pers = len(mat.get('personas') or [])
+            reports = len(mat.get('mystery_shopping') or [])
+            st.metric("Segments", segs)
+            st.metric("Personas", pers)
+            st.metric("Mystery-shopping reports", reports)
+
+        # Nature of Craft coverage
+        cur = noc.get('current_status', {}) or {}
+        des = noc.get('desired_status', {}) or {}
+        if cur or des:
+            st.markdown("---")
+            st.subheader("Nature of Craft — 5P coverage")
+            dims = ["Product", "Proficiency", "Process", "Purpose", "Portrayal"]
+            def _count_true(status, dim):
+                return sum(1 for k, v in status.items() if v and dim.lower() in str(k).lower())
+            current_vals = [_count_true(cur, d) for d in dims]
+            desired_vals = [_count_true(des, d) for d in dims]
+            def _radar():
+                radar = go.Figure()
+                radar.add_trace(go.Scatterpolar(r=current_vals + [current_vals[0]], theta=dims + [dims[0]],
+                                                fill='toself', name='Current', line_color='#1f77b4'))
+                radar.add_trace(go.Scatterpolar(r=desired_vals + [desired_vals[0]], theta=dims + [dims[0]],
+                                                fill='toself', name='Desired', line_color='#d62728'))
+                radar.update_layout(height=420, margin=dict(l=10, r=10, t=30, b=10),
+                                    polar=dict(radialaxis=dict(visible=True)))
+                return radar
+            plot_figure("dashboard.radar", (current_vals, desired_vals), _radar, use_container_width=True)
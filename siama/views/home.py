@@ -0,0 +1,75 @@
+"""Home page."""
+import streamlit as st
+
+
+def render():
+    st.markdown('<div class="main-header">SIAMA Toolbox</div>', unsafe_allow_html=True)
+    st.markdown("### Stakeholder Identification, Analysis, and Market Assessment")
+    
+    st.markdown("""
+    <div class="toolkit-card">
+    <h3>🎯 Purpose</h3>
+    The SIAMA toolbox is a comprehensive framework designed to help craft trainers and training organizations 
+    systematically plan craft education programs by understanding contextually different needs of artisans in India.
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        <div class="toolkit-card">
+        <h3>❓ What should we teach?</h3>
+        Addressed through:
+        <ul>
+        <li>Market study components (MAT)</li>
+        <li>Artisan's prior skill, knowledge, and aspirations (SIT, SAT)</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("""
+        <div class="toolkit-card">
+        <h3>👥 Whom should we teach?</h3>
+        Addressed through:
+        <ul>
+        <li>Stakeholder identification (SIT)</li>
+        <li>Stakeholder analysis (SAT)</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    st.subheader("📦 The Three Toolkits")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("""
+        **1. Stakeholder Identification Toolkit (SIT)**
+        - 4 Sequential Steps
+        - Identifies craft value chain actors
+        - Maps stakeholder relationships
+        - Visualizes supply chain
+        """)
+
+    with col2:
+        st.markdown("""
+        **2. Stakeholder Analysis Toolkit (SAT)**
+        - 5 Sequential Tools
+        - Analyzes power, interest, legitimacy
+        - Conflict resolution strategies
+        - Knowledge & responsibility mapping
+        """)
+
+    with col3:
+        st.markdown("""
+        **3. Market Analysis Toolkit (MAT)**
+        - 8 Analysis Tools
+        - Industry understanding
+        - Customer insights
+        - Brand assessment
+        """)
+
+    st.info("👈 Use the sidebar to navigate through each toolkit")
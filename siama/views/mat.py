@@ -0,0 +1,466 @@
+"""MAT - Market Analysis Toolkit page."""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+
+from siama import profiling
+from siama.figures import plot_figure
+from siama.fragments import action_button
+
+
+def _delete_entry(tool_key, index):
+    st.session_state.mat_data[tool_key].pop(index)
+
+
+def render():
+    st.markdown('<div class="main-header">MAT - Market Analysis Toolkit</div>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    MAT ensures that training programs align with market demands and opportunities through comprehensive market analysis.
+    """)
+    
+    mat_tools = st.selectbox("Select Analysis Tool", [
+        "PESTEL Analysis",
+        "Gap Analysis",
+        "Behavioral Segmentation",
+        "User Persona",
+        "Customer Journey Map",
+        "Mystery Shopping",
+        "Complaint Data Analysis",
+        "Brand Audit"
+    ])
+
+    # Map the tool label to its mat_data key(s) so users can clear a whole tool's data.
+    _mat_tool_keys = {
+        "PESTEL Analysis": ["pestel"],
+        "Gap Analysis": ["gap"],
+        "Behavioral Segmentation": ["behavioral_segments"],
+        "User Persona": ["personas"],
+        "Customer Journey Map": ["customer_journey"],
+        "Mystery Shopping": ["mystery_shopping"],
+        "Complaint Data Analysis": ["complaints"],
+        "Brand Audit": ["brand_audit"],
+    }
+    _clear_keys = [k for k in _mat_tool_keys.get(mat_tools, []) if k in st.session_state.mat_data]
+    if _clear_keys:
+        with st.expander(f"🗑️ Clear all {mat_tools} data"):
+            st.caption("This removes every entry recorded under this tool. Cannot be undone (unless you saved the project).")
+            if st.button(f"🗑️ Clear {mat_tools} data", key=f"_clear_mat_{mat_tools}"):
+                for k in _clear_keys:
+                    st.session_state.mat_data.pop(k, None)
+                st.success(f"Cleared {mat_tools} data.")
+                st.rerun()
+
+    if mat_tools == "PESTEL Analysis":
+        st.subheader("PESTEL Analysis")
+        st.info("Analyze Political, Economic, Social, Technological, Environmental, and Legal factors.")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            political = st.text_area(
+                "Political Factors",
+                placeholder="e.g., PM Vishwakarma scheme offers 15% subsidy on raw materials"
+            )
+            economic = st.text_area(
+                "Economic Factors",
+                placeholder="e.g., Rising demand for handmade products in urban markets"
+            )
+            social = st.text_area(
+                "Social Factors",
+                placeholder="e.g., Growing appreciation for traditional crafts among youth"
+            )
+        
+        with col2:
+            technological = st.text_area(
+                "Technological Factors",
+                placeholder="e.g., E-commerce platforms enabling direct sales"
+            )
+            environmental = st.text_area(
+                "Environmental Factors",
+                placeholder="e.g., Preference for sustainable, eco-friendly products"
+            )
+            legal = st.text_area(
+                "Legal Factors",
+                placeholder="e.g., GI tag protection for regional crafts"
+            )
+        
+        if st.button("Save PESTEL Analysis"):
+            st.session_state.mat_data['pestel'] = {
+                'political': political,
+                'economic': economic,
+                'social': social,
+                'technological': technological,
+                'environmental': environmental,
+                'legal': legal,
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            st.success("✅ PESTEL Analysis saved!")
+    
+    elif mat_tools == "Gap Analysis":
+        st.subheader("Gap Analysis")
+        st.info("Identify the gap between current state and desired future state.")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            current_state = st.text_area(
+                "Current State",
+                placeholder="e.g., Market for handmade wedding invitations sees very seasonal demand"
+            )
+            current_strengths = st.text_area("Current Strengths")
+            current_weaknesses = st.text_area("Current Weaknesses")
+        
+        with col2:
+            desired_state = st.text_area(
+                "Desired Future State",
+                placeholder="e.g., Year-round consistent demand with diversified product line"
+            )
+            opportunities = st.text_area("Opportunities")
+            threats = st.text_area("Threats")
+        
+        action_plan = st.text_area("Action Plan to Bridge the Gap")
+        
+        if st.button("Save Gap Analysis"):
+            st.session_state.mat_data['gap'] = {
+                'current_state': current_state,
+                'current_strengths': current_strengths,
+                'current_weaknesses': current_weaknesses,
+                'desired_state': desired_state,
+                'opportunities': opportunities,
+                'threats': threats,
+                'action_plan': action_plan,
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            st.success("✅ Gap Analysis saved!")
+    
+    elif mat_tools == "Behavioral Segmentation":
+        st.subheader("Behavioral Segmentation")
+        st.info("Segment customers based on purchasing behavior, usage, and benefits sought.")
+        
+        segment_name = st.text_input("Segment Name")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            purchase_behavior = st.text_area("Purchase Behavior")
+            usage_rate = st.text_area("Usage Rate")
+        
+        with col2:
+            benefits_sought = st.text_area("Benefits Sought")
+            loyalty_status = st.text_area("Loyalty Status")
+        
+        occasion = st.text_area("Purchase Occasion")
+        
+        if st.button("Add Segment"):
+            if 'behavioral_segments' not in st.session_state.mat_data:
+                st.session_state.mat_data['behavioral_segments'] = []
+            
+            st.session_state.mat_data['behavioral_segments'].append({
+                'name': segment_name,
+                'purchase_behavior': purchase_behavior,
+                'usage_rate': usage_rate,
+                'benefits_sought': benefits_sought,
+                'loyalty_status': loyalty_status,
+                'occasion': occasion
+            })
+            st.success(f"✅ Segment '{segment_name}' added!")
+        
+        # Display segments
+        @st.fragment(key="mat.segments")
+        def _segments_view():
+            if 'behavioral_segments' in st.session_state.mat_data:
+                st.subheader("Customer Segments")
+                for seg_idx, seg in enumerate(list(st.session_state.mat_data['behavioral_segments'])):
+                    with st.expander(f"👥 {seg['name']}"):
+                        st.write(f"**Purchase Behavior:** {seg['purchase_behavior']}")
+                        st.write(f"**Usage Rate:** {seg['usage_rate']}")
+                        st.write(f"**Benefits Sought:** {seg['benefits_sought']}")
+                        st.write(f"**Loyalty Status:** {seg['loyalty_status']}")
+                        st.write(f"**Occasion:** {seg['occasion']}")
+                        action_button("🗑️ Delete this segment", _delete_entry, args=('behavioral_segments', seg_idx),
+                                      views=("mat.segments",), key=f"del_seg_{seg_idx}")
+        _segments_view()
+    
+    elif mat_tools == "User Persona":
+        st.subheader("User Persona")
+        st.info("Create detailed profiles of typical customers.")
+        
+        persona_name = st.text_input("Persona Name")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            age_range = st.text_input("Age Range")
+            occupation = st.text_input("Occupation")
+            location = st.text_input("Location")
+            income_level = st.text_input("Income Level")
+        
+        with col2:
+            education = st.text_input("Education Level")
+            family_status = st.text_input("Family Status")
+            lifestyle = st.text_input("Lifestyle")
+        
+        goals = st.text_area("Goals & Motivations")
+        pain_points = st.text_area("Pain Points & Frustrations")
+        shopping_habits = st.text_area("Shopping Habits")
+        
+        if st.button("Save Persona"):
+            if 'personas' not in st.session_state.mat_data:
+                st.session_state.mat_data['personas'] = []
+            
+            st.session_state.mat_data['personas'].append({
+                'name': persona_name,
+                'age_range': age_range,
+                'occupation': occupation,
+                'location': location,
+                'income_level': income_level,
+                'education': education,
+                'family_status': family_status,
+                'lifestyle': lifestyle,
+                'goals': goals,
+                'pain_points': pain_points,
+                'shopping_habits': shopping_habits
+            })
+            st.success(f"✅ Persona '{persona_name}' created!")
+        
+        # Display personas
+        @st.fragment(key="mat.personas")
+        def _personas_view():
+            if 'personas' in st.session_state.mat_data:
+                st.subheader("Created Personas")
+                for p_idx, persona in enumerate(list(st.session_state.mat_data['personas'])):
+                    with st.expander(f"👤 {persona['name']}"):
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.write(f"**Demographics:**")
+                            st.write(f"- Age: {persona['age_range']}")
+                            st.write(f"- Occupation: {persona['occupation']}")
+                            st.write(f"- Location: {persona['location']}")
+                            st.write(f"- Income: {persona['income_level']}")
+                        with col2:
+                            st.write(f"**Psychographics:**")
+                            st.write(f"- Education: {persona['education']}")
+                            st.write(f"- Family: {persona['family_status']}")
+                            st.write(f"- Lifestyle: {persona['lifestyle']}")
+                        st.write(f"**Goals:** {persona['goals']}")
+                        st.write(f"**Pain Points:** {persona['pain_points']}")
+                        st.write(f"**Shopping Habits:** {persona['shopping_habits']}")
+                        action_button("🗑️ Delete this persona", _delete_entry, args=('personas', p_idx),
+                                      views=("mat.personas",), key=f"del_persona_{p_idx}")
+        _personas_view()
+    
+    elif mat_tools == "Customer Journey Map":
+        st.subheader("Customer Journey Map")
+        st.info("Map the customer's experience from awareness to post-purchase.")
+        
+        stages = ["Awareness", "Consideration", "Purchase", "Usage", "Loyalty"]
+        
+        journey_data = {}
+        for stage in stages:
+            with st.expander(f"📍 {stage}"):
+                journey_data[stage] = {
+                    'touchpoints': st.text_area(f"Touchpoints in {stage}", key=f"tp_{stage}"),
+                    'actions': st.text_area(f"Customer Actions", key=f"act_{stage}"),
+                    'emotions': st.text_area(f"Emotions/Thoughts", key=f"emo_{stage}"),
+                    'pain_points': st.text_area(f"Pain Points", key=f"pain_{stage}"),
+                    'opportunities': st.text_area(f"Opportunities for Improvement", key=f"opp_{stage}")
+                }
+        
+        if st.button("Save Customer Journey"):
+            st.session_state.mat_data['customer_journey'] = journey_data
+            st.success("✅ Customer Journey Map saved!")
+    
+    elif mat_tools == "Mystery Shopping":
+        st.subheader("Mystery Shopping")
+        st.info("Evaluate customer experience by acting as a customer.")
+        
+        location = st.text_input("Location Evaluated")
+        date = st.date_input("Date of Visit")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**Store/Online Experience:**")
+            ambiance = st.slider("Ambiance/Interface", 1, 10, 5)
+            accessibility = st.slider("Accessibility", 1, 10, 5)
+            product_display = st.slider("Product Display", 1, 10, 5)
+        
+        with col2:
+            st.markdown("**Service Quality:**")
+            staff_behavior = st.slider("Staff Behavior", 1, 10, 5)
+            product_knowledge = st.slider("Product Knowledge", 1, 10, 5)
+            response_time = st.slider("Response Time", 1, 10, 5)
+        
+        observations = st.text_area("Detailed Observations")
+        recommendations = st.text_area("Recommendations for Improvement")
+        
+        if st.button("Save Mystery Shopping Report"):
+            if 'mystery_shopping' not in st.session_state.mat_data:
+                st.session_state.mat_data['mystery_shopping'] = []
+            
+            st.session_state.mat_data['mystery_shopping'].append({
+                'location': location,
+                'date': str(date),
+                'ambiance': ambiance,
+                'accessibility': accessibility,
+                'product_display': product_display,
+                'staff_behavior': staff_behavior,
+                'product_knowledge': product_knowledge,
+                'response_time': response_time,
+                'observations': observations,
+                'recommendations': recommendations
+            })
+            st.success("✅ Mystery Shopping Report saved!")
+
+        @st.fragment(key="mat.mystery_shopping")
+        def _mystery_shopping_view():
+            if 'mystery_shopping' in st.session_state.mat_data and st.session_state.mat_data['mystery_shopping']:
+                st.subheader("Saved Mystery Shopping Reports")
+                for ms_idx, ms in enumerate(list(st.session_state.mat_data['mystery_shopping'])):
+                    with st.expander(f"🛍️ {ms.get('location','?')} — {ms.get('date','')}"):
+                        st.write(f"Ambiance: {ms.get('ambiance')}, Accessibility: {ms.get('accessibility')}, "
+                                 f"Display: {ms.get('product_display')}, Staff: {ms.get('staff_behavior')}, "
+                                 f"Knowledge: {ms.get('product_knowledge')}, Response: {ms.get('response_time')}")
+                        if ms.get('observations'):
+                            st.write(f"**Observations:** {ms['observations']}")
+                        if ms.get('recommendations'):
+                            st.write(f"**Recommendations:** {ms['recommendations']}")
+                        action_button("🗑️ Delete this report", _delete_entry, args=('mystery_shopping', ms_idx),
+                                      views=("mat.mystery_shopping",), key=f"del_ms_{ms_idx}")
+        _mystery_shopping_view()
+
+    elif mat_tools == "Complaint Data Analysis":
+        st.subheader("Complaint Data Analysis")
+        st.info("Analyze customer complaints to identify patterns and improvement areas.")
+        
+        complaint_source = st.text_input("Complaint Source")
+        complaint_date = st.date_input("Date Received")
+        
+        complaint_category = st.selectbox(
+            "Complaint Category",
+            ["Product Quality", "Service", "Delivery", "Pricing", "Communication", "Other"]
+        )
+        
+        complaint_description = st.text_area("Complaint Description")
+        severity = st.select_slider("Severity", options=["Low", "Medium", "High", "Critical"])
+        
+        resolution_status = st.selectbox("Resolution Status", 
+                                        ["Pending", "In Progress", "Resolved", "Closed"])
+        resolution_details = st.text_area("Resolution Details")
+        
+        if st.button("Add Complaint"):
+            if 'complaints' not in st.session_state.mat_data:
+                st.session_state.mat_data['complaints'] = []
+            
+            st.session_state.mat_data['complaints'].append({
+                'source': complaint_source,
+                'date': str(complaint_date),
+                'category': complaint_category,
+                'description': complaint_description,
+                'severity': severity,
+                'status': resolution_status,
+                'resolution': resolution_details
+            })
+            st.success("✅ Complaint logged!")
+        
+        # Analysis
+        @st.fragment(key="mat.complaints")
+        def _complaints_view():
+            if 'complaints' in st.session_state.mat_data and st.session_state.mat_data['complaints']:
+                st.subheader("Complaint Analysis")
+            
+                df_complaints = profiling.timed("dataframe: mat.complaints", pd.DataFrame, st.session_state.mat_data['complaints'])
+            
+                col1, col2 = st.columns(2)
+            
+                with col1:
+                    # Category distribution
+                    category_counts = df_complaints['category'].value_counts()
+                    def _category_pie():
+                        fig_cat = px.pie(values=category_counts.values, 
+                                       names=category_counts.index,
+                                       title="Complaints by Category")
+                        return fig_cat
+                    plot_figure("mat.categories", category_counts.to_dict(), _category_pie, use_container_width=True)
+            
+                with col2:
+                    # Severity distribution
+                    severity_counts = df_complaints['severity'].value_counts()
+                    def _severity_bar():
+                        fig_sev = px.bar(x=severity_counts.index,
+                                       y=severity_counts.values,
+                                       title="Complaints by Severity")
+                        return fig_sev
+                    plot_figure("mat.severity", severity_counts.to_dict(), _severity_bar, use_container_width=True)
+
+                with st.expander("🗑️ Manage complaint entries"):
+                    for idx, c in enumerate(list(st.session_state.mat_data['complaints'])):
+                        cc1, cc2 = st.columns([5, 1])
+                        with cc1:
+                            st.write(f"**{idx+1}.** [{c.get('severity','?')}] {c.get('category','?')} — "
+                                     f"{c.get('source','?')} ({c.get('date','')})")
+                            if c.get('description'):
+                                st.caption(c['description'][:120])
+                        with cc2:
+                            action_button("🗑️ Delete", _delete_entry, args=('complaints', idx),
+                                          views=("mat.complaints",), key=f"del_complaint_{idx}")
+        _complaints_view()
+
+    elif mat_tools == "Brand Audit":
+        st.subheader("Brand Audit")
+        st.info("Evaluate brand perception, positioning, and performance.")
+        
+        st.markdown("### Brand Identity")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            brand_mission = st.text_area("Brand Mission")
+            brand_vision = st.text_area("Brand Vision")
+            brand_values = st.text_area("Brand Values")
+        
+        with col2:
+            unique_selling_proposition = st.text_area("Unique Selling Proposition")
+            brand_personality = st.text_area("Brand Personality")
+            brand_promise = st.text_area("Brand Promise")
+        
+        st.markdown("### Brand Performance")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            brand_awareness = st.slider("Brand Awareness", 1, 10, 5)
+            brand_recognition = st.slider("Brand Recognition", 1, 10, 5)
+        
+        with col2:
+            brand_loyalty = st.slider("Brand Loyalty", 1, 10, 5)
+            customer_satisfaction = st.slider("Customer Satisfaction", 1, 10, 5)
+        
+        with col3:
+            market_position = st.slider("Market Position", 1, 10, 5)
+            brand_consistency = st.slider("Brand Consistency", 1, 10, 5)
+        
+        strengths = st.text_area("Brand Strengths")
+        weaknesses = st.text_area("Brand Weaknesses")
+        recommendations = st.text_area("Strategic Recommendations")
+        
+        if st.button("Save Brand Audit"):
+            st.session_state.mat_data['brand_audit'] = {
+                'brand_mission': brand_mission,
+                'brand_vision': brand_vision,
+                'brand_values': brand_values,
+                'usp': unique_selling_proposition,
+                'personality': brand_personality,
+                'promise': brand_promise,
+                'awareness': brand_awareness,
+                'recognition': brand_recognition,
+                'loyalty': brand_loyalty,
+                'satisfaction': customer_satisfaction,
+                'position': market_position,
+                'consistency': brand_consistency,
+                'strengths': strengths,
+                'weaknesses': weaknesses,
+                'recommendations': recommendations,
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            st.success("✅ Brand Audit saved!")
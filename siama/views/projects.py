@@ -0,0 +1,443 @@
+"""Projects page."""
+import streamlit as st
+import pandas as pd
+import copy
+from datetime import datetime
+from functools import partial
+
+from siama import autosave, browser_sync, clustering, jobs, portfolio
+from siama.figures import fingerprint
+from siama.history import diff_sections
+from siama.project_format import (
+    BUNDLE_EXTENSION,
+    dump_projects_binary,
+    open_projects_bundle,
+    serialize_projects,
+)
+from siama.ratings import SCORES
+from siama.state import apply_state, project_store_of, reset_state, snapshot_current_state
+
+PROJECT_SORT_FIELDS = {
+    "name": "Name", "updated": "Last updated", "created": "Created", "opened": "Last opened",
+    "stakeholders": "Stakeholders", "relationships": "Relationships", "mat_tools": "MAT tools", "size": "Size",
+}
+PROJECT_DATA_FILTERS = {"SIT": "stakeholders", "SAT": "relationships", "MAT": "mat_tools"}
+
+
+def _browser_missing_prompt():
+    missing = [n for n in st.session_state.get("_browser_pull_missing", ()) if n in st.session_state.projects]
+    if not missing:
+        st.session_state.pop("_browser_pull_missing", None)
+        return
+    st.warning(f"⚠️ {len(missing)} project(s) on the server are not in this browser's copy: "
+               + ", ".join(f"**{n}**" for n in missing) + ". They were kept.")
+    mc1, mc2 = st.columns([2, 1])
+    with mc1:
+        confirm = st.checkbox("Confirm deleting them from the server", key="_browser_missing_confirm")
+        if st.button(f"🗑️ Delete these {len(missing)} project(s)", key="_browser_missing_delete", disabled=not confirm):
+            for name in missing:
+                del st.session_state.projects[name]
+                if st.session_state.current_project == name:
+                    st.session_state.current_project = None
+            del st.session_state._browser_pull_missing
+            st.success(f"Deleted {len(missing)} project(s).")
+            st.rerun()
+    with mc2:
+        if st.button("Keep them", key="_browser_missing_keep"):
+            del st.session_state._browser_pull_missing
+            st.rerun()
+
+
+def render():
+    st.markdown('<div class="main-header">Projects</div>', unsafe_allow_html=True)
+
+    if st.session_state.pop("_loaded_from_browser", None):
+        st.success(f"✅ Loaded {len(st.session_state.projects)} project(s) from browser storage.")
+        _pull_summary = st.session_state.pop("_browser_pull_summary", None)
+        if _pull_summary:
+            st.caption(_pull_summary)
+
+    st.markdown("""
+        <div class="toolkit-card">
+        <h3>📁 Manage Projects</h3>
+        Save, load, rename, and delete SIAMA analyses as named projects. Each project bundles your
+        SIT, SAT, MAT, and Nature of Craft data. Use <b>Browser Storage</b> to keep projects on this
+        device between visits, and <b>Export/Import</b> to move them to other devices or share with others.
+        </div>
+    """, unsafe_allow_html=True)
+
+    if project_store_of(st.session_state.projects) is not None:
+        st.caption(f"🗄️ Projects are stored on the server in `{st.session_state.projects.store.path}`. "
+                   "While a project is loaded, **Autosave** in the sidebar saves your edits to it every few seconds.")
+
+    if st.session_state.current_project:
+        st.info(f"🟢 Currently editing: **{st.session_state.current_project}**")
+    else:
+        st.info("⚪ No project loaded. Your current edits are held in this session only — save them as a project to keep them.")
+
+    st.markdown("---")
+
+    tab_list, tab_create, tab_history, tab_portfolio, tab_transfer = st.tabs(
+        ["📋 My Projects", "➕ New / Save Current", "🕘 History", "🧩 Portfolio", "💾 Browser / Export / Import"]
+    )
+
+    with tab_create:
+        st.markdown("### Save current work as a new project")
+        new_name = st.text_input("Project name", key="_new_project_name", placeholder="e.g. Bandhani Training Program – Kutch 2026")
+        cc1, cc2 = st.columns(2)
+        with cc1:
+            if st.button("💾 Save as new project", type="primary", key="_save_new_btn"):
+                name = (new_name or "").strip()
+                if not name:
+                    st.error("Project name cannot be empty.")
+                elif name in st.session_state.projects:
+                    st.error(f"A project named '{name}' already exists. Rename it, or update it from the '📋 My Projects' tab.")
+                else:
+                    now = datetime.now().isoformat(timespec="seconds")
+                    st.session_state.projects[name] = {
+                        "created": now, "updated": now, **snapshot_current_state()
+                    }
+                    st.session_state.current_project = name
+                    st.success(f"✅ Saved project '{name}'.")
+                    st.rerun()
+        with cc2:
+            if st.button("🆕 Start new blank project", key="_new_blank_btn"):
+                reset_state()
+                st.session_state.current_project = None
+                st.success("Started a new blank analysis. Current data has been cleared.")
+                st.rerun()
+
+        if st.session_state.current_project:
+            st.markdown("---")
+            st.markdown(f"### Update the currently loaded project")
+            if st.button(f"💾 Save changes to '{st.session_state.current_project}'", type="primary", key="_save_update_btn"):
+                name = st.session_state.current_project
+                prev = st.session_state.projects.info(name) or {}
+                st.session_state.projects[name] = {
+                    "created": prev.get("created") or datetime.now().isoformat(timespec="seconds"),
+                    "updated": datetime.now().isoformat(timespec="seconds"),
+                    **snapshot_current_state()
+                }
+                st.success(f"✅ Updated '{name}'.")
+                st.rerun()
+
+    with tab_list:
+        if not st.session_state.projects:
+            st.info("No projects yet. Save one in the '➕ New / Save Current' tab, or load from Browser Storage / Import.")
+        else:
+            fc1, fc2, fc3, fc4 = st.columns([3, 2, 1, 2])
+            with fc1:
+                query = st.text_input("Search", key="_project_search", placeholder="Filter by name…")
+            with fc2:
+                sort_by = st.selectbox("Sort by", list(PROJECT_SORT_FIELDS), key="_project_sort",
+                                       format_func=PROJECT_SORT_FIELDS.get)
+            with fc3:
+                descending = st.toggle("Descending", key="_project_sort_desc")
+            with fc4:
+                with_data = st.multiselect("With data in", list(PROJECT_DATA_FILTERS), key="_project_with_data")
+            summaries = st.session_state.projects.summaries(
+                query=query.strip(), sort=sort_by, descending=descending,
+                nonempty=[PROJECT_DATA_FILTERS[f] for f in with_data],
+            )
+            st.markdown(f"### {len(summaries)} of {len(st.session_state.projects)} project(s)")
+            for info in summaries:
+                pname = info['name']
+                header_mark = "🟢 " if pname == st.session_state.current_project else ""
+                with st.expander(
+                    f"{header_mark}📁 **{pname}** — updated {info.get('updated') or 'N/A'}",
+                    expanded=(pname == st.session_state.current_project),
+                ):
+                    st.caption(
+                        f"SIT: {info['stakeholders']} stakeholders · SAT: {info['relationships']} relationships · "
+                        f"MAT: {info['mat_tools']} tools · {info['size'] / 1024:,.0f} KB · "
+                        f"created {info.get('created') or 'N/A'} · last opened {info.get('opened') or 'never'}"
+                    )
+
+                    lc, rc, dc = st.columns([1, 2, 1])
+                    with lc:
+                        if st.button("📂 Load", key=f"load_{pname}"):
+                            apply_state(st.session_state.projects[pname])
+                            st.session_state.projects.mark_opened(pname)
+                            st.session_state.current_project = pname
+                            st.success(f"Loaded '{pname}'.")
+                            st.rerun()
+                    with rc:
+                        new_n = st.text_input("Rename to", value=pname, key=f"rename_{pname}", label_visibility="collapsed")
+                        if st.button("✏️ Rename", key=f"rename_btn_{pname}"):
+                            target = (new_n or "").strip()
+                            if not target or target == pname:
+                                st.info("Enter a different name to rename.")
+                            elif target in st.session_state.projects:
+                                st.error(f"A project named '{target}' already exists.")
+                            else:
+                                try:
+                                    st.session_state.projects.rename(pname, target)
+                                except ValueError as e:
+                                    st.error(str(e))
+                                else:
+                                    if st.session_state.current_project == pname:
+                                        st.session_state.current_project = target
+                                    st.success(f"Renamed to '{target}'.")
+                                    st.rerun()
+                    with dc:
+                        confirm = st.checkbox("Confirm", key=f"confirm_del_{pname}", help="Required before deleting")
+                        if st.button("🗑️ Delete", key=f"del_{pname}", disabled=not confirm):
+                            del st.session_state.projects[pname]
+                            if st.session_state.current_project == pname:
+                                st.session_state.current_project = None
+                            st.success(f"Deleted '{pname}'.")
+                            st.rerun()
+
+    with tab_history:
+        if not st.session_state.projects:
+            st.info("No projects yet. Every save of a project is kept here as a version you can compare or restore.")
+        else:
+            names = sorted(st.session_state.projects)
+            current = st.session_state.current_project
+            hname = st.selectbox("Project", names, index=names.index(current) if current in names else 0,
+                                 key="_history_project")
+            versions = st.session_state.projects.versions(hname)
+            st.caption(
+                f"{len(versions)} version(s) · {st.session_state.projects.history_size(hname) / 1024:,.0f} KB stored "
+                "in total — sections that did not change are shared between versions."
+            )
+            st.dataframe(
+                pd.DataFrame([{
+                    "Version": v["id"],
+                    "Saved": v["saved"],
+                    "Kind": v["kind"],
+                    "Changed": ", ".join(v["changed"]) or "—",
+                    "New content (KB)": round(v["added_bytes"] / 1024, 1),
+                    "Note": v["note"] or "",
+                } for v in versions]),
+                hide_index=True, use_container_width=True,
+            )
+            if versions:
+                ids = [v["id"] for v in versions]
+                hc1, hc2 = st.columns(2)
+                with hc1:
+                    to_v = st.selectbox("Version", ids, key=f"_history_to_{hname}_{len(ids)}")
+                with hc2:
+                    from_v = st.selectbox("Compare against", ids, index=min(1, len(ids) - 1),
+                                          key=f"_history_from_{hname}_{len(ids)}")
+                if from_v != to_v:
+                    changes = diff_sections(
+                        st.session_state.projects.load_version(hname, from_v),
+                        st.session_state.projects.load_version(hname, to_v),
+                    )
+                    if changes:
+                        st.markdown(f"**{len(changes)} change(s)** from version {from_v} to version {to_v}")
+                        st.dataframe(pd.DataFrame(changes), hide_index=True, use_container_width=True)
+                    else:
+                        st.info("These versions have the same content.")
+                if st.button(f"↩️ Restore version {to_v}", key="_history_restore_btn"):
+                    store = project_store_of(st.session_state.projects)
+                    if store is not None:
+                        # An autosave queued before the restore must not land on top of it.
+                        autosave.reset(store, hname)
+                    restored = st.session_state.projects.restore_version(hname, to_v)
+                    if hname == st.session_state.current_project:
+                        apply_state(restored)
+                    st.success(f"Restored '{hname}' to version {to_v}.")
+                    st.rerun()
+
+    with tab_portfolio:
+        _portfolio_tab()
+
+    with tab_transfer:
+        st.markdown("### 💾 Browser storage")
+        st.caption("Projects are saved to this browser on this device. Clearing browser data will remove them.")
+        bc1, bc2 = st.columns(2)
+        with bc1:
+            if st.button("💾 Save ALL projects to browser", type="primary", key="_push_browser_btn"):
+                browser_sync.start_push()
+        with bc2:
+            if st.button("📥 Load projects from browser", key="_pull_browser_btn"):
+                browser_sync.start_pull()
+
+        try:
+            synced = browser_sync.sync_step(st.session_state.projects)
+        except ValueError as e:
+            synced = None
+            st.error(f"Browser sync failed: {e}")
+        if synced is None:
+            progress = browser_sync.transfer_progress()
+            if progress:
+                st.progress(progress[0] / progress[1], text=f"Reading browser storage… {progress[0]}/{progress[1]} chunk(s)")
+        elif synced[0] == "push":
+            pushed = synced[1]
+            st.success(
+                f"✅ Saved {pushed['projects']} project(s) to browser — wrote {pushed['written']} changed "
+                f"({pushed['written_bytes'] / 1024:,.0f} KB), skipped {pushed['skipped']} unchanged "
+                f"({pushed['skipped_bytes'] / 1024:,.0f} KB)."
+            )
+        elif synced[1]["names"]:
+            pulled = synced[1]
+            projects = st.session_state.projects
+            # Only the fetched projects changed; the rest are already up to date.
+            projects.merge(pulled["projects"], kind="browser")
+            held = set(pulled["names"])
+            missing = [name for name in projects if name not in held]
+            if project_store_of(projects) is None:
+                # The session's own copy: mirror the browser.
+                for name in missing:
+                    del projects[name]
+            elif missing:
+                # The server store is shared with other sessions: only delete on request.
+                st.session_state._browser_pull_missing = missing
+            st.session_state._loaded_from_browser = len(pulled["names"])
+            st.session_state._browser_pull_summary = (
+                f"Fetched {pulled['fetched']} changed project(s) ({pulled['fetched_bytes'] / 1024:,.0f} KB); "
+                f"{pulled['reused']} already up to date in this session ({pulled['reused_bytes'] / 1024:,.0f} KB skipped)."
+            )
+            st.rerun()
+        else:
+            st.info("ℹ️ No saved projects found in this browser.")
+        _browser_missing_prompt()
+
+        st.markdown("---")
+        st.markdown("### 📤 Export / 📥 Import (portable .siama / JSON)")
+        st.caption(f"`.{BUNDLE_EXTENSION}` bundles are compact and load fastest. JSON is kept for compatibility with older exports.")
+
+        if st.session_state.projects:
+            # Built only when a download is clicked, not on every rerun of the page.
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            ec1, ec2 = st.columns(2)
+            with ec1:
+                st.download_button(
+                    f"📥 Download all projects (.{BUNDLE_EXTENSION})",
+                    data=partial(dump_projects_binary, st.session_state.projects),
+                    file_name=f"siama_projects_{stamp}.{BUNDLE_EXTENSION}",
+                    mime="application/zip",
+                    key="_download_bundle_bin",
+                )
+            with ec2:
+                st.download_button(
+                    "📥 Download all projects as JSON",
+                    data=partial(serialize_projects, st.session_state.projects),
+                    file_name=f"siama_projects_{stamp}.json",
+                    mime="application/json",
+                    key="_download_bundle",
+                )
+        else:
+            st.caption("No projects to export yet.")
+
+        uploaded = st.file_uploader("Import projects (.siama or JSON)", type=[BUNDLE_EXTENSION, "json"], key="_import_json")
+        if uploaded is None:
+            st.session_state.pop('_import_bundle', None)
+        else:
+            try:
+                cached = st.session_state.get('_import_bundle')
+                if cached is None or cached['file_id'] != uploaded.file_id:
+                    scan_bar = st.progress(0.0, text=f"Scanning {uploaded.name}…")
+                    bundle = open_projects_bundle(
+                        uploaded, progress=lambda f: scan_bar.progress(min(f, 1.0), text=f"Scanning {uploaded.name}…")
+                    )
+                    scan_bar.empty()
+                    cached = {'file_id': uploaded.file_id, 'bundle': bundle}
+                    st.session_state._import_bundle = cached
+                bundle = cached['bundle']
+                names = bundle.names()
+                st.markdown(f"**{len(names)} project(s)** in this file ({uploaded.size / 1024:,.0f} KB)")
+                st.dataframe(
+                    pd.DataFrame({
+                        "Project": names,
+                        "Size (KB)": [round(bundle.project_size(n) / 1024, 1) for n in names],
+                        "Already exists": ["yes" if n in st.session_state.projects else "" for n in names],
+                    }),
+                    hide_index=True, use_container_width=True,
+                )
+                selected = st.multiselect("Projects to import", names, default=names, key="_import_selected")
+                merge_choice = st.radio(
+                    "If names collide:",
+                    ["Skip duplicates", "Overwrite existing"],
+                    horizontal=True,
+                    key="_merge_choice",
+                )
+                if st.button("✅ Import into this session", key="_import_btn", disabled=not selected):
+                    added, overwritten, skipped = 0, 0, 0
+                    import_bar = st.progress(0.0)
+                    for i, name in enumerate(selected):
+                        import_bar.progress(i / len(selected), text=f"Importing '{name}' ({i + 1}/{len(selected)})…")
+                        if name in st.session_state.projects:
+                            if merge_choice != "Overwrite existing":
+                                skipped += 1
+                                continue
+                            overwritten += 1
+                        else:
+                            added += 1
+                        # Projects are decoded one at a time, so only one is held in memory at once.
+                        st.session_state.projects.save(name, bundle.load_project(name), kind="import")
+                    import_bar.progress(1.0, text="Import complete.")
+                    st.success(f"Imported — added: {added}, overwritten: {overwritten}, skipped: {skipped}")
+                    st.rerun()
+            except Exception as e:
+                st.session_state.pop('_import_bundle', None)
+                st.error(f"Import failed: {e}")
+
+
+def _portfolio_tab():
+    st.markdown("### 🧩 Portfolio clustering")
+    st.caption("Segment the rated stakeholders of many projects together, then save each project's share of every "
+               f"segment as '{portfolio.PREFIX}…' subgroups. The open project is updated in your working copy.")
+    projects = st.session_state.projects
+    if not projects:
+        st.info("No projects yet. Save some projects with SAT ratings to cluster them together.")
+        return
+
+    summaries = projects.summaries(nonempty=("relationships",))
+    rated = [row["name"] for row in summaries]
+    if not rated:
+        st.info("None of the projects has SAT ratings yet.")
+        return
+    if st.checkbox(f"All {len(rated)} project(s) with SAT ratings", value=True, key="_portfolio_all"):
+        names = rated
+    else:
+        names = st.multiselect("Projects", rated, key="_portfolio_projects")
+    pc1, pc2 = st.columns(2)
+    with pc1:
+        features = st.multiselect("Features", list(SCORES), default=list(SCORES), key="_portfolio_features")
+    with pc2:
+        k = st.slider("Number of segments", 2, 8, 4, key="_portfolio_k")
+
+    running = jobs.running("_portfolio_result") or jobs.running("_portfolio_save")
+    if st.button("🧩 Cluster the portfolio", type="primary", key="_portfolio_run",
+                 disabled=running or not names or len(features) < 2):
+        current = st.session_state.current_project
+        if current:
+            current = (current, copy.deepcopy(st.session_state.sit_data), copy.deepcopy(st.session_state.sat_data))
+        store = project_store_of(projects)
+        updated = {row["name"]: row["updated"] for row in summaries}
+        key = (store.path if store else id(projects), [(name, updated[name]) for name in names],
+               features, k, fingerprint(current))
+        jobs.start("_portfolio_result", "Portfolio clustering", portfolio.cluster_job, projects, names, k, features,
+                   current=current, previous=st.session_state.get("_portfolio_previous"), key=key)
+
+    if jobs.watch("_portfolio_result"):
+        return
+    result = jobs.result("_portfolio_result")
+    if not result:
+        return
+    frame, segments = result["frame"], result["segments"]
+    # The next run with the same features and k starts from these centroids.
+    st.session_state._portfolio_previous = result["run"]
+    st.caption(f"{frame['project'].nunique()} project(s): {clustering.describe(result['run'])}")
+    table = pd.crosstab(frame['project'], frame['cluster'].map(lambda i: segments[i]['name']))
+    table = table.rename_axis(index="Project", columns="Segment")
+    st.dataframe(table, use_container_width=True)
+    if st.button("✍️ Save the segments to the projects", key="_portfolio_write", disabled=running):
+        project_segments = portfolio.segments(frame, segments)
+        current = st.session_state.current_project
+        st.session_state._portfolio_saved_current = int(current in project_segments)
+        if current in project_segments:
+            portfolio.apply_to_working(project_segments.pop(current))
+        # Never deduplicated: the saved projects may have changed since an identical write.
+        jobs.start("_portfolio_save", "Saving portfolio segments", portfolio.write_job, projects, project_segments)
+
+    if not jobs.watch("_portfolio_save"):
+        changed = jobs.result("_portfolio_save")
+        if changed is not None:
+            jobs.forget("_portfolio_save")
+            jobs.forget("_portfolio_result")
+            changed += st.session_state.pop("_portfolio_saved_current", 0)
+            st.success(f"✅ Saved portfolio segments to {changed} project(s).")
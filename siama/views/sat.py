@@ -0,0 +1,937 @@
+"""SAT - Stakeholder Analysis Toolkit page."""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from siama import clustering, jobs, network, profiling, stakeholders
+from siama.figures import fingerprint, plot_figure
+from siama.fragments import action_button
+from siama.paging import paged
+from siama.ratings import HISTORY, history_frame
+
+# Fragments showing the ratings and subgroups, and everything derived from them.
+_RATING_VIEWS = ("sat.ratings", "sat.matrix", "sat.network", "sat.subgroups", "sat.clusters", "sat.analysis")
+_SUBGROUP_VIEWS = ("sat.subgroups", "sat.network", "sat.clusters", "sat.analysis")
+
+
+def _slider_value(rating, field):
+    value = rating.get(field)
+    return min(10, max(1, int(value))) if isinstance(value, (int, float)) else 5
+
+
+def _edge_coords(values, a, b):
+    # One line per edge, separated by gaps, for a single trace. Small ints as
+    # JSON take less space than plotly's binary encoding of a float array.
+    coords = np.column_stack([values[a], values[b], values[a]]).ravel().tolist()
+    coords[2::3] = [None] * len(a)
+    return coords
+
+
+def _save_clusters(df, run, method):
+    # Subgroups for the clusters in df['cluster'], and the run they came from for placing new ratings.
+    k = run['k']
+    cluster_names = clustering.name_clusters(df, k)
+    for i in range(k):
+        members = df.loc[df['cluster'] == i, 'stakeholder_id'].tolist()
+        full_desc = (f"{cluster_names[i]['description']}\n\nAuto-generated using {method} with "
+                     f"{', '.join(run['features'])}")
+        stakeholders.set_subgroup(cluster_names[i]['name'], full_desc, members)
+    run['subgroups'] = [cluster_names[i]['name'] for i in range(k)]
+    st.session_state.sat_data[clustering.STATE] = run
+    return cluster_names
+
+
+def _kmeans_result(df):
+    # Save the clusters of a finished "Generate Clusters" job, unless the ratings changed meanwhile.
+    if jobs.watch("_sat_kmeans"):
+        return
+    result = jobs.result("_sat_kmeans")
+    if not result:
+        return
+    jobs.forget("_sat_kmeans")
+    labels, run = result
+    X = df[run['features']].values if all(f in df for f in run['features']) else None
+    if X is None or fingerprint((df['stakeholder_id'].tolist(), np.ascontiguousarray(X))) != \
+            st.session_state.pop("_sat_kmeans_data", None):
+        st.warning("⚠️ The ratings changed while the clusters were being generated. Generate them again.")
+        return
+    df['cluster'] = labels
+    _save_clusters(df, dict(run), "K-means clustering")
+    st.success(f"✅ Successfully created {run['k']} subgroups using K-means clustering!")
+    st.rerun()
+
+
+_CONSENSUS_HEATMAP_ROWS = 300
+
+
+def _consensus_section(df, num_clusters, features):
+    with st.expander("🎯 Consensus clustering (cluster stability)"):
+        st.caption("Clusters bootstrap resamples of the ratings and counts how often each pair of stakeholders ends "
+                   "up together. Stakeholders that often switch clusters get a low stability score.")
+        resamples = st.slider("Bootstrap resamples", 20, 200, clustering.CONSENSUS_RESAMPLES, step=10,
+                              key="_sat_consensus_resamples")
+        X = df[features].values
+        key = fingerprint((df['stakeholder_id'].tolist(), np.ascontiguousarray(X), features, num_clusters, resamples))
+        if st.button(f"🎯 Run consensus with {num_clusters} clusters", key="_sat_consensus_run",
+                     disabled=jobs.running("_sat_consensus")):
+            st.session_state._sat_consensus_key = key
+            jobs.start("_sat_consensus", "Consensus clustering", clustering.consensus_job,
+                       X, num_clusters, features, resamples, key=key)
+        if jobs.watch("_sat_consensus"):
+            return
+        result = jobs.result("_sat_consensus")
+        if not result:
+            return
+        if st.session_state.get("_sat_consensus_key") != key:
+            st.caption("The ratings or settings changed since the last consensus run. Run it again to update it.")
+            return
+
+        run = result['run']
+        frame = df.assign(cluster=result['labels'], stability=result['stability'])
+        names = clustering.name_clusters(frame, num_clusters)
+        frame['Consensus cluster'] = frame['cluster'].map(lambda i: names[i]['name'])
+        st.caption(clustering.describe(run))
+        summary = frame.groupby('Consensus cluster')['stability'].agg(Members='size', Stability='mean', Lowest='min')
+        st.dataframe(summary.style.format({'Stability': "{:.0%}", 'Lowest': "{:.0%}"}), use_container_width=True)
+
+        unstable = frame[frame['stability'] < clustering.UNSTABLE].sort_values('stability')
+        if len(unstable):
+            st.markdown(f"**{len(unstable)} unstable stakeholder(s)** (stability under {clustering.UNSTABLE:.0%}):")
+            st.dataframe(unstable[['stakeholder', 'Consensus cluster', 'stability', *features]]
+                         .rename(columns={'stakeholder': 'Stakeholder', 'stability': 'Stability'})
+                         .style.format({'Stability': "{:.0%}"}), use_container_width=True, hide_index=True)
+        else:
+            st.caption(f"Every stakeholder has a stability of {clustering.UNSTABLE:.0%} or more.")
+
+        # Co-assignment of (at most) a few hundred stakeholders, grouped by consensus cluster.
+        order = np.lexsort((-result['stability'], result['labels']))
+        rows = order[np.linspace(0, len(order) - 1, min(len(order), _CONSENSUS_HEATMAP_ROWS)).astype(int)]
+        matrix = clustering.coassignment(result['assignments'], rows)
+
+        def _heatmap():
+            fig = go.Figure(go.Heatmap(z=matrix, zmin=0, zmax=1, colorscale="Blues",
+                                       colorbar=dict(title="Together"), hoverinfo="skip"))
+            fig.update_layout(title=f"Co-assignment across {run['resamples']} resamples"
+                                    + (f" ({len(rows)} of {len(order)} stakeholders)" if len(rows) < len(order) else ""),
+                              height=450, xaxis=dict(visible=False), yaxis=dict(visible=False, autorange="reversed"))
+            return fig
+        plot_figure("sat.consensus", matrix, _heatmap, use_container_width=True)
+
+        if st.button("💾 Save the consensus clusters as subgroups", key="_sat_consensus_save"):
+            _save_clusters(frame, dict(run), f"consensus K-means clustering ({run['resamples']} resamples)")
+            jobs.forget("_sat_consensus")
+            st.success(f"✅ Saved {num_clusters} consensus clusters as subgroups.")
+            st.rerun()
+
+
+def _k_sweep_chart(scores):
+    best, elbow = clustering.best_k(scores), clustering.elbow_k(scores)
+
+    def _chart():
+        ks = [s['k'] for s in scores]
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=ks, y=[s['silhouette'] for s in scores], name="Silhouette (higher is better)",
+                                 mode="lines+markers"))
+        fig.add_trace(go.Scatter(x=ks, y=[s['inertia'] for s in scores], name="Inertia (look for the elbow)",
+                                 mode="lines+markers", yaxis="y2", line=dict(dash="dot")))
+        fig.add_vline(x=best, line_dash="dash", line_color="green", annotation_text=f"best k = {best}")
+        if elbow != best:
+            fig.add_vline(x=elbow, line_dash="dot", line_color="gray", annotation_text=f"elbow k = {elbow}",
+                          annotation_position="bottom right")
+        fig.update_layout(
+            height=320, margin=dict(l=10, r=10, t=30, b=10),
+            xaxis=dict(title="Number of clusters (k)", dtick=1),
+            yaxis=dict(title="Silhouette"),
+            yaxis2=dict(title="Inertia", overlaying="y", side="right", showgrid=False),
+            legend=dict(orientation="h", y=-0.3),
+        )
+        return fig
+    plot_figure("sat.k_sweep", tuple((s['k'], s['inertia'], s['silhouette']) for s in scores), _chart,
+                use_container_width=True)
+    st.caption(f"Best k by silhouette: {best} · elbow of inertia: {elbow} · "
+               f"scored in {sum(s['seconds'] for s in scores):.2f} s of fitting")
+
+
+def _delete_entry(section, key):
+    st.session_state.sat_data[section].pop(key)
+
+
+def _delete_record(section, index):
+    stakeholders.remove_record(section, index)
+
+
+def _delete_subgroup(name):
+    if name and name in st.session_state.sat_data['subgroups']:
+        stakeholders.delete_subgroup(name)
+
+
+def _assign_member(stakeholder_id, subgroup):
+    stakeholder = stakeholders.label_of(stakeholder_id)
+    if stakeholders.assign(stakeholder_id, subgroup):
+        st.session_state._assign_notice = (True, f"✅ {stakeholder} assigned to {subgroup}")
+    else:
+        st.session_state._assign_notice = (False, f"ℹ️ {stakeholder} is already in {subgroup}")
+
+
+def _remove_member(subgroup, member):
+    stakeholders.unassign(subgroup, member)
+
+
+def render():
+    st.markdown('<div class="main-header">SAT - Stakeholder Analysis Toolkit</div>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    SAT evaluates the roles, interests, and influences of identified stakeholders to tailor training programs effectively.
+    """)
+    
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "Step 1: Relationship Matrix",
+        "Step 2: Management Tool",
+        "Step 3: Conflict Resolution",
+        "Step 4: Knowledge & Responsibility",
+        "Step 5: Value Exchange Map"
+    ])
+    
+    with tab1:
+        st.markdown('<p class="step-header">Step 1: Stakeholder Relationship Matrix</p>', unsafe_allow_html=True)
+        st.info("Rate each stakeholder on Power, Interest, Legitimacy, and Urgency.")
+        
+        if st.session_state.sit_data['roles']:
+            # Get all stakeholders
+            all_stakeholders = stakeholders.actor_ids()
+            
+            if all_stakeholders:
+                st.subheader("Rate Stakeholders")
+                
+                selected_stakeholder = st.selectbox("Select Stakeholder to Rate", all_stakeholders,
+                                                    format_func=stakeholders.labels().get)
+                # Start from the current rating, so re-rating edits it rather than starting over.
+                current = stakeholders.rating_of(selected_stakeholder) or {}
+                if current:
+                    st.caption("Already rated: saving replaces the current rating and keeps it in the history.")
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    power = st.slider("Power (ability to influence outcomes)", 1, 10, _slider_value(current, 'power'))
+                    interest = st.slider("Interest (level of concern/stake)", 1, 10, _slider_value(current, 'interest'))
+                
+                with col2:
+                    legitimacy = st.slider("Legitimacy (validity of involvement)", 1, 10, _slider_value(current, 'legitimacy'))
+                    urgency = st.slider("Urgency (immediacy of demands)", 1, 10, _slider_value(current, 'urgency'))
+                
+                st.subheader("Relationship Details")
+                interactions = st.text_area("How do they interact with others?", current.get('interactions', ''))
+                tasks = st.text_area("What tasks do they perform?", current.get('tasks', ''))
+                knowledge = st.text_area("What knowledge/skills do they share?", current.get('knowledge', ''))
+                
+                if st.button("Save Rating"):
+                    record, updated = stakeholders.rate(selected_stakeholder,
+                                                        power=power, interest=interest, legitimacy=legitimacy, urgency=urgency,
+                                                        interactions=interactions, tasks=tasks, knowledge=knowledge)
+                    st.success("✅ Rating updated! The previous one is kept in the history." if updated else "✅ Rating saved!")
+                    placed = clustering.place(record)
+                    if placed:
+                        st.info(f"Placed in the nearest cluster: {placed}")
+                
+                # Display existing ratings
+                @st.fragment(key="sat.ratings")
+                def _ratings_view():
+                    if 'relationship_data' in st.session_state.sat_data and st.session_state.sat_data['relationship_data']:
+                        st.subheader("Current Ratings")
+                        df = profiling.timed("dataframe: sat.ratings_table", stakeholders.ratings().frame, text=True)
+                        st.dataframe(df.drop(columns='stakeholder_id'), use_container_width=True)
+
+                        with st.expander("🗑️ Manage rating entries"):
+                            for idx, r in paged(st.session_state.sat_data['relationship_data'], "_sat_rating_list",
+                                                text=lambda r: str(r.get('stakeholder', '')),
+                                                sorts={"Stakeholder": lambda r: str(r.get('stakeholder', '')).lower(),
+                                                       "Power": lambda r: r.get('power', 0),
+                                                       "Interest": lambda r: r.get('interest', 0)}):
+                                c1, c2 = st.columns([5, 1])
+                                with c1:
+                                    st.write(f"**{idx+1}.** {r.get('stakeholder','?')} — "
+                                             f"P:{r.get('power','-')}, I:{r.get('interest','-')}, "
+                                             f"L:{r.get('legitimacy','-')}, U:{r.get('urgency','-')}")
+                                with c2:
+                                    action_button("🗑️ Delete", _delete_record, args=('relationship_data', idx), key=f"del_sat_rat_{idx}",
+                                                  help="Deletes this rating and its history",
+                                                  views=_RATING_VIEWS if len(st.session_state.sat_data['relationship_data']) > 1 else None)
+
+                        rerated = [r['stakeholder_id'] for r in st.session_state.sat_data['relationship_data'] if r.get(HISTORY)]
+                        if rerated:
+                            with st.expander(f"🕓 Rating history ({len(rerated)} re-rated)"):
+                                sid = st.selectbox("Stakeholder", rerated, format_func=stakeholders.labels().get,
+                                                   key="_sat_history_stakeholder")
+                                history = history_frame([stakeholders.rating_of(sid)])
+                                st.dataframe(history.drop(columns=['stakeholder', 'stakeholder_id']),
+                                             use_container_width=True, hide_index=True)
+                _ratings_view()
+        else:
+            st.warning("⚠️ Please complete SIT first to identify stakeholders.")
+    
+    with tab2:
+        st.markdown('<p class="step-header">Step 2: Stakeholder Management Tool</p>', unsafe_allow_html=True)
+        st.info("Visualize stakeholders on Power vs Interest, Power vs Legitimacy, and Power vs Urgency. Create subgroups for detailed analysis.")
+
+        if 'relationship_data' in st.session_state.sat_data and st.session_state.sat_data['relationship_data']:
+            # Add tabs for main analysis and subgroup creation
+            subtab1, subtab2 = st.tabs(["📊 Stakeholder Analysis", "👥 Subgroup Management"])
+
+            with subtab1:
+                @st.fragment(key="sat.matrix")
+                def _matrix_view():
+                    table = stakeholders.ratings()
+                    df = profiling.timed("dataframe: sat.matrix", table.frame)
+
+                    chart_type = st.selectbox("Select Comparison",
+                                             ["Power vs Interest", "Power vs Legitimacy", "Power vs Urgency"])
+
+                    def _matrix():
+                        if chart_type == "Power vs Interest":
+                            fig = px.scatter(df, x='power', y='interest',
+                                           text='stakeholder',
+                                           title='Power vs Interest Matrix')
+                        elif chart_type == "Power vs Legitimacy":
+                            fig = px.scatter(df, x='power', y='legitimacy',
+                                           text='stakeholder',
+                                           title='Power vs Legitimacy Matrix')
+                        else:
+                            fig = px.scatter(df, x='power', y='urgency',
+                                           text='stakeholder',
+                                           title='Power vs Urgency Matrix')
+
+                        fig.update_traces(textposition='top center')
+                        fig.update_layout(height=500)
+
+                        # Add quadrant lines
+                        fig.add_hline(y=5, line_dash="dash", line_color="gray")
+                        fig.add_vline(x=5, line_dash="dash", line_color="gray")
+                        return fig
+
+                    plot_figure("sat.matrix", (chart_type, table.token), _matrix, use_container_width=True)
+                _matrix_view()
+
+                # Strategy recommendations
+                st.subheader("Management Strategies")
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.markdown("""
+                    **High Power, High Interest:**
+                    - Manage Closely
+                    - Key Players
+                    """)
+                    st.markdown("""
+                    **High Power, Low Interest:**
+                    - Keep Satisfied
+                    - Important but passive
+                    """)
+
+                with col2:
+                    st.markdown("""
+                    **Low Power, High Interest:**
+                    - Keep Informed
+                    - Show consideration
+                    """)
+                    st.markdown("""
+                    **Low Power, Low Interest:**
+                    - Monitor
+                    - Minimal effort
+                    """)
+
+                # Stakeholder network graph
+                @st.fragment(key="sat.network")
+                def _network_view():
+                    st.markdown("---")
+                    st.subheader("🕸️ Stakeholder Network")
+                    st.caption("Nodes positioned by Power × Interest, sized by Power, colored by Interest. Edges connect stakeholders who share a subgroup.")
+
+                    table = stakeholders.ratings()
+                    if len(table):
+                        memberships = {name: tuple(sg.get('members', ()))
+                                       for name, sg in st.session_state.sat_data.get('subgroups', {}).items()}
+
+                        def _network():
+                            rdata = table.frame()
+                            names = rdata['stakeholder'].astype(str).tolist()
+                            xs = rdata['power'].to_numpy()
+                            ys = rdata['interest'].to_numpy()
+                            positions = {sid: i for i, sid in enumerate(rdata['stakeholder_id'].tolist())}
+                            a, b, hubs = network.shared_edges(memberships, positions, xs)
+
+                            net = go.Figure()
+                            if len(a):
+                                net.add_trace(go.Scattergl(
+                                    x=_edge_coords(xs, a, b), y=_edge_coords(ys, a, b),
+                                    mode="lines",
+                                    line=dict(width=1, color="rgba(100,100,100,0.35)"),
+                                    hoverinfo="skip", showlegend=False,
+                                ))
+                            # Node sizes: scale power 1-10 → 12-48 px
+                            sizes = 12 + xs * 3.6
+                            net.add_trace(go.Scattergl(
+                                x=xs, y=ys, mode="markers+text",
+                                text=names, textposition="top center",
+                                marker=dict(
+                                    size=sizes, color=ys, colorscale="Viridis",
+                                    cmin=1, cmax=10, showscale=True,
+                                    colorbar=dict(title="Interest"),
+                                    line=dict(width=1, color="white"),
+                                ),
+                                hovertemplate="<b>%{text}</b><br>Power: %{x}<br>Interest: %{y}<extra></extra>",
+                                showlegend=False,
+                            ))
+                            net.add_hline(y=5, line_dash="dash", line_color="lightgray")
+                            net.add_vline(x=5, line_dash="dash", line_color="lightgray")
+                            title = f"{len(names)} stakeholders · {len(a)} shared-subgroup edge(s)"
+                            if hubs:
+                                title += f" · {len(hubs)} large subgroup(s) drawn around their highest-power member"
+                            net.update_layout(
+                                height=560,
+                                xaxis=dict(title="Power", range=[0, 11], zeroline=False),
+                                yaxis=dict(title="Interest", range=[0, 11], zeroline=False),
+                                margin=dict(l=10, r=10, t=30, b=10),
+                                title=title,
+                            )
+                            return net
+                        plot_figure("sat.network", (table.token, memberships), _network, use_container_width=True)
+                        if not any(len(members) > 1 for members in memberships.values()):
+                            st.info("No subgroup connections yet — create subgroups in the next tab to see relationship edges.")
+                _network_view()
+
+            with subtab2:
+                st.subheader("Create and Manage Stakeholder Subgroups")
+                st.info("Organize stakeholders into subgroups for targeted analysis and strategy development.")
+
+                # Initialize subgroup data if not exists
+                if 'subgroups' not in st.session_state.sat_data:
+                    st.session_state.sat_data['subgroups'] = {}
+
+                # Add clustering option
+                clustering_tabs = st.tabs(["📝 Manual Grouping", "🤖 Automatic Clustering"])
+
+                with clustering_tabs[0]:
+                    st.markdown("### Manual Subgroup Creation")
+
+                    # Section 1: Create/Manage Subgroups
+                    col1, col2 = st.columns([2, 1])
+
+                    with col1:
+                        st.markdown("#### Define Subgroups")
+                        subgroup_name = st.text_input("Subgroup Name", placeholder="e.g., Local Artisans, Urban Buyers, etc.")
+                        subgroup_description = st.text_area("Description", placeholder="Describe the purpose of this subgroup")
+
+                    with col2:
+                        st.markdown("#### Actions")
+                        if st.button("➕ Add Subgroup", use_container_width=True):
+                            if subgroup_name:
+                                if subgroup_name not in st.session_state.sat_data['subgroups']:
+                                    st.session_state.sat_data['subgroups'][subgroup_name] = {
+                                        'description': subgroup_description,
+                                        'members': []
+                                    }
+                                    st.success(f"✅ Subgroup '{subgroup_name}' created!")
+                                else:
+                                    st.warning("⚠️ Subgroup already exists!")
+                            else:
+                                st.error("Please enter a subgroup name")
+
+                    # Display existing subgroups
+                    @st.fragment(key="sat.subgroups")
+                    def _subgroups_view():
+                        if st.session_state.sat_data['subgroups']:
+                            st.markdown("---")
+                            st.markdown("#### Existing Subgroups")
+
+                            subgroups_df = pd.DataFrame([
+                                {
+                                    'Subgroup': name,
+                                    'Description': data['description'],
+                                    'Members': len(data['members'])
+                                }
+                                for name, data in st.session_state.sat_data['subgroups'].items()
+                            ])
+                            st.dataframe(subgroups_df, use_container_width=True)
+
+                            with st.expander("🗑️ Delete a subgroup"):
+                                sg_names = list(st.session_state.sat_data['subgroups'].keys())
+                                sg_to_delete = st.selectbox("Select subgroup to delete", sg_names, key="_sg_del_sel")
+                                action_button("🗑️ Delete selected subgroup", _delete_subgroup, args=(sg_to_delete,),
+                                              views=_SUBGROUP_VIEWS, key="_sg_del_btn")
+
+                        # Section 2: Assign Stakeholders to Subgroups
+                        st.markdown("---")
+                        st.markdown("#### Assign Stakeholders to Subgroups")
+
+                        if st.session_state.sat_data['subgroups']:
+                            col1, col2 = st.columns(2)
+
+                            with col1:
+                                rated = list(dict.fromkeys(item['stakeholder_id']
+                                                           for item in st.session_state.sat_data['relationship_data']))
+                                selected_stakeholder = st.selectbox("Select Stakeholder", rated,
+                                                                    format_func=stakeholders.labels().get)
+
+                            with col2:
+                                subgroup_options = list(st.session_state.sat_data['subgroups'].keys())
+                                selected_subgroup = st.selectbox("Assign to Subgroup", subgroup_options)
+
+                            action_button("Assign Stakeholder to Subgroup", _assign_member,
+                                          args=(selected_stakeholder, selected_subgroup), views=_SUBGROUP_VIEWS)
+                            # Callbacks must not draw elements during a fragment rerun; show the outcome here.
+                            notice = st.session_state.pop('_assign_notice', None)
+                            if notice:
+                                (st.success if notice[0] else st.info)(notice[1])
+
+                            # Display current assignments
+                            st.markdown("---")
+                            st.markdown("#### Current Assignments")
+
+                            labels = stakeholders.labels()
+                            for subgroup_name, subgroup_data in st.session_state.sat_data['subgroups'].items():
+                                if subgroup_data['members']:
+                                    with st.expander(f"📁 {subgroup_name} ({len(subgroup_data['members'])} members)"):
+                                        for _, member in paged(subgroup_data['members'], f"_sat_member_list_{subgroup_name}",
+                                                               text=labels.__getitem__,
+                                                               sorts={"Name": lambda m: labels[m].lower()}):
+                                            col1, col2 = st.columns([3, 1])
+                                            with col1:
+                                                st.write(f"• {labels[member]}")
+                                            with col2:
+                                                action_button("Remove", _remove_member, args=(subgroup_name, member),
+                                                              views=_SUBGROUP_VIEWS, key=f"remove_{subgroup_name}_{member}")
+                    _subgroups_view()
+
+                with clustering_tabs[1]:
+                    st.markdown("### Automatic K-Means Clustering")
+                    st.info("Use machine learning to automatically group stakeholders based on their Power, Interest, Legitimacy, and Urgency ratings.")
+
+                    # Get stakeholder data
+                    df = profiling.timed("dataframe: sat.clustering", stakeholders.ratings().frame)
+
+                    col1, col2 = st.columns(2)
+
+                    with col2:
+                        features_to_use = st.multiselect(
+                            "Features for Clustering",
+                            ["power", "interest", "legitimacy", "urgency"],
+                            default=["power", "interest", "legitimacy", "urgency"]
+                        )
+
+                    with col1:
+                        max_clusters = min(8, len(df))
+                        sweep = None
+                        if max_clusters > 2 and len(df) > 3 and len(features_to_use) >= 2:
+                            if st.checkbox("🔎 Choose the number of clusters automatically", key="_sat_auto_k",
+                                           help=f"Scores every k from 2 to {min(max_clusters, len(df) - 1)} by silhouette and inertia"):
+                                ks = list(range(2, min(max_clusters, len(df) - 1) + 1))
+                                X = df[features_to_use].values
+                                key = fingerprint((np.ascontiguousarray(X), features_to_use, ks))
+                                # Started once per input; after a cancel, untick and tick again to retry.
+                                if st.session_state.get("_sat_k_sweep_key") != key:
+                                    st.session_state._sat_k_sweep_key = key
+                                    jobs.start("_sat_k_sweep", "Scoring cluster counts", clustering.sweep_job,
+                                               X, ks, key=key)
+                                if not jobs.watch("_sat_k_sweep"):
+                                    sweep = jobs.result("_sat_k_sweep")
+                            else:
+                                st.session_state.pop("_sat_k_sweep_key", None)
+                        num_clusters = st.slider("Number of Clusters", min_value=2, max_value=max_clusters,
+                                                 value=clustering.best_k(sweep) if sweep else 3)
+                        st.caption(f"Split {len(df)} stakeholders into {num_clusters} groups")
+
+                    if sweep:
+                        _k_sweep_chart(sweep)
+
+                    cluster_naming = st.selectbox(
+                        "Cluster Naming Strategy",
+                        ["Automatic (based on characteristics)", "Custom (manual naming)"]
+                    )
+
+                    if st.button("🤖 Generate Clusters", type="primary", use_container_width=True,
+                                 disabled=jobs.running("_sat_kmeans")):
+                        if len(features_to_use) < 2:
+                            st.error("Please select at least 2 features for clustering")
+                        else:
+                            X = df[features_to_use].values
+                            last = st.session_state.sat_data.get(clustering.STATE) or {}
+                            previous = {f: last[f] for f in ('features', 'k', 'centers') if f in last} or None
+                            data = fingerprint((df['stakeholder_id'].tolist(), np.ascontiguousarray(X)))
+                            st.session_state._sat_kmeans_data = data
+                            jobs.start("_sat_kmeans", "K-means clustering", clustering.cluster_job,
+                                       X, num_clusters, features_to_use, previous,
+                                       key=fingerprint((data, features_to_use, num_clusters, previous)))
+                    _kmeans_result(df)
+
+                    if len(features_to_use) >= 2 and len(df) > num_clusters:
+                        _consensus_section(df, num_clusters, features_to_use)
+
+                    last_run = st.session_state.sat_data.get(clustering.STATE)
+                    if last_run:
+                        st.caption(f"Last run: {clustering.describe(last_run)}")
+                        if all(feature in df for feature in last_run['features']):
+                            drift = clustering.drift(last_run, df[last_run['features']].values)
+                            if drift and drift['refit']:
+                                st.warning(f"⚠️ The clusters have drifted from the ratings (spread ×{drift['ratio']:.2f} "
+                                           f"since the fit, {drift['placed']:.0%} re-placed). Generate the clusters again "
+                                           "to refit them.")
+                            elif drift:
+                                st.caption(f"New and changed ratings are placed in the nearest cluster. Drift since the fit: "
+                                           f"spread ×{drift['ratio']:.2f}, {drift['placed']:.0%} re-placed.")
+
+                    # Display clustering visualization if clusters exist
+                    @st.fragment(key="sat.clusters")
+                    def _clusters_view():
+                        if 'subgroups' in st.session_state.sat_data and st.session_state.sat_data['subgroups']:
+                            st.markdown("---")
+                            st.markdown("#### Clustering Visualization")
+
+                            # Check if we have cluster assignments
+                            table = stakeholders.ratings()
+                            df_viz = profiling.timed("dataframe: sat.clusters", table.frame)
+                            version = (table.token, stakeholders.assignments_token())
+                            df_viz['Subgroup'] = df_viz['stakeholder_id'].map(stakeholders.assignments())
+
+                            if not df_viz['Subgroup'].isna().all():
+                                # 3D scatter plot
+                                st.markdown("##### 3D Cluster Visualization")
+
+                                def _clusters_3d():
+                                    fig = px.scatter_3d(
+                                        df_viz,
+                                        x='power',
+                                        y='interest',
+                                        z='legitimacy',
+                                        color='Subgroup',
+                                        hover_data=['stakeholder', 'urgency'],
+                                        title='Stakeholder Clusters in 3D Space',
+                                        labels={'power': 'Power', 'interest': 'Interest', 'legitimacy': 'Legitimacy'}
+                                    )
+                                    fig.update_layout(height=600)
+                                    return fig
+                                plot_figure("sat.clusters_3d", version, _clusters_3d, use_container_width=True)
+
+                                # 2D projections
+                                st.markdown("##### 2D Cluster Projections")
+
+                                col1, col2 = st.columns(2)
+
+                                with col1:
+                                    def _power_interest():
+                                        fig1 = px.scatter(
+                                            df_viz,
+                                            x='power',
+                                            y='interest',
+                                            color='Subgroup',
+                                            hover_data=['stakeholder'],
+                                            title='Power vs Interest'
+                                        )
+                                        fig1.add_hline(y=5, line_dash="dash", line_color="gray", opacity=0.5)
+                                        fig1.add_vline(x=5, line_dash="dash", line_color="gray", opacity=0.5)
+                                        return fig1
+                                    plot_figure("sat.clusters_pi", version, _power_interest, use_container_width=True)
+
+                                with col2:
+                                    def _legitimacy_urgency():
+                                        fig2 = px.scatter(
+                                            df_viz,
+                                            x='legitimacy',
+                                            y='urgency',
+                                            color='Subgroup',
+                                            hover_data=['stakeholder'],
+                                            title='Legitimacy vs Urgency'
+                                        )
+                                        fig2.add_hline(y=5, line_dash="dash", line_color="gray", opacity=0.5)
+                                        fig2.add_vline(x=5, line_dash="dash", line_color="gray", opacity=0.5)
+                                        return fig2
+                                    plot_figure("sat.clusters_lu", version, _legitimacy_urgency, use_container_width=True)
+
+                                # Cluster statistics
+                                st.markdown("##### Cluster Statistics")
+
+                                cluster_stats = []
+                                for subgroup_name, subgroup_data in st.session_state.sat_data['subgroups'].items():
+                                    if subgroup_data['members']:
+                                        members_df = df_viz[df_viz['stakeholder_id'].isin(subgroup_data['members'])]
+                                        cluster_stats.append({
+                                            'Subgroup': subgroup_name,
+                                            'Count': len(subgroup_data['members']),
+                                            'Avg Power': f"{members_df['power'].mean():.2f}",
+                                            'Avg Interest': f"{members_df['interest'].mean():.2f}",
+                                            'Avg Legitimacy': f"{members_df['legitimacy'].mean():.2f}",
+                                            'Avg Urgency': f"{members_df['urgency'].mean():.2f}"
+                                        })
+
+                                if cluster_stats:
+                                    stats_df = pd.DataFrame(cluster_stats)
+                                    st.dataframe(stats_df, use_container_width=True)
+                    _clusters_view()
+
+                # Section 3: Subgroup Analysis (common for both manual and automatic)
+                @st.fragment(key="sat.analysis")
+                def _analysis_view():
+                    st.markdown("---")
+                    st.markdown("### Subgroup Analysis")
+
+                    if st.session_state.sat_data['subgroups']:
+                        if any(data['members'] for data in st.session_state.sat_data['subgroups'].values()):
+                            analysis_subgroup = st.selectbox(
+                                "Select Subgroup to Analyze",
+                                [name for name, data in st.session_state.sat_data['subgroups'].items() if data['members']]
+                            )
+
+                            if analysis_subgroup:
+                                members = st.session_state.sat_data['subgroups'][analysis_subgroup]['members']
+
+                                # Get ratings for subgroup members
+                                df = profiling.timed("dataframe: sat.analysis", stakeholders.ratings().frame)
+                                subgroup_df = df[df['stakeholder_id'].isin(members)]
+
+                                if not subgroup_df.empty:
+                                    # Calculate aggregated metrics
+                                    col1, col2, col3, col4 = st.columns(4)
+
+                                    with col1:
+                                        avg_power = subgroup_df['power'].mean()
+                                        st.metric("Avg Power", f"{avg_power:.1f}")
+
+                                    with col2:
+                                        avg_interest = subgroup_df['interest'].mean()
+                                        st.metric("Avg Interest", f"{avg_interest:.1f}")
+
+                                    with col3:
+                                        avg_legitimacy = subgroup_df['legitimacy'].mean()
+                                        st.metric("Avg Legitimacy", f"{avg_legitimacy:.1f}")
+
+                                    with col4:
+                                        avg_urgency = subgroup_df['urgency'].mean()
+                                        st.metric("Avg Urgency", f"{avg_urgency:.1f}")
+
+                                    # Radar chart for subgroup profile
+                                    st.markdown("##### Subgroup Profile")
+
+                                    categories = ['Power', 'Interest', 'Legitimacy', 'Urgency']
+                                    values = [avg_power, avg_interest, avg_legitimacy, avg_urgency]
+
+                                    def _profile_radar():
+                                        fig = go.Figure()
+
+                                        fig.add_trace(go.Scatterpolar(
+                                            r=values,
+                                            theta=categories,
+                                            fill='toself',
+                                            name=analysis_subgroup
+                                        ))
+
+                                        fig.update_layout(
+                                            polar=dict(
+                                                radialaxis=dict(
+                                                    visible=True,
+                                                    range=[0, 10]
+                                                )),
+                                            showlegend=True,
+                                            title=f"{analysis_subgroup} - Average Ratings Profile"
+                                        )
+                                        return fig
+
+                                    plot_figure("sat.profile", (analysis_subgroup, values), _profile_radar, use_container_width=True)
+
+                                    # Detailed member ratings
+                                    st.markdown("##### Member Details")
+                                    st.dataframe(
+                                        subgroup_df[['stakeholder', 'power', 'interest', 'legitimacy', 'urgency']],
+                                        use_container_width=True
+                                    )
+
+                                    # Strategic recommendations
+                                    st.markdown("##### Strategic Recommendations")
+
+                                    # Determine strategy based on average scores
+                                    if avg_power > 5 and avg_interest > 5:
+                                        strategy = "**Manage Closely** - This is a key stakeholder group requiring active engagement and regular communication."
+                                    elif avg_power > 5 and avg_interest <= 5:
+                                        strategy = "**Keep Satisfied** - Maintain satisfaction with this influential group while monitoring their interest levels."
+                                    elif avg_power <= 5 and avg_interest > 5:
+                                        strategy = "**Keep Informed** - Regular updates and information sharing will maintain their support and engagement."
+                                    else:
+                                        strategy = "**Monitor** - Basic monitoring is sufficient, but stay alert to changes in their position."
+
+                                    st.info(strategy)
+                    else:
+                        st.warning("⚠️ Please create at least one subgroup first.")
+                _analysis_view()
+        else:
+            st.warning("⚠️ Please complete Step 1 to rate stakeholders.")
+    
+    with tab3:
+        st.markdown('<p class="step-header">Step 3: Conflict Resolution Strategy</p>', unsafe_allow_html=True)
+        st.info("Identify conflict resolution approaches based on cooperativeness vs competition.")
+        
+        if 'relationship_data' in st.session_state.sat_data and st.session_state.sat_data['relationship_data']:
+            st.subheader("Identify Stakeholder Conflicts")
+            
+            rated = list(dict.fromkeys(item['stakeholder_id'] for item in st.session_state.sat_data['relationship_data']))
+            
+            selected_sh = st.selectbox("Select Stakeholder for Conflict Analysis", rated,
+                                       format_func=stakeholders.labels().get)
+            
+            cooperativeness = st.slider("Cooperativeness Level", 1, 10, 5)
+            competitiveness = st.slider("Competitiveness Level", 1, 10, 5)
+            
+            conflict_description = st.text_area("Describe potential conflicts")
+            
+            if st.button("Add Conflict Strategy"):
+                stakeholders.add_record('conflict_data', selected_sh, cooperativeness=cooperativeness,
+                                        competitiveness=competitiveness, description=conflict_description)
+                st.success("✅ Conflict strategy added!")
+            
+            # Show conflict matrix
+            @st.fragment(key="sat.conflicts")
+            def _conflicts_view():
+                if 'conflict_data' in st.session_state.sat_data and st.session_state.sat_data['conflict_data']:
+                    df_conflict = profiling.timed("dataframe: sat.conflicts", pd.DataFrame, st.session_state.sat_data['conflict_data'])
+
+                    with st.expander("🗑️ Manage conflict entries"):
+                        for idx, c in enumerate(list(st.session_state.sat_data['conflict_data'])):
+                            cc1, cc2 = st.columns([5, 1])
+                            with cc1:
+                                st.write(f"**{idx+1}.** {c.get('stakeholder','?')} — "
+                                         f"coop:{c.get('cooperativeness','-')}, "
+                                         f"comp:{c.get('competitiveness','-')}")
+                            with cc2:
+                                action_button("🗑️ Delete", _delete_record, args=('conflict_data', idx),
+                                              views=("sat.conflicts",), key=f"del_conflict_{idx}")
+
+                    def _conflict_matrix():
+                        fig = px.scatter(df_conflict, x='competitiveness', y='cooperativeness',
+                                       text='stakeholder',
+                                       title='Conflict Resolution Matrix')
+                        fig.update_traces(textposition='top center')
+                        fig.add_hline(y=5, line_dash="dash", line_color="gray")
+                        fig.add_vline(x=5, line_dash="dash", line_color="gray")
+                        return fig
+                    plotted = [(c.get('competitiveness'), c.get('cooperativeness'), c.get('stakeholder'))
+                               for c in st.session_state.sat_data['conflict_data']]
+                    plot_figure("sat.conflicts", plotted, _conflict_matrix, use_container_width=True)
+                
+                    st.markdown("""
+                    **Strategies:**
+                    - **High Cooperativeness, Low Competition:** Accommodation
+                    - **High Cooperativeness, High Competition:** Collaboration
+                    - **Low Cooperativeness, Low Competition:** Avoidance
+                    - **Low Cooperativeness, High Competition:** Competition
+                    - **Moderate Both:** Compromise
+                    """)
+            _conflicts_view()
+        else:
+            st.warning("⚠️ Please complete Step 1 first.")
+    
+    with tab4:
+        st.markdown('<p class="step-header">Step 4: Knowledge and Responsibility Chart</p>', unsafe_allow_html=True)
+        st.info("Map knowledge, skills, and responsibilities for each stakeholder group.")
+        
+        if 'relationship_data' in st.session_state.sat_data and st.session_state.sat_data['relationship_data']:
+            st.subheader("Define Knowledge and Responsibilities")
+            
+            stakeholder_groups = st.multiselect(
+                "Select Stakeholder Group",
+                ["Key Players", "Keep Satisfied", "Keep Informed", "Monitor"],
+                default=["Key Players"]
+            )
+            
+            for group in stakeholder_groups:
+                with st.expander(f"📚 {group}"):
+                    knowledge_areas = st.text_area(f"Knowledge Areas for {group}", key=f"know_{group}")
+                    responsibilities = st.text_area(f"Responsibilities for {group}", key=f"resp_{group}")
+                    skills_needed = st.text_area(f"Skills Needed for {group}", key=f"skill_{group}")
+                    
+                    if st.button(f"Save {group} Data", key=f"btn_{group}"):
+                        if 'knowledge_data' not in st.session_state.sat_data:
+                            st.session_state.sat_data['knowledge_data'] = {}
+                        
+                        st.session_state.sat_data['knowledge_data'][group] = {
+                            'knowledge': knowledge_areas,
+                            'responsibilities': responsibilities,
+                            'skills': skills_needed
+                        }
+                        st.success(f"✅ Data saved for {group}")
+            
+            # Display summary
+            @st.fragment(key="sat.knowledge")
+            def _knowledge_view():
+                if 'knowledge_data' in st.session_state.sat_data:
+                    st.subheader("Knowledge & Responsibility Summary")
+                    for group in list(st.session_state.sat_data['knowledge_data'].keys()):
+                        data = st.session_state.sat_data['knowledge_data'][group]
+                        c1, c2 = st.columns([6, 1])
+                        with c1:
+                            st.markdown(f"**{group}:**")
+                            st.write(f"- Knowledge: {data['knowledge']}")
+                            st.write(f"- Responsibilities: {data['responsibilities']}")
+                            st.write(f"- Skills: {data['skills']}")
+                        with c2:
+                            action_button("🗑️", _delete_entry, args=('knowledge_data', group), views=("sat.knowledge",),
+                                          key=f"del_knowledge_{group}", help=f"Delete {group} entry")
+            _knowledge_view()
+        else:
+            st.warning("⚠️ Please complete Step 1 first.")
+    
+    with tab5:
+        st.markdown('<p class="step-header">Step 5: Value Exchange Map</p>', unsafe_allow_html=True)
+        st.info("Identify pains, gains, and strategies for training-related product-service systems.")
+        
+        if 'relationship_data' in st.session_state.sat_data and st.session_state.sat_data['relationship_data']:
+            st.subheader("Value Proposition Canvas")
+            
+            stakeholder = st.selectbox(
+                "Select Stakeholder for Value Mapping",
+                list(dict.fromkeys(item['stakeholder_id'] for item in st.session_state.sat_data['relationship_data'])),
+                format_func=stakeholders.labels().get
+            )
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("### Customer Profile")
+                pains = st.text_area("Pains (problems, challenges)")
+                gains = st.text_area("Gains (desired outcomes, benefits)")
+                jobs_to_be_done = st.text_area("Jobs to be Done")
+            
+            with col2:
+                st.markdown("### Value Map")
+                pain_relievers = st.text_area("Pain Relievers (how training helps)")
+                gain_creators = st.text_area("Gain Creators (benefits provided)")
+                products_services = st.text_area("Training Products & Services")
+            
+            if st.button("Save Value Map"):
+                stakeholders.add_record('value_map', stakeholder, pains=pains, gains=gains, jobs=jobs_to_be_done,
+                                        pain_relievers=pain_relievers, gain_creators=gain_creators,
+                                        products_services=products_services)
+                st.success("✅ Value map saved!")
+            
+            # Display existing value maps
+            @st.fragment(key="sat.value_maps")
+            def _value_maps_view():
+                if 'value_map' in st.session_state.sat_data and st.session_state.sat_data['value_map']:
+                    st.subheader("Saved Value Maps")
+                    for vm_idx, vm in enumerate(list(st.session_state.sat_data['value_map'])):
+                        with st.expander(f"📊 {vm['stakeholder']}"):
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                st.markdown("**Customer Profile:**")
+                                st.write(f"Pains: {vm['pains']}")
+                                st.write(f"Gains: {vm['gains']}")
+                                st.write(f"Jobs: {vm['jobs']}")
+                            with col2:
+                                st.markdown("**Value Map:**")
+                                st.write(f"Pain Relievers: {vm['pain_relievers']}")
+                                st.write(f"Gain Creators: {vm['gain_creators']}")
+                                st.write(f"Products/Services: {vm['products_services']}")
+                            action_button("🗑️ Delete this value map", _delete_record, args=('value_map', vm_idx),
+                                          views=("sat.value_maps",), key=f"del_vm_{vm_idx}")
+            _value_maps_view()
+        else:
+            st.warning("⚠️ Please complete Step 1 first.")
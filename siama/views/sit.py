@@ -0,0 +1,325 @@
+"""SIT - Stakeholder Identification Toolkit page."""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from datetime import datetime
+
+from siama import profiling, stakeholders
+from siama.figures import plot_figure
+from siama.fragments import action_button
+from siama.paging import paged
+
+# Fragments showing each list, and the charts derived from it.
+_STAKEHOLDER_VIEWS = ("sit.stakeholders",)
+_ROLE_VIEWS = ("sit.roles", "sit.role_map")
+
+
+def _delete_stakeholder(index):
+    st.session_state.sit_data['stakeholders'].pop(index)
+
+
+def _delete_actor(actor_id):
+    stakeholders.delete_actor(actor_id)
+
+
+def _delete_role(role):
+    stakeholders.delete_role(role)
+
+
+def _rename_actor(role):
+    actor_id = st.session_state.get(f"_rename_actor_{role}")
+    name = (st.session_state.get(f"_rename_name_{role}") or "").strip()
+    if actor_id is not None and name:
+        stakeholders.rename_actor(actor_id, name)
+
+
+def render():
+    st.markdown('<div class="main-header">SIT - Stakeholder Identification Toolkit</div>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    SIT helps understand a craft's value chain by recognizing all individuals, groups, and organizations 
+    that have a direct or indirect impact on it.
+    """)
+    
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "Step 1: Predefined Roles & Questionnaires",
+        "Step 2: Role × Actor Database",
+        "Step 3: Role Card",
+        "Step 4: Role Map"
+    ])
+    
+    with tab1:
+        st.markdown('<p class="step-header">Step 1: Predefined Roles and Questionnaires</p>', unsafe_allow_html=True)
+        st.info("This tool provides predefined roles relevant to craft supply chains with structured questionnaires.")
+        
+        roles = ["Supplier", "Producer", "Refiner", "Marketer", "Buyer"]
+        
+        selected_role = st.selectbox("Select Role to Interview", roles)
+        
+        st.subheader(f"Primary Questionnaire for {selected_role}")
+        
+        questionnaires = {
+            "Supplier": [
+                "Who provides the raw materials?",
+                "Where do they source materials from?",
+                "What is their relationship with producers?"
+            ],
+            "Producer": [
+                "Who creates the craft products?",
+                "What skills do they possess?",
+                "How long have they been practicing?"
+            ],
+            "Refiner": [
+                "Who adds value to the basic product?",
+                "What refinement processes are used?",
+                "What expertise do they bring?"
+            ],
+            "Marketer": [
+                "Who promotes the products?",
+                "What channels do they use?",
+                "What is their reach?"
+            ],
+            "Buyer": [
+                "Who are the end consumers?",
+                "What are their preferences?",
+                "What price points do they prefer?"
+            ]
+        }
+        
+        responses = {}
+        for q in questionnaires[selected_role]:
+            responses[q] = st.text_area(q, key=f"q_{selected_role}_{q}")
+        
+        st.subheader("Secondary Questionnaire (Deep Dive)")
+        secondary_questions = [
+            "How frequently do they interact?",
+            "What are the payment terms?",
+            "Are there any challenges in this relationship?"
+        ]
+        
+        for sq in secondary_questions:
+            responses[sq] = st.text_area(sq, key=f"sq_{selected_role}_{sq}")
+        
+        if st.button("Save Stakeholder Data"):
+            stakeholder_entry = {
+                "role": selected_role,
+                "responses": responses,
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            st.session_state.sit_data['stakeholders'].append(stakeholder_entry)
+            st.success(f"✅ Data saved for {selected_role}")
+    
+    with tab2:
+        st.markdown('<p class="step-header">Step 2: Role × Actor Database</p>', unsafe_allow_html=True)
+        st.info("Record structured information about identified stakeholders.")
+        
+        if len(st.session_state.sit_data['stakeholders']) > 0:
+            # Create a dataframe from stakeholders
+            @st.fragment(key="sit.stakeholders")
+            def _stakeholders_view():
+                data_for_df = []
+                for s in st.session_state.sit_data['stakeholders']:
+                    row = {"Role": s['role'], "Timestamp": s['timestamp']}
+                    for q, a in s['responses'].items():
+                        row[q[:30]] = a[:50] if a else ""
+                    data_for_df.append(row)
+
+                df = profiling.timed("dataframe: sit.stakeholders", pd.DataFrame, data_for_df)
+                st.dataframe(df, use_container_width=True)
+
+                with st.expander("🗑️ Manage stakeholder entries"):
+                    for idx, s in paged(st.session_state.sit_data['stakeholders'], "_sit_stakeholder_list",
+                                        text=lambda s: f"{s['role']} {s['timestamp']}",
+                                        sorts={"Role": lambda s: s['role'], "Timestamp": lambda s: s['timestamp']}):
+                        c1, c2 = st.columns([5, 1])
+                        with c1:
+                            st.write(f"**{idx+1}.** {s['role']} — {s['timestamp']}")
+                        with c2:
+                            action_button("🗑️ Delete", _delete_stakeholder, args=(idx,), key=f"del_sit_sh_{idx}",
+                                          views=_STAKEHOLDER_VIEWS if len(st.session_state.sit_data['stakeholders']) > 1 else None)
+            _stakeholders_view()
+            
+            # Edit/Add actors
+            st.subheader("Add Actor Details")
+            col1, col2 = st.columns(2)
+            with col1:
+                actor_name = st.text_input("Actor Name")
+                actor_role = st.selectbox("Role", ["Supplier", "Producer", "Refiner", "Marketer", "Buyer"])
+            with col2:
+                actor_location = st.text_input("Location")
+                actor_contact = st.text_input("Contact Information")
+            
+            actor_details = st.text_area("Additional Details")
+            
+            if st.button("Add Actor"):
+                if actor_name:
+                    stakeholders.add_actor(actor_role, name=actor_name, location=actor_location,
+                                           contact=actor_contact, details=actor_details)
+                    st.success(f"✅ Actor {actor_name} added to {actor_role}")
+        else:
+            st.warning("⚠️ Please complete Step 1 first to collect stakeholder data.")
+    
+    with tab3:
+        st.markdown('<p class="step-header">Step 3: Role Card Visualization</p>', unsafe_allow_html=True)
+        st.info("Visualize stakeholders clustered around specific roles in the supply chain.")
+        
+        @st.fragment(key="sit.roles")
+        def _roles_view():
+            if st.session_state.sit_data['roles']:
+                for role in list(st.session_state.sit_data['roles'].keys()):
+                    actors = st.session_state.sit_data['roles'][role]
+                    with st.expander(f"📋 {role} ({len(actors)} actors)"):
+                        for idx, actor in paged(actors, f"_sit_actor_list_{role}",
+                                                text=lambda a: f"{a['name']} {a['location']} {a['details']}",
+                                                sorts={"Name": lambda a: a['name'].lower(),
+                                                       "Location": lambda a: a['location'].lower()}):
+                            c1, c2 = st.columns([6, 1])
+                            with c1:
+                                st.markdown(f"""
+                                **{idx+1}. {actor['name']}**
+                                - Location: {actor['location']}
+                                - Contact: {actor['contact']}
+                                - Details: {actor['details']}
+                                """)
+                            with c2:
+                                action_button("🗑️", _delete_actor, args=(actor['id'],), views=_ROLE_VIEWS,
+                                              key=f"del_actor_{actor['id']}",
+                                              help=f"Delete {actor['name']} with their SAT ratings, conflicts and value maps")
+                        st.markdown("---")
+                        rc1, rc2 = st.columns([3, 1])
+                        with rc1:
+                            with st.popover("✏️ Rename an actor"):
+                                names = {a['id']: a['name'] for a in actors}
+                                st.selectbox("Actor", list(names), format_func=names.get, key=f"_rename_actor_{role}")
+                                st.text_input("New name", key=f"_rename_name_{role}")
+                                action_button("Rename", _rename_actor, args=(role,), views=_ROLE_VIEWS,
+                                              key=f"_rename_btn_{role}")
+                        with rc2:
+                            action_button(f"🗑️ Delete role '{role}'", _delete_role, args=(role,), views=_ROLE_VIEWS,
+                                          key=f"del_role_{role}",
+                                          help="Also deletes its actors' SAT ratings, conflicts and value maps")
+            
+                # Simple visualization
+                role_counts = {role: len(actors) for role, actors in st.session_state.sit_data['roles'].items()}
+                def _roles_bar():
+                    fig = px.bar(
+                        x=list(role_counts.keys()),
+                        y=list(role_counts.values()),
+                        labels={'x': 'Role', 'y': 'Number of Actors'},
+                        title='Stakeholder Distribution by Role'
+                    )
+                    return fig
+                plot_figure("sit.roles", role_counts, _roles_bar, use_container_width=True)
+
+                # Supply-chain Sankey flow diagram
+                st.markdown("---")
+                st.subheader("🔀 Supply-Chain Flow")
+                st.caption("Each node is a role; link thickness is the minimum of adjacent actor counts (what flows through).")
+
+                canonical_order = ["Supplier", "Producer", "Refiner", "Marketer", "Buyer"]
+                ordered_roles = [r for r in canonical_order if r in role_counts and role_counts[r] > 0]
+                extras = [r for r in role_counts.keys() if r not in canonical_order and role_counts[r] > 0]
+                ordered_roles.extend(extras)
+
+                if len(ordered_roles) >= 2:
+                    def _sankey():
+                        node_labels = [f"{r} ({role_counts[r]})" for r in ordered_roles]
+                        palette = ["#1f77b4", "#2ca02c", "#ff7f0e", "#d62728", "#9467bd", "#8c564b", "#e377c2"]
+                        node_colors = [palette[i % len(palette)] for i in range(len(ordered_roles))]
+                        src, tgt, val, link_colors = [], [], [], []
+                        for i in range(len(ordered_roles) - 1):
+                            a, b = ordered_roles[i], ordered_roles[i + 1]
+                            flow = min(role_counts[a], role_counts[b])
+                            if flow > 0:
+                                src.append(i)
+                                tgt.append(i + 1)
+                                val.append(flow)
+                                # Lighten the source color for the link
+                                link_colors.append("rgba(31,119,180,0.35)")
+
+                        sankey = go.Figure(go.Sankey(
+                            arrangement="snap",
+                            node=dict(
+                                pad=18, thickness=22,
+                                line=dict(color="white", width=1),
+                                label=node_labels, color=node_colors,
+                            ),
+                            link=dict(source=src, target=tgt, value=val, color=link_colors),
+                        ))
+                        sankey.update_layout(height=380, margin=dict(l=10, r=10, t=30, b=10),
+                                             title="Actors flowing through the value chain")
+                        return sankey
+                    plot_figure("sit.sankey", (role_counts, ordered_roles), _sankey, use_container_width=True)
+                else:
+                    st.info("Add actors to at least two canonical roles (Supplier / Producer / Refiner / Marketer / Buyer) to see the supply-chain flow.")
+            else:
+                st.warning("⚠️ Please add actors in Step 2 first.")
+        _roles_view()
+    
+    with tab4:
+        st.markdown('<p class="step-header">Step 4: Role Map</p>', unsafe_allow_html=True)
+        st.info("Visualize the entire supply chain with flow markers showing how resources move.")
+        
+        @st.fragment(key="sit.role_map")
+        def _role_map_view():
+            if st.session_state.sit_data['roles']:
+                st.subheader("Supply Chain Flow")
+            
+                # Create a network diagram
+                def _flow_map():
+                    fig = go.Figure()
+            
+                    roles = ["Supplier", "Producer", "Refiner", "Marketer", "Buyer"]
+                    x_pos = [i for i in range(len(roles))]
+            
+                    # Add nodes
+                    for i, role in enumerate(roles):
+                        actor_count = len(st.session_state.sit_data['roles'].get(role, []))
+                        fig.add_trace(go.Scatter(
+                            x=[i], y=[0],
+                            mode='markers+text',
+                            marker=dict(size=40 + actor_count*10, color='lightblue'),
+                            text=f"{role}<br>({actor_count})",
+                            textposition="top center",
+                            name=role
+                        ))
+            
+                    # Add arrows
+                    for i in range(len(roles)-1):
+                        fig.add_annotation(
+                            x=i+0.5, y=0,
+                            ax=i, ay=0,
+                            xref='x', yref='y',
+                            axref='x', ayref='y',
+                            text='',
+                            showarrow=True,
+                            arrowhead=2,
+                            arrowsize=1.5,
+                            arrowwidth=2,
+                            arrowcolor='gray'
+                        )
+            
+                    fig.update_layout(
+                        title='Craft Value Chain Flow',
+                        showlegend=False,
+                        height=400,
+                        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
+                    )
+                    return fig
+            
+                actor_counts = {r: len(a) for r, a in st.session_state.sit_data['roles'].items()}
+                plot_figure("sit.flow_map", actor_counts, _flow_map, use_container_width=True)
+            
+                st.markdown("### Flow Indicators")
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Product Flow", "→", delta="Supplier to Buyer")
+                with col2:
+                    st.metric("Money Flow", "←", delta="Buyer to Supplier")
+                with col3:
+                    st.metric("Information Flow", "↔", delta="Bidirectional")
+            else:
+                st.warning("⚠️ Please complete previous steps to visualize the role map.")
+        _role_map_view()
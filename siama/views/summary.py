@@ -0,0 +1,209 @@
+"""Summary & Export page."""
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+import copy
+import io
+import json
+
+from siama import jobs, profiling, stakeholders
+from siama.ratings import HISTORY
+
+_PROGRESS_ROWS = 500
+
+
+def _excel_export(job, sit_data, sat_data, mat_data):
+    """``siama.jobs`` job: the SIT, SAT and MAT data as an Excel workbook (bytes)."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font
+
+    wb = Workbook()
+
+    # SIT Sheet
+    job.update(0.0, "SIT sheet")
+    ws_sit = wb.active
+    ws_sit.title = "SIT Data"
+    ws_sit['A1'] = "Stakeholder Identification Data"
+    ws_sit['A1'].font = Font(bold=True, size=14)
+
+    row = 3
+    ws_sit[f'A{row}'] = "Role"
+    ws_sit[f'B{row}'] = "Actor Name"
+    ws_sit[f'C{row}'] = "Location"
+    ws_sit[f'D{row}'] = "Contact"
+
+    row += 1
+    for role, actors in sit_data.get('roles', {}).items():
+        for actor in actors:
+            ws_sit[f'A{row}'] = role
+            ws_sit[f'B{row}'] = actor.get('name', '')
+            ws_sit[f'C{row}'] = actor.get('location', '')
+            ws_sit[f'D{row}'] = actor.get('contact', '')
+            row += 1
+
+    # SAT Sheet
+    if 'relationship_data' in sat_data:
+        ws_sat = wb.create_sheet("SAT Data")
+        ws_sat['A1'] = "Stakeholder Analysis Data"
+        ws_sat['A1'].font = Font(bold=True, size=14)
+
+        df_sat = pd.DataFrame(sat_data['relationship_data']).drop(columns=HISTORY, errors='ignore')
+
+        for r_idx, row in enumerate(df_sat.values, start=3):
+            if r_idx % _PROGRESS_ROWS == 0:
+                job.update(0.1 + 0.6 * (r_idx - 3) / len(df_sat), f"SAT sheet, row {r_idx - 3:,} of {len(df_sat):,}")
+            for c_idx, value in enumerate(row, start=1):
+                ws_sat.cell(row=r_idx, column=c_idx, value=str(value))
+
+    # MAT Sheet
+    job.update(0.7, "MAT sheet")
+    ws_mat = wb.create_sheet("MAT Data")
+    ws_mat['A1'] = "Market Analysis Data"
+    ws_mat['A1'].font = Font(bold=True, size=14)
+
+    row = 3
+    for tool, data in mat_data.items():
+        ws_mat[f'A{row}'] = tool
+        ws_mat[f'A{row}'].font = Font(bold=True)
+        row += 1
+
+        if isinstance(data, dict):
+            for key, value in data.items():
+                ws_mat[f'A{row}'] = str(key)
+                ws_mat[f'B{row}'] = str(value)
+                row += 1
+        row += 1
+
+    job.update(0.8, "writing file")
+    excel_buffer = io.BytesIO()
+    wb.save(excel_buffer)
+    return excel_buffer.getvalue()
+
+
+def render():
+    st.markdown('<div class="main-header">Summary & Export</div>', unsafe_allow_html=True)
+    
+    st.subheader("📋 Data Collection Summary")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("SIT - Stakeholders Identified", 
+                 len(st.session_state.sit_data.get('stakeholders', [])))
+        if st.session_state.sit_data.get('roles'):
+            total_actors = sum(len(actors) for actors in st.session_state.sit_data['roles'].values())
+            st.metric("Total Actors Mapped", total_actors)
+    
+    with col2:
+        sat_metrics = 0
+        if 'relationship_data' in st.session_state.sat_data:
+            sat_metrics = len(st.session_state.sat_data['relationship_data'])
+        st.metric("SAT - Stakeholders Analyzed", sat_metrics)
+        
+        value_maps = 0
+        if 'value_map' in st.session_state.sat_data:
+            value_maps = len(st.session_state.sat_data['value_map'])
+        st.metric("Value Maps Created", value_maps)
+    
+    with col3:
+        mat_tools_completed = len(st.session_state.mat_data)
+        st.metric("MAT - Tools Completed", mat_tools_completed)
+    
+    st.markdown("---")
+    
+    # Export options
+    st.subheader("📥 Export Data")
+    
+    export_format = st.radio("Select Export Format", ["JSON", "Excel"])
+    
+    if st.button("Generate Export File"):
+        if export_format == "JSON":
+            # Prepare data for JSON export
+            export_data = {
+                'sit_data': st.session_state.sit_data,
+                'sat_data': st.session_state.sat_data,
+                'mat_data': st.session_state.mat_data,
+                'export_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            
+            # Convert to JSON string
+            json_str = json.dumps(export_data, indent=2, default=str)
+            
+            st.download_button(
+                label="📥 Download JSON",
+                data=json_str,
+                file_name=f"siama_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json"
+            )
+        
+        elif export_format == "Excel":
+            # Built in the background from a copy of the data, so editing can go on meanwhile.
+            snapshot = copy.deepcopy((st.session_state.sit_data, st.session_state.sat_data, st.session_state.mat_data))
+            jobs.start("_excel_export", "Creating Excel file", _excel_export, *snapshot, key=snapshot)
+
+    if export_format == "Excel" and not jobs.watch("_excel_export"):
+        data = jobs.result("_excel_export")
+        if data is not None:
+            st.download_button(
+                label="📥 Download Excel",
+                data=data,
+                file_name=f"siama_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+    
+    st.markdown("---")
+    
+    # Training Recommendations
+    st.subheader("🎯 Training Program Recommendations")
+    
+    if st.button("Generate Recommendations"):
+        st.markdown("""
+        ### Based on Your SIAMA Analysis:
+        
+        #### **Key Findings:**
+        """)
+        
+        # SIT findings
+        if st.session_state.sit_data.get('roles'):
+            st.markdown("**Stakeholder Landscape:**")
+            for role, actors in st.session_state.sit_data['roles'].items():
+                st.write(f"- {role}: {len(actors)} actors identified")
+        
+        # SAT findings
+        if 'relationship_data' in st.session_state.sat_data:
+            st.markdown("**Stakeholder Analysis:**")
+            df = profiling.timed("dataframe: summary.findings", stakeholders.ratings().frame)
+            high_power_high_interest = len(df[(df['power'] > 5) & (df['interest'] > 5)])
+            st.write(f"- {high_power_high_interest} key stakeholders requiring close management")
+        
+        # MAT findings
+        if st.session_state.mat_data:
+            st.markdown("**Market Insights:**")
+            st.write(f"- {len(st.session_state.mat_data)} market analysis tools completed")
+        
+        st.markdown("""
+        #### **Recommended Training Focus Areas:**
+        
+        1. **Technical Skills Development**
+           - Based on identified gaps in producer capabilities
+           - Focus on quality improvement and efficiency
+        
+        2. **Business & Entrepreneurship**
+           - Market understanding and customer engagement
+           - Pricing strategies and financial management
+        
+        3. **Digital Literacy**
+           - E-commerce platform usage
+           - Social media marketing
+           - Digital payment systems
+        
+        4. **Stakeholder Collaboration**
+           - Building effective supplier relationships
+           - Customer relationship management
+           - Networking with marketers and buyers
+        
+        5. **Design & Innovation**
+           - Contemporary market trends
+           - Product diversification
+           - Maintaining cultural authenticity while innovating
+        """)